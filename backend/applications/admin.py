@@ -1,19 +1,88 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
-# Register your models here.
-from django.contrib import admin
 from .models import User, JobApplication, ApplicationStatusAudit
+from .search import search_applications
+
+
+def estimated_count(model, using):
+    """
+    The planner's row estimate for ``model``'s table on PostgreSQL (summed
+    over partitions for a partitioned table), or None where there is none.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COALESCE(
+                (SELECT SUM(GREATEST(c.reltuples, 0)) FROM pg_inherits i
+                 JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = t.oid),
+                GREATEST(t.reltuples, 0)
+            )::bigint
+            FROM pg_class t WHERE t.oid = %s::regclass
+            """,
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts an unfiltered changelist from table statistics once the table
+    is past ESTIMATE_ABOVE rows, instead of a COUNT(*) over all of it.
+    Filtered changelists are counted exactly; their filters are indexed.
+    """
+
+    ESTIMATE_ABOVE = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate and estimate > self.ESTIMATE_ABOVE:
+                return estimate
+        return super().count
+
+
+class ScaledModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) behind "N total" on filtered pages
+    show_full_result_count = False
+
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(ScaledModelAdmin):
     list_display = ("username", "email", "role")
+    search_fields = ("username", "email")
+
 
 @admin.register(JobApplication)
-class JobApplicationAdmin(admin.ModelAdmin):
-    list_display = ("company_name", "position", "current_status", "user")
+class JobApplicationAdmin(ScaledModelAdmin):
+    list_display = ("company_name", "position", "current_status", "applied_date", "user")
     list_filter = ("current_status",)
     search_fields = ("company_name", "position")
+    # One join rather than a user query per row
+    list_select_related = ("user",)
+    # jobapp_applied_idx serves this order, and the status filter on top of it
+    ordering = ("-applied_date", "-id")
+    # A search box rather than a <select> of every user
+    raw_id_fields = ("user",)
+
+    def get_search_results(self, request, queryset, search_term):
+        # The full-text index rather than an icontains scan per field
+        if not search_term.strip():
+            return queryset, False
+        return search_applications(queryset, search_term, ranked=False), False
+
 
 @admin.register(ApplicationStatusAudit)
-class ApplicationStatusAuditAdmin(admin.ModelAdmin):
+class ApplicationStatusAuditAdmin(ScaledModelAdmin):
     list_display = ("application", "previous_status", "new_status", "changed_at")
+    list_select_related = ("application",)
+    raw_id_fields = ("application",)
@@ -0,0 +1,163 @@
+"""
+Funnel analytics served from DailyTransitionRollup.
+
+Each function reads only the user's rollup rows for the requested date range
+(one row per day and transition), so cost depends on the range, not on how
+many applications or audits the user has. Passing ``user=None`` reports on
+every user at once, for admins; that reads every user's rollups in the
+range through an index on ``day``, still without touching the audits.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from .models import (
+    ApplicationAuditSummary, ApplicationStatusAudit, DailyTransitionRollup, JobApplication,
+)
+
+
+def _rollups(user, since, until):
+    rollups = DailyTransitionRollup.objects.filter(day__gte=since, day__lte=until)
+    return rollups if user is None else rollups.filter(user_id=user.pk)
+
+
+def weekly_applications(user, since, until):
+    """Applications created per week (weeks start on Monday)."""
+    weeks = defaultdict(int)
+    rows = (
+        _rollups(user, since, until)
+        .filter(previous_status="")
+        .values("day")
+        .annotate(total=Sum("count"))
+        .values_list("day", "total")
+    )
+    for day, total in rows:
+        weeks[day - timedelta(days=day.weekday())] += total
+
+    start = since - timedelta(days=since.weekday())
+    result = []
+    while start <= until:
+        result.append({"week_start": start, "applications": weeks.get(start, 0)})
+        start += timedelta(weeks=1)
+    return result
+
+
+def conversions(user, since, until):
+    """
+    Transition counts between statuses, with ``rate`` being the share of
+    everything that entered ``from_status`` in the range that moved on to
+    ``to_status``.
+    """
+    rows = list(
+        _rollups(user, since, until)
+        .values("previous_status", "new_status")
+        .annotate(total=Sum("count"))
+        .values_list("previous_status", "new_status", "total")
+    )
+    entered = defaultdict(int)
+    for _, new, total in rows:
+        entered[new] += total
+
+    return [
+        {
+            "from_status": previous,
+            "to_status": new,
+            "count": total,
+            "rate": round(total / entered[previous], 4) if entered[previous] else None,
+        }
+        for previous, new, total in sorted(rows)
+        if previous
+    ]
+
+
+def _median(histogram):
+    samples = sum(histogram.values())
+    if not samples:
+        return None
+    middle = {(samples - 1) // 2, samples // 2}
+    values, seen = [], 0
+    for value in sorted(histogram):
+        count = histogram[value]
+        values += [value for index in middle if seen <= index < seen + count]
+        seen += count
+    return sum(values) / len(values)
+
+
+def time_in_stage(user, since, until):
+    """Median whole days spent in each status before leaving it."""
+    histograms = defaultdict(lambda: defaultdict(int))
+    rows = _rollups(user, since, until).exclude(previous_status="").values_list(
+        "previous_status", "stage_days"
+    )
+    for status, stage_days in rows.iterator(chunk_size=2000):
+        for days, count in stage_days.items():
+            histograms[status][int(days)] += count
+
+    return [
+        {
+            "status": status,
+            "median_days": _median(histogram),
+            "samples": sum(histogram.values()),
+        }
+        for status, histogram in sorted(histograms.items())
+    ]
+
+
+def backfill(user_id, chunk_size=2000):
+    """
+    Rebuild a user's rollups from their applications and audit history.
+
+    Days before the user's compacted audits end (see retention.py) can't be
+    rebuilt from the rows left, so their rollups are kept as they are.
+    """
+    horizon = ApplicationAuditSummary.objects.filter(
+        application__user_id=user_id
+    ).aggregate(horizon=Max("compacted_through"))["horizon"]
+    compacted = dict(
+        ApplicationAuditSummary.objects.filter(application__user_id=user_id)
+        .values_list("application_id", "last_changed_at")
+    ) if horizon else {}
+
+    events = []
+    applications = JobApplication.objects.filter(user_id=user_id).order_by("pk")
+    audits = (
+        ApplicationStatusAudit.objects.filter(application__user_id=user_id)
+        .order_by("application_id", "changed_at", "pk")
+        .values_list("application_id", "previous_status", "new_status", "changed_at")
+    )
+    history = defaultdict(list)
+    for application_id, previous, new, changed_at in audits.iterator(chunk_size=chunk_size):
+        history[application_id].append((previous, new, changed_at))
+
+    for pk, status, created_at in applications.values_list(
+        "pk", "current_status", "created_at"
+    ).iterator(chunk_size=chunk_size):
+        transitions = history.pop(pk, [])
+        initial = transitions[0][0] if transitions else status
+        events.append((user_id, "", initial, None, created_at))
+        entered_at = compacted.get(pk, created_at)
+        for previous, new, changed_at in transitions:
+            events.append((user_id, previous, new, entered_at, changed_at))
+            entered_at = changed_at
+
+    with transaction.atomic():
+        rollups = DailyTransitionRollup.objects.filter(user_id=user_id)
+        if horizon:
+            events = [event for event in events if event[4] >= horizon]
+            rollups = rollups.filter(day__gte=timezone.localdate(horizon))
+        rollups.delete()
+        DailyTransitionRollup.objects.bulk_create(
+            (
+                DailyTransitionRollup(
+                    user_id=user_id, day=day, previous_status=previous, new_status=new,
+                    count=count, stage_days=dict(stage_days),
+                )
+                for (_, day, previous, new), (count, stage_days)
+                in DailyTransitionRollup.group(events).items()
+            ),
+            batch_size=chunk_size,
+        )
+    return len(events)
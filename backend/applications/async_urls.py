@@ -0,0 +1,12 @@
+from django.urls import path, include
+from . import async_views
+
+
+# Async views take precedence; everything else falls through to the sync URLconf
+urlpatterns = [
+    path("applications/", async_views.applications_collection, name="applications-list"),
+    path("applications/<int:pk>/", async_views.application_detail, name="applications-detail"),
+    path("dashboard/", async_views.dashboard),
+    path("social/google/", async_views.google_login, name="google-login"),
+    path("", include("applications.urls")),
+]
@@ -0,0 +1,272 @@
+"""
+Async versions of the read-heavy endpoints, served when running under ASGI.
+
+The list, retrieve and dashboard reads and the Google login don't hold a
+worker thread while waiting on the database or on Google, so one process
+can serve many more concurrent slow clients. Queryset construction,
+filtering and serialization are shared with ``JobApplicationViewSet``.
+Writes on the same URLs are handed to the regular DRF views, as are
+requests that content negotiation doesn't answer with plain JSON (the
+browsable API, ``?format=api``, an indented or unacceptable ``Accept``), so
+clients see the same responses under WSGI and ASGI.
+"""
+import json
+import math
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.http import parse_header_parameters
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException, AuthenticationFailed, NotAcceptable, NotAuthenticated, NotFound,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .auth import AppRefreshToken, StatelessJWTAuthentication
+from .caching import acached_response
+from .google_auth import CertificateFetchError, averify_id_token
+from .models import DashboardSummary, User
+from .pagination import JobKeysetPagination
+from .renderers import FastJSONRenderer
+from .routers import replica_reads
+from .throttling import athrottle
+from .views import GoogleLoginAPIView, JobApplicationViewSet, aget_dev_user, dashboard_stats
+
+# Regular DRF views for the methods that stay synchronous
+sync_collection_view = JobApplicationViewSet.as_view({"get": "list", "post": "create"})
+sync_detail_view = JobApplicationViewSet.as_view({
+    "get": "retrieve",
+    "put": "update",
+    "patch": "partial_update",
+    "delete": "destroy",
+})
+sync_google_login_view = GoogleLoginAPIView.as_view()
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        JSONRenderer().render(data), status=status_code, content_type="application/json"
+    )
+
+
+def api_errors(view):
+    """Render DRF exceptions raised by an async view like DRF would."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            response = json_response(
+                exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail},
+                exc.status_code,
+            )
+            if getattr(exc, "wait", None):
+                response["Retry-After"] = str(math.ceil(exc.wait))
+            if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+                response["WWW-Authenticate"] = StatelessJWTAuthentication().authenticate_header(
+                    request
+                )
+            return response
+    return csrf_exempt(wrapper)
+
+
+def renders_json(request, renderers=None):
+    """
+    Whether DRF would answer ``request`` with compact JSON; ``renderers``
+    defaults to DEFAULT_RENDERER_CLASSES.
+    """
+    if renderers is None:
+        renderers = [renderer() for renderer in api_settings.DEFAULT_RENDERER_CLASSES]
+    negotiator = api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS()
+    try:
+        renderer, media_type = negotiator.select_renderer(Request(request), renderers)
+    except NotAcceptable:
+        return False
+    _, params = parse_header_parameters(media_type)
+    return renderer.format == "json" and "indent" not in params
+
+
+async def authenticate(request):
+    """JWT authentication with any user lookup done through the async ORM."""
+    auth = StatelessJWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+
+    return await auth.aget_user(auth.get_validated_token(raw_token))
+
+
+async def require_user(request):
+    user = await authenticate(request)
+    if user is None:
+        raise NotAuthenticated()
+    return user
+
+
+def _viewset(request, user, action, **kwargs):
+    drf_request = Request(request)
+    drf_request.user = user
+    return JobApplicationViewSet(
+        request=drf_request, action=action, args=(), kwargs=kwargs, format_kwarg=None
+    )
+
+
+async def _list_page(request, user):
+    view = _viewset(request, user, "list")
+    lean = view.get_lean_serializer()
+    queryset = view.get_queryset().values(*lean.columns)
+    paginator = view.paginator
+    serialize = sync_to_async(lean.serialize)
+
+    if isinstance(paginator, JobKeysetPagination):
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, view.request, view)
+        data = await serialize(page, using=queryset.db)
+        return status.HTTP_200_OK, paginator.get_paginated_response(data).data
+
+    page_size = paginator.get_page_size(view.request)
+    page = request.GET.get(paginator.page_query_param) or 1
+    if page in paginator.last_page_strings:
+        number = None
+    else:
+        try:
+            number = int(page)
+            if number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound("Invalid page.")
+
+    count = await queryset.acount()
+    if number is None:
+        number = max(math.ceil(count / page_size), 1)
+    offset = (number - 1) * page_size
+    if number > 1 and offset >= count:
+        raise NotFound("Invalid page.")
+    rows = [obj async for obj in queryset[offset:offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_link = (
+        replace_query_param(url, paginator.page_query_param, number + 1)
+        if offset + page_size < count else None
+    )
+    if number == 1:
+        previous_link = None
+    elif number == 2:
+        previous_link = remove_query_param(url, paginator.page_query_param)
+    else:
+        previous_link = replace_query_param(url, paginator.page_query_param, number - 1)
+
+    return status.HTTP_200_OK, {
+        "count": count,
+        "next": next_link,
+        "previous": previous_link,
+        "results": await serialize(rows, using=queryset.db),
+    }
+
+
+@api_errors
+async def applications_collection(request):
+    if request.method != "GET" or not renders_json(
+        request, _viewset(request, None, "list").get_renderers()
+    ):
+        return await sync_to_async(sync_collection_view)(request)
+    user = await require_user(request)
+    async def compute():
+        with replica_reads(user.pk):
+            return await _list_page(request, user)
+
+    if request.GET.get("scope") == "all":
+        # Admin scope (checked in get_queryset); not in the per-user cache
+        status_code, data = await compute()
+        return HttpResponse(
+            FastJSONRenderer().render(data), status=status_code, content_type="application/json"
+        )
+    return await acached_response(
+        request, user.pk, "applications", compute, renderer=FastJSONRenderer()
+    )
+
+
+@api_errors
+async def application_detail(request, pk):
+    if request.method != "GET" or not renders_json(
+        request, _viewset(request, None, "retrieve", pk=pk).get_renderers()
+    ):
+        return await sync_to_async(sync_detail_view)(request, pk=pk)
+    user = await require_user(request)
+    view = _viewset(request, user, "retrieve", pk=pk)
+    application = await view.get_queryset().filter(pk=pk).afirst()
+    if application is None:
+        raise NotFound("No JobApplication matches the given query.")
+    return json_response(view.get_serializer(application).data)
+
+
+@api_errors
+async def dashboard(request):
+    if request.method != "GET" or not renders_json(request):
+        return await sync_to_async(dashboard_stats)(request)
+    user = await authenticate(request)
+    await athrottle(request, "dashboard", user)
+    if user is None:
+        user = await aget_dev_user()
+
+    async def compute():
+        with replica_reads(user.pk):
+            summary = await DashboardSummary.objects.filter(pk=user.pk).afirst()
+        if summary is None:
+            summary = await sync_to_async(DashboardSummary.rebuild)(user.pk)
+        return status.HTTP_200_OK, {
+            "status_counts": summary.status_count_list(),
+            "stale_applications": summary.stale_count(),
+            "this_month": summary.this_month_count(),
+        }
+
+    return await acached_response(request, user.pk, "dashboard", compute)
+
+
+@api_errors
+async def google_login(request):
+    if request.method != "POST" or not renders_json(request):
+        return await sync_to_async(sync_google_login_view)(request)
+    await athrottle(request, "login")
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return json_response({"error": "Invalid JSON"}, status.HTTP_400_BAD_REQUEST)
+    else:
+        data = request.POST
+
+    token = data.get("access_token")
+    if not token:
+        return json_response({"error": "Missing access_token"}, status.HTTP_400_BAD_REQUEST)
+
+    try:
+        idinfo = await averify_id_token(token, settings.GOOGLE_CLIENT_ID)
+    except ValueError as e:
+        return json_response(
+            {"error": "Invalid token", "details": str(e)}, status.HTTP_400_BAD_REQUEST
+        )
+    except CertificateFetchError:
+        return json_response(
+            {"error": "Could not reach Google"}, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    user, _ = await User.objects.aget_or_create(
+        email=idinfo["email"],
+        defaults={
+            "username": idinfo["email"],
+            "first_name": idinfo.get("given_name", ""),
+            "last_name": idinfo.get("family_name", ""),
+        },
+    )
+    refresh = AppRefreshToken.for_user(user)
+    return json_response({
+        "access": str(refresh.access_token),
+        "refresh": str(refresh),
+    })
@@ -0,0 +1,154 @@
+"""
+JWT authentication without a user query on every request.
+
+Tokens carry the user's id, role and ``auth_version`` as claims (see
+``AppRefreshToken``), and ``StatelessJWTAuthentication`` sets
+``request.user`` to a ``ClaimsUser`` built from them rather than loading
+the ``User`` row. Views and permissions only need the id and role, and
+compare ids (``obj.user_id``) rather than user objects.
+
+A signed token can't tell that it has been revoked, so every user row has
+an ``auth_version``. It is bumped whenever the user's tokens must stop
+working: deactivation, a role or password change, or ``revoke_tokens()``.
+A token is only accepted while its ``ver`` claim matches. The version and
+``is_active`` are read through a per-process cache that keeps them for
+``AUTH_USER_CACHE_SECONDS``. Each process therefore queries a user at most
+once per TTL. The process that revokes a token sees the change at once,
+and other processes see it within the TTL; 0 checks on every request.
+Tokens issued without these claims are authenticated the stateful way.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+ROLE_CLAIM = "role"
+VERSION_CLAIM = "ver"
+
+
+class AppRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the role and auth version."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[VERSION_CLAIM] = user.auth_version
+        return token
+
+
+def _to_pk(value):
+    # Tokens hold the id as a string; compare and filter with the pk's own type
+    return get_user_model()._meta.pk.to_python(value)
+
+
+class ClaimsUser(TokenUser):
+    """``request.user`` for a token-authenticated request, read from its claims."""
+
+    @cached_property
+    def id(self):
+        return _to_pk(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def role(self):
+        return self.token.get(ROLE_CLAIM, "user")
+
+
+class UserStateCache:
+    """
+    ``(auth_version, is_active)`` per user id, kept for
+    ``AUTH_USER_CACHE_SECONDS``. Users that don't exist are kept as
+    ``(None, False)``.
+    """
+
+    def __init__(self, maxsize=10_000):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            state, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return state
+
+    def set(self, user_id, state):
+        ttl = settings.AUTH_USER_CACHE_SECONDS
+        if ttl > 0:
+            with self.lock:
+                self.entries[user_id] = (state, time.monotonic() + ttl)
+                self.entries.move_to_end(user_id)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+        return state
+
+    def discard(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+
+user_states = UserStateCache()
+
+
+def _states(user_id):
+    return get_user_model().objects.filter(pk=user_id).values_list("auth_version", "is_active")
+
+
+def _check(token, state):
+    version, is_active = state or (None, False)
+    if not is_active:
+        raise AuthenticationFailed("User not found or inactive", code="user_inactive")
+    if token[VERSION_CLAIM] != version:
+        raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    def _user_id(self, validated_token):
+        try:
+            return _to_pk(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = self._user_id(validated_token)
+        state = user_states.get(user_id)
+        if state is None:
+            state = user_states.set(user_id, _states(user_id).first() or (None, False))
+        _check(validated_token, state)
+        return ClaimsUser(validated_token)
+
+    async def aget_user(self, validated_token):
+        """``get_user`` for async views, querying through the async ORM."""
+        user_id = self._user_id(validated_token)
+        if VERSION_CLAIM not in validated_token:
+            user = await get_user_model().objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).afirst()
+            if user is None or not user.is_active:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            return user
+        state = user_states.get(user_id)
+        if state is None:
+            state = user_states.set(user_id, await _states(user_id).afirst() or (None, False))
+        _check(validated_token, state)
+        return ClaimsUser(validated_token)
@@ -0,0 +1,108 @@
+"""
+In-process API benchmarks.
+
+Each scenario is one endpoint and filter combination, requested repeatedly
+as a given user through the full middleware and view stack. Latency
+percentiles, SQL query counts and response sizes are collected, and runs
+can be compared against a previous run's JSON output to catch regressions.
+"""
+import time
+from math import ceil
+from statistics import mean
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .caching import bump_user_version
+
+
+def scenarios(today=None):
+    """(name, path) pairs covering the list filters and the read endpoints."""
+    today = today or timezone.localdate()
+    return [
+        ("list", "/api/applications/"),
+        ("list_page_10", "/api/applications/?page=10"),
+        ("list_max_page_size", "/api/applications/?page_size=100"),
+        ("list_cursor", "/api/applications/?pagination=cursor&page_size=100"),
+        ("list_include_audits", "/api/applications/?include=audits"),
+        ("list_sparse_fields", "/api/applications/?fields=id,company_name,current_status"),
+        ("list_needs_followup", "/api/applications/?status=needs_followup"),
+        ("list_status_interview", "/api/applications/?status=interview"),
+        ("list_this_month", "/api/applications/?time=this_month"),
+        ("list_month_year", f"/api/applications/?month={today.month}&year={today.year}"),
+        ("list_search", "/api/applications/?q=engineer"),
+        ("dashboard", "/api/dashboard/"),
+        ("analytics_weekly", "/api/analytics/weekly/"),
+        ("analytics_conversions", "/api/analytics/conversions/"),
+        ("analytics_time_in_stage", "/api/analytics/time-in-stage/"),
+        ("export_ndjson", "/api/applications/export/?export_format=ndjson"),
+    ]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    return ordered[max(ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def run_scenario(client, user, path, iterations, warmup=1, cached=False):
+    timings, queries = [], []
+    size = status_code = None
+    for iteration in range(warmup + iterations):
+        if not cached:
+            # Cold per-user response cache, as right after a write
+            bump_user_version(user.pk)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(path)
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+            elapsed = time.perf_counter() - started
+        if iteration < warmup:
+            continue
+        timings.append(elapsed * 1000)
+        queries.append(len(captured))
+        size, status_code = len(body), response.status_code
+
+    return {
+        "path": path,
+        "status": status_code,
+        "iterations": iterations,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p90_ms": round(percentile(timings, 90), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "mean_ms": round(mean(timings), 3),
+        "queries": max(queries),
+        "bytes": size,
+    }
+
+
+def run_benchmarks(user, selected=None, iterations=20, warmup=1, cached=False):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return {
+        name: run_scenario(client, user, path, iterations, warmup=warmup, cached=cached)
+        for name, path in scenarios()
+        if not selected or name in selected
+    }
+
+
+def compare(results, baseline, threshold=1.2, metric="p50_ms"):
+    """
+    Return (name, before, after) for scenarios that got slower than
+    ``threshold`` times the baseline or now issue more queries.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result[metric] > before[metric] * threshold:
+            regressions.append((name, f"{before[metric]} ms", f"{result[metric]} ms"))
+        if result["queries"] > before["queries"]:
+            regressions.append((name, f"{before['queries']} queries", f"{result['queries']} queries"))
+    return regressions
@@ -0,0 +1,291 @@
+"""
+Per-user response cache for the read-heavy API endpoints.
+
+Every cached response is keyed by user, a per-user version number, the
+request path and query string, and the current date (some fields such as
+``needs_followup`` and the stale count depend on it). Writes never delete
+keys; they bump the user's version, so all of that user's cached responses
+become unreachable at once and age out on their own.
+
+The ETag is derived from the cache key, which makes a conditional request a
+single version lookup: if the client already holds the response for the
+current version, a 304 is returned without touching the database.
+
+Misses are coalesced within a process. When identical requests arrive
+while one of them is computing the response, they wait for it and share
+its result, so a burst still costs one computation.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import routers
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "coalesced": 0, "not_modified": 0}
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time. Callers that arrive while it runs
+    wait for it and get its result (or exception) instead of calling again.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func):
+        """Return ``(result, shared)``; ``shared`` is True for callers that waited."""
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+        if not leader:
+            return future.result(), True
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self.lock:
+                del self.calls[key]
+        return result, False
+
+
+class AsyncSingleFlight:
+    """``SingleFlight`` for coroutines sharing an event loop."""
+
+    def __init__(self):
+        self.calls = {}
+
+    async def do(self, key, afunc):
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        while (future := self.calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # The leader was cancelled (its client went away), not
+                # this caller: take over
+                if not future.cancelled():
+                    raise
+        future = self.calls[key] = loop.create_future()
+        try:
+            result = await afunc()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here so an exception nobody waited for isn't logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self.calls[key]
+        return result, False
+
+
+_flights = SingleFlight()
+_aflights = AsyncSingleFlight()
+
+
+def get_cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_stats():
+    """Hit/miss counters for this process since startup."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+    return stats
+
+
+def _version_key(user_id):
+    return f"api:version:{user_id}"
+
+
+def get_user_version(user_id):
+    cache = get_cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock rather than 1 so a version lost to eviction or
+        # a restart never reuses an ETag that was handed out earlier.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(user_id):
+    cache = get_cache()
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), timeout=None)
+
+
+def _user_wrote(user_id):
+    bump_user_version(user_id)
+    routers.pin_to_primary(user_id)
+
+
+def invalidate_user_cache(*user_ids, using=None):
+    """
+    Invalidate the users' cached responses once the current transaction
+    commits (and keep their reads off a lagging replica for a moment).
+    """
+    for user_id in set(user_ids):
+        if user_id is not None:
+            transaction.on_commit(partial(_user_wrote, user_id), using=using)
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("If-None-Match", "")
+    return etag in [tag.strip() for tag in header.split(",")] or header.strip() == "*"
+
+
+def _cache_key(request, user_id, version, scope):
+    """Return the (cache key, ETag) for a request; works for Django and DRF requests."""
+    query = "&".join(
+        f"{name}={value}"
+        for name, values in sorted(request.GET.lists())
+        for value in values
+    )
+    digest = hashlib.md5(
+        f"{request.path}?{query}|{timezone.localdate()}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    key = f"api:{scope}:{user_id}:{version}:{digest}"
+    etag = f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+    return key, etag
+
+
+def _timeout():
+    return getattr(settings, "API_CACHE_TIMEOUT", 300)
+
+
+def cached_response(request, user_id, scope, compute):
+    """
+    Return ``compute()``'s response for ``request`` from the user's cache.
+
+    Only successful responses are stored. ``compute`` must return a DRF
+    ``Response`` whose data depends solely on the user's own rows.
+    """
+    return _cached(request, user_id, get_user_version(user_id), scope, compute)
+
+
+def cached_shared_response(request, scope, compute):
+    """
+    ``cached_response`` for data spanning every user, such as the admin
+    reports. No single write invalidates it; instead the version, and
+    with it the ETag, rolls over every API_CACHE_TIMEOUT seconds.
+    """
+    return _cached(request, "all", int(time.time() // _timeout()), scope, compute)
+
+
+def _cached(request, user_id, version, scope, compute):
+    key, etag = _cache_key(request, user_id, version, scope)
+
+    if _etag_matches(request, etag):
+        _count("not_modified")
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    cache = get_cache()
+    data = cache.get(key)
+    if data is not None:
+        _count("hits")
+        response = Response(data)
+    else:
+        def fill():
+            response = compute()
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout=_timeout())
+            return response
+
+        response, shared = _flights.do(key, fill)
+        _count("coalesced" if shared else "misses")
+        if shared:
+            response = Response(response.data, status=response.status_code)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+async def aget_user_version(user_id):
+    cache = get_cache()
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+async def acached_response(request, user_id, scope, acompute, renderer=None):
+    """
+    Async counterpart of ``cached_response`` for plain Django async views.
+
+    ``acompute`` is awaited on a miss and returns ``(status_code, data)``;
+    the result is an ``HttpResponse`` with the data rendered as JSON by
+    ``renderer`` (a ``JSONRenderer`` by default).
+    """
+    renderer = renderer or JSONRenderer()
+    key, etag = _cache_key(request, user_id, await aget_user_version(user_id), scope)
+
+    if _etag_matches(request, etag):
+        _count("not_modified")
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    cache = get_cache()
+    data = await cache.aget(key)
+    if data is not None:
+        _count("hits")
+    else:
+        async def fill():
+            status_code, data = await acompute()
+            if status_code == status.HTTP_200_OK:
+                await cache.aset(key, data, timeout=_timeout())
+            return status_code, data
+
+        (status_code, data), shared = await _aflights.do(key, fill)
+        _count("coalesced" if shared else "misses")
+        if status_code != status.HTTP_200_OK:
+            return HttpResponse(
+                renderer.render(data), status=status_code, content_type="application/json"
+            )
+
+    response = HttpResponse(renderer.render(data), content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
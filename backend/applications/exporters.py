@@ -0,0 +1,85 @@
+"""
+Streaming export of job applications with their status audit history.
+
+Applications are read as ``.values()`` rows with ``.iterator(chunk_size=...)``
+(a server-side cursor on PostgreSQL), without building model instances, and
+each chunk's audits are fetched with one batched query, so memory stays flat
+however many rows are exported. Output is produced row by row for
+``StreamingHttpResponse`` or a file.
+"""
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import ApplicationStatusAudit
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+APPLICATION_FIELDS = (
+    "id",
+    "user_id",
+    "company_name",
+    "position",
+    "location",
+    "applied_date",
+    "last_contacted_at",
+    "current_status",
+    "contact_name",
+    "contact_email",
+    "created_at",
+    "updated_at",
+)
+AUDIT_FIELDS = ("id", "previous_status", "new_status", "changed_at")
+
+
+def iter_records(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield one dict per application, with its audits under ``"audits"``."""
+    rows = queryset.prefetch_related(None).values(*APPLICATION_FIELDS)
+    iterator = rows.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(iterator, chunk_size)):
+        audits = defaultdict(list)
+        history = (
+            ApplicationStatusAudit.objects.using(rows.db)
+            .filter(application_id__in=[record["id"] for record in chunk])
+            .order_by("changed_at", "id")
+            .values_list("application_id", *AUDIT_FIELDS)
+        )
+        for application_id, *values in history:
+            audits[application_id].append(dict(zip(AUDIT_FIELDS, values)))
+        for record in chunk:
+            record["audits"] = audits[record["id"]]
+            yield record
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(records):
+    # The audit history doesn't fit a flat row, so it goes in a JSON column
+    writer = csv.writer(_Echo())
+    yield writer.writerow(APPLICATION_FIELDS + ("audits",))
+    for record in records:
+        values = ["" if record[name] is None else record[name] for name in APPLICATION_FIELDS]
+        audits = json.dumps(record["audits"], cls=DjangoJSONEncoder, separators=(",", ":"))
+        yield writer.writerow(values + [audits])
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_export(queryset, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    records = iter_records(queryset, chunk_size=chunk_size)
+    return iter_csv(records) if fmt == "csv" else iter_ndjson(records)
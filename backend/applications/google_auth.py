@@ -0,0 +1,275 @@
+"""
+Google ID token verification.
+
+Verification is split into fetching Google's public signing certificates and
+checking the token against them locally. The certificates are kept for as
+long as the certs response's ``Cache-Control: max-age`` allows and fetched
+over a pooled session, and tokens that already verified are remembered until
+they expire, so a burst of logins needs no outbound HTTP at all.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import httpx
+import requests
+from django.conf import settings
+from google.auth import jwt
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+FETCH_TIMEOUT = 10
+# An unknown key id forces a refetch (Google rotated its keys), but at most
+# this often, so garbage tokens can't be used to hammer the certs endpoint.
+MIN_REFRESH_INTERVAL = 60
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)")
+
+
+class CertificateFetchError(Exception):
+    """Google's certificates could not be downloaded."""
+
+
+def certs_url():
+    return getattr(settings, "GOOGLE_CERTS_URL", GOOGLE_CERTS_URL)
+
+
+def max_age(headers):
+    """Seconds the certs response may be reused for, per Cache-Control and Age."""
+    cache_control = headers.get("Cache-Control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return 0
+    try:
+        age = int(headers.get("Age", 0))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
+
+
+class CertificateCache:
+    """The current set of Google signing certificates and when it goes stale."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.certs = None
+        self.expires_at = 0.0
+        self.fetched_at = float("-inf")
+
+    def get(self):
+        if self.certs is not None and time.monotonic() < self.expires_at:
+            return self.certs
+        return None
+
+    def set(self, certs, ttl):
+        now = time.monotonic()
+        self.certs, self.expires_at, self.fetched_at = certs, now + ttl, now
+        return certs
+
+    def may_refresh(self):
+        return time.monotonic() - self.fetched_at >= MIN_REFRESH_INTERVAL
+
+
+class VerifiedTokenCache:
+    """
+    Claims of recently verified tokens, keyed by a hash of audience and token.
+
+    Entries last until the token's own ``exp`` or ``ttl`` seconds, whichever
+    comes first; the raw token is never stored.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def _key(token, audience):
+        return hashlib.sha256(f"{audience}\0{token}".encode()).hexdigest()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get(self, token, audience):
+        key = self._key(token, audience)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            idinfo, expires_at = entry
+            if time.time() >= expires_at:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return idinfo
+
+    def set(self, token, audience, idinfo):
+        expires_at = min(float(idinfo.get("exp", 0)), time.time() + self.ttl)
+        key = self._key(token, audience)
+        with self.lock:
+            self.entries[key] = (idinfo, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+certificates = CertificateCache()
+verified_tokens = VerifiedTokenCache()
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_session():
+    """Process-wide ``requests`` session, so connections to Google are reused."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_maxsize=10,
+                    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def reset():
+    """Forget cached certificates and verified tokens."""
+    certificates.clear()
+    verified_tokens.clear()
+
+
+def _key_id(token):
+    try:
+        header = token.split(".", 1)[0]
+        return json.loads(base64.urlsafe_b64decode(header + "=" * (-len(header) % 4))).get("kid")
+    except (ValueError, AttributeError):
+        # Malformed; jwt.decode reports it properly
+        return None
+
+
+def _needs_refresh(token, certs):
+    key_id = _key_id(token)
+    return key_id is not None and key_id not in certs and certificates.may_refresh()
+
+
+def decode_id_token(token, certs, audience):
+    """Verify ``token`` against ``certs``; raises ValueError if it is invalid."""
+    idinfo = jwt.decode(token, certs=certs, audience=audience)
+    if idinfo.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {idinfo.get('iss')!r}")
+    return idinfo
+
+
+def fetch_certs():
+    try:
+        response = get_session().get(certs_url(), timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        return response.json(), max_age(response.headers)
+    except (requests.RequestException, ValueError) as e:
+        raise CertificateFetchError(str(e)) from e
+
+
+def get_certs(refresh=False):
+    """Cached certificates, fetching them once when stale even under concurrency."""
+    certs = certificates.get()
+    if certs is not None and not refresh:
+        return certs
+    with certificates.lock:
+        # Another thread may have fetched while we waited for the lock
+        current = certificates.get()
+        if current is not None and (certs is not current or not certificates.may_refresh()):
+            return current
+        return certificates.set(*fetch_certs())
+
+
+def verify_id_token(token, audience):
+    """Drop-in for ``id_token.verify_oauth2_token`` backed by the caches above."""
+    idinfo = verified_tokens.get(token, audience)
+    if idinfo is not None:
+        return idinfo
+
+    certs = get_certs()
+    if _needs_refresh(token, certs):
+        certs = get_certs(refresh=True)
+    idinfo = decode_id_token(token, certs, audience)
+    verified_tokens.set(token, audience, idinfo)
+    return idinfo
+
+
+async def afetch_certs(client):
+    try:
+        response = await client.get(certs_url())
+        response.raise_for_status()
+        return response.json(), max_age(response.headers)
+    except (httpx.HTTPError, ValueError) as e:
+        raise CertificateFetchError(str(e)) from e
+
+
+def _async_client():
+    """
+    The ``AsyncClient`` and refresh lock for the running event loop.
+
+    Both are tied to the loop they were first used on, so there is one pair
+    per loop: a single one under ASGI, and a fresh one for each
+    ``async_to_sync`` call that runs its own loop.
+    """
+    loop = asyncio.get_running_loop()
+    state = _async_clients.get(loop)
+    if state is None:
+        client = httpx.AsyncClient(
+            timeout=FETCH_TIMEOUT,
+            limits=httpx.Limits(max_connections=10),
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+        state = _async_clients[loop] = (client, asyncio.Lock())
+    return state
+
+
+async def _aget_certs(refresh=False):
+    """``get_certs`` for async callers, fetching once per loop when stale."""
+    certs = certificates.get()
+    if certs is not None and not refresh:
+        return certs
+    client, lock = _async_client()
+    async with lock:
+        # Another task may have fetched while we waited for the lock
+        current = certificates.get()
+        if current is not None and (certs is not current or not certificates.may_refresh()):
+            return current
+        return certificates.set(*await afetch_certs(client))
+
+
+async def averify_id_token(token, audience):
+    """Async ``verify_id_token``; certificates are fetched with httpx when stale."""
+    idinfo = verified_tokens.get(token, audience)
+    if idinfo is not None:
+        return idinfo
+
+    certs = await _aget_certs()
+    if _needs_refresh(token, certs):
+        certs = await _aget_certs(refresh=True)
+    idinfo = decode_id_token(token, certs, audience)
+    verified_tokens.set(token, audience, idinfo)
+    return idinfo
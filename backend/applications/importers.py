@@ -0,0 +1,98 @@
+"""
+Streaming bulk import of job applications from CSV or JSON Lines.
+
+Rows are parsed lazily from the input stream, validated with a single,
+reused ``JobApplicationSerializer`` and written with ``bulk_create`` one
+chunk at a time, so memory use is bounded by the chunk size rather than the
+file size. Invalid rows are reported by row number and skipped; valid rows
+in the same chunk are still imported.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import JobApplication
+from .serializers import JobApplicationSerializer
+
+FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(filename, requested=None):
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"Unsupported format {requested!r}; expected one of {FORMATS}")
+        return requested
+    if filename and filename.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return "csv"
+
+
+def iter_rows(stream, fmt):
+    """Yield ``(row_number, row)`` pairs from a binary stream."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        # Row 1 is the header line
+        for number, row in enumerate(csv.DictReader(text), start=2):
+            # Empty cells mean "not provided", not an empty value
+            yield number, {key: value for key, value in row.items() if key and value != ""}
+    else:
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def import_applications(user, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate and insert ``(row_number, row)`` pairs for ``user``."""
+    report = ImportReport()
+    # Built once: field construction is the expensive part of a serializer
+    validator = JobApplicationSerializer()
+
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        objs = []
+        for number, row in chunk:
+            if not isinstance(row, dict):
+                report.add_error(number, {"non_field_errors": ["Expected a JSON object."]})
+                continue
+            try:
+                data = validator.run_validation(row)
+            except ValidationError as exc:
+                report.add_error(number, exc.detail)
+                continue
+            objs.append(JobApplication(user_id=user.pk, **data))
+
+        with transaction.atomic():
+            JobApplication.objects.bulk_create(objs, batch_size=chunk_size)
+        report.created += len(objs)
+    return report
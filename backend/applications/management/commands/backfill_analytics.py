@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from applications.analytics import backfill
+from applications.models import User
+
+
+class Command(BaseCommand):
+    help = "Rebuild the analytics rollups from the application and audit tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", help="Limit to these user ids.")
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("pk")
+        if options["user"]:
+            users = users.filter(pk__in=options["user"])
+
+        total = 0
+        for user_id in users.values_list("pk", flat=True).iterator():
+            total += backfill(user_id)
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {total} transitions"))
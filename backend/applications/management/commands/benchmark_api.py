@@ -0,0 +1,110 @@
+import json
+import platform
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from applications.benchmarks import compare, run_benchmarks, scenarios
+from applications.models import ApplicationStatusAudit, JobApplication, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the read endpoints in-process for one user and write latency "
+        "percentiles and query counts as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", type=int,
+            help="User id to benchmark as (default: the user with the most applications).",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument(
+            "--scenario", action="append",
+            help="Only run these scenarios (repeatable); see --list.",
+        )
+        parser.add_argument("--list", action="store_true", help="List the scenarios and exit.")
+        parser.add_argument(
+            "--cached", action="store_true",
+            help="Keep the per-user response cache warm instead of invalidating it per request.",
+        )
+        parser.add_argument("--output", help="Write the JSON results here instead of stdout.")
+        parser.add_argument("--compare", help="Baseline JSON from an earlier run.")
+        parser.add_argument(
+            "--threshold", type=float, default=1.2,
+            help="Flag scenarios whose p50 exceeds the baseline by this factor (default 1.2).",
+        )
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for name, path in scenarios():
+                self.stdout.write(f"{name:28} {path}")
+            return
+
+        known = {name for name, _ in scenarios()}
+        unknown = set(options["scenario"] or ()) - known
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        if options["user"]:
+            user = User.objects.filter(pk=options["user"]).first()
+        else:
+            user = (
+                User.objects.annotate(total=Count("job_applications"))
+                .order_by("-total", "pk").first()
+            )
+        if user is None:
+            raise CommandError("No user to benchmark; run seed_benchmark_data first.")
+
+        # The test client's host must pass ALLOWED_HOSTS
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            results = run_benchmarks(
+                user,
+                selected=options["scenario"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                cached=options["cached"],
+            )
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "user_id": user.pk,
+                "applications": JobApplication.objects.filter(user=user).count(),
+                "audits": ApplicationStatusAudit.objects.filter(application__user=user).count(),
+                "iterations": options["iterations"],
+                "cached": options["cached"],
+            },
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            for name, result in results.items():
+                self.stdout.write(
+                    f"{name:28} p50 {result['p50_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms  "
+                    f"{result['queries']:3} queries"
+                )
+        else:
+            self.stdout.write(output)
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)["results"]
+            regressions = compare(results, baseline, threshold=options["threshold"])
+            for name, before, after in regressions:
+                self.stderr.write(self.style.ERROR(f"{name}: {before} -> {after}"))
+            if regressions:
+                raise CommandError(f"{len(regressions)} regression(s) against {options['compare']}")
+            self.stderr.write(self.style.SUCCESS("No regressions against the baseline"))
@@ -0,0 +1,59 @@
+import gzip
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from applications.partitions import MONTHS_AHEAD, ensure_partitions
+from applications.retention import DEFAULT_BATCH_SIZE, compact_audits, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold status audits older than the retention window into per-application "
+        "summaries, optionally archiving them to a file first, and keep the audit "
+        "table's monthly partitions (PostgreSQL) created ahead. Run it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int,
+            help="Keep this many days of audits (default: AUDIT_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--archive",
+            help="Append the compacted audits to this NDJSON file (gzipped if it ends in .gz).",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options["days"] is not None and options["days"] < 0:
+            raise CommandError("--days can't be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        cutoff = retention_cutoff(options["days"])
+        connection = connections[options["database"]]
+
+        for month in ensure_partitions(connection, months_ahead=options["months_ahead"]):
+            self.stdout.write(f"Created audit partition for {month:%Y-%m}")
+
+        archive = None
+        if options["archive"]:
+            opener = gzip.open if options["archive"].endswith(".gz") else open
+            archive = opener(options["archive"], "at", encoding="utf-8")
+        try:
+            result = compact_audits(
+                cutoff, archive=archive, batch_size=options["batch_size"],
+                using=options["database"],
+            )
+        finally:
+            if archive is not None:
+                archive.close()
+
+        for month in result.dropped_partitions:
+            self.stdout.write(f"Dropped audit partition for {month:%Y-%m}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {result.audits} audits of {result.applications} applications "
+            f"from before {cutoff:%Y-%m-%d}"
+        ))
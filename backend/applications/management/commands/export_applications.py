@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.exporters import DEFAULT_CHUNK_SIZE, FORMATS, iter_export
+from applications.models import JobApplication, User
+
+
+class Command(BaseCommand):
+    help = "Stream job applications and their audit history as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username or id; exports every user when omitted")
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--output", help="File to write; defaults to stdout")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = JobApplication.objects.order_by("user_id", "id")
+        owner = options["user"]
+        if owner:
+            lookup = {"pk": owner} if owner.isdigit() else {"username": owner}
+            try:
+                queryset = queryset.filter(user=User.objects.get(**lookup))
+            except User.DoesNotExist:
+                raise CommandError(f"No such user: {owner}")
+
+        lines = iter_export(queryset, options["format"], chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as out:
+                out.writelines(lines)
+        else:
+            sys.stdout.writelines(lines)
@@ -0,0 +1,36 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.importers import DEFAULT_CHUNK_SIZE, FORMATS, detect_format, import_applications, iter_rows
+from applications.models import User
+
+
+class Command(BaseCommand):
+    help = "Import job applications for a user from a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import")
+        parser.add_argument("--user", required=True, help="Username or id of the owner")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        owner = options["user"]
+        lookup = {"pk": owner} if owner.isdigit() else {"username": owner}
+        try:
+            user = User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"No such user: {owner}")
+
+        fmt = detect_format(options["path"], options["format"])
+        with open(options["path"], "rb") as stream:
+            report = import_applications(
+                user, iter_rows(stream, fmt), chunk_size=options["chunk_size"]
+            )
+
+        for error in report.errors:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.created} applications ({report.failed} rows failed)"
+        ))
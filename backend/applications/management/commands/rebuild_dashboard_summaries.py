@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from applications.models import DashboardSummary, User
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user dashboard counters from the applications table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report users whose stored counters have drifted; exit 1 if any.",
+        )
+        parser.add_argument("--user", type=int, action="append", help="Limit to these user ids.")
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("pk")
+        if options["user"]:
+            users = users.filter(pk__in=options["user"])
+
+        drifted = 0
+        for user_id in users.values_list("pk", flat=True).iterator():
+            with transaction.atomic():
+                stored = (
+                    DashboardSummary.objects.select_for_update().filter(pk=user_id).first()
+                )
+                fresh = DashboardSummary.compute(user_id)
+                if stored is not None and stored.matches(fresh):
+                    continue
+                drifted += 1
+                if options["check"]:
+                    self.stdout.write(f"user {user_id}: summary out of date")
+                else:
+                    DashboardSummary.rebuild(user_id)
+
+        if options["check"]:
+            if drifted:
+                raise CommandError(f"{drifted} summaries out of date", returncode=1)
+            self.stdout.write(self.style.SUCCESS("All dashboard summaries are up to date"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {drifted} dashboard summaries"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.tasks import work
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background tasks (follow-up reminders, scheduled sweeps), "
+        "retrying failures, until stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10, help="Tasks claimed at a time.")
+        parser.add_argument(
+            "--sleep", type=float, default=5, help="Seconds to wait when no task is due."
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once no task is due instead of waiting."
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        ran = work(limit=options["batch_size"], idle_sleep=options["sleep"], once=options["once"])
+        self.stdout.write(self.style.SUCCESS(f"Ran {ran} tasks"))
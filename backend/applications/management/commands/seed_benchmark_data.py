@@ -0,0 +1,187 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from applications.analytics import backfill
+from applications.caching import bump_user_version
+from applications.models import ApplicationStatusAudit, DashboardSummary, JobApplication, User
+
+USERNAME_PREFIX = "bench_user_"
+
+COMPANIES = (
+    "Google", "Meta", "Amazon", "Apple", "Microsoft", "Netflix", "Stripe", "Shopify",
+    "Datadog", "Snowflake", "Airbnb", "Uber", "Lyft", "Atlassian", "Spotify", "Figma",
+    "Notion", "Cloudflare", "GitLab", "Twilio", "Square", "Pinterest", "Reddit", "Zillow",
+)
+POSITIONS = (
+    "Software Engineer", "Backend Engineer", "Frontend Engineer", "Full Stack Engineer",
+    "Data Engineer", "Site Reliability Engineer", "Machine Learning Engineer",
+    "Engineering Manager", "Product Engineer", "Platform Engineer",
+)
+LOCATIONS = (
+    "Remote", "San Francisco, CA", "Seattle, WA", "New York, NY", "Austin, TX",
+    "Los Angeles, CA", "Boston, MA", "Denver, CO", "Chicago, IL",
+)
+CONTACTS = ("Alex Kim", "Sam Patel", "Jordan Lee", "Taylor Chen", "Morgan Diaz", None)
+
+# Where an application goes next from each status, with weights
+NEXT_STATUS = {
+    "applied": (("phone_screen", 5), ("rejected", 4), ("interview", 1)),
+    "phone_screen": (("interview", 5), ("rejected", 4), ("applied", 1)),
+    "interview": (("offer", 3), ("rejected", 5), ("phone_screen", 2)),
+    "offer": (("accepted", 6), ("rejected", 3), ("interview", 1)),
+    "accepted": (("offer", 1),),
+    "rejected": (("applied", 3), ("phone_screen", 1)),
+}
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk inserts set auto_now/auto_now_add fields to historical values."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate benchmark users with applications and status histories using "
+        "bulk inserts, then rebuild their dashboard summaries and analytics rollups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--applications", type=int, default=100_000)
+        parser.add_argument(
+            "--audits", type=int, default=1_000_000,
+            help="Approximate total number of status changes to generate.",
+        )
+        parser.add_argument("--days", type=int, default=365, help="Spread dates over this many days.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same data).")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--clear", action="store_true",
+            help=f"Delete existing {USERNAME_PREFIX}* users and their data first.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["applications"] < 0 or options["audits"] < 0:
+            raise CommandError("--users must be positive; counts can't be negative.")
+        existing = User.objects.filter(username__startswith=USERNAME_PREFIX)
+        if options["clear"]:
+            existing.delete()
+        elif existing.exists():
+            raise CommandError(f"{USERNAME_PREFIX}* users already exist; pass --clear to replace them.")
+
+        rng = random.Random(options["seed"])
+        started = time.monotonic()
+        users = self.create_users(options["users"])
+        # Skewed like real usage: a few heavy users hold most applications
+        weights = [1 / (rank + 1) for rank in range(len(users))]
+        per_application = options["audits"] / options["applications"] if options["applications"] else 0
+
+        applications = audits = 0
+        today = timezone.localdate()
+        remaining = options["applications"]
+        with explicit_timestamps(
+            JobApplication._meta.get_field("created_at"),
+            JobApplication._meta.get_field("updated_at"),
+            ApplicationStatusAudit._meta.get_field("changed_at"),
+        ):
+            while remaining > 0:
+                size = min(options["batch_size"], remaining)
+                created, changed = self.create_batch(
+                    rng, users, weights, size, per_application, today, options["days"]
+                )
+                applications += created
+                audits += changed
+                remaining -= size
+                self.stdout.write(f"  {applications} applications, {audits} audits")
+
+        for user in users:
+            DashboardSummary.rebuild(user.pk)
+            backfill(user.pk)
+            bump_user_version(user.pk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users, {applications} applications and {audits} audits "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
+
+    def create_users(self, count):
+        users = [User(username=f"{USERNAME_PREFIX}{index}") for index in range(count)]
+        for user in users:
+            user.set_unusable_password()
+        User.objects.bulk_create(users)
+        return list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by("pk"))
+
+    def history(self, rng, created_at, length, now):
+        """Return the status walk as [(previous, new, changed_at)], oldest first."""
+        status, changes = "applied", []
+        moment = created_at
+        for _ in range(length):
+            moment += timedelta(hours=rng.uniform(6, 24 * 10))
+            if moment >= now:
+                break
+            choices, weights = zip(*NEXT_STATUS[status])
+            new = rng.choices(choices, weights)[0]
+            changes.append((status, new, moment))
+            status = new
+        return changes
+
+    def create_batch(self, rng, users, weights, size, per_application, today, days):
+        now = timezone.now()
+        tz = timezone.get_current_timezone()
+        applications, histories = [], []
+        for _ in range(size):
+            applied_date = today - timedelta(days=rng.randrange(days))
+            created_at = datetime.combine(applied_date, dt_time(rng.randrange(8, 20)), tz)
+            changes = self.history(rng, created_at, rng.randint(0, round(2 * per_application)), now)
+            status = changes[-1][1] if changes else "applied"
+            last_change = changes[-1][2] if changes else created_at
+            contacted = rng.random() < 0.3
+            contact = rng.choice(CONTACTS)
+            application = JobApplication(
+                user=rng.choices(users, weights)[0],
+                company_name=rng.choice(COMPANIES),
+                position=rng.choice(POSITIONS),
+                location=rng.choice(LOCATIONS),
+                applied_date=None if rng.random() < 0.02 else applied_date,
+                last_contacted_at=last_change if contacted else None,
+                current_status=status,
+                contact_name=contact,
+                contact_email=f"{contact.split()[0].lower()}@example.com" if contact else None,
+                created_at=created_at,
+                updated_at=last_change,
+                status_changed_at=last_change,
+            )
+            application.followup_due = application._compute_own_followup_due()
+            applications.append(application)
+            histories.append(changes)
+
+        # The base manager skips the per-write summary and rollup bookkeeping;
+        # both are rebuilt once per user at the end instead.
+        with transaction.atomic():
+            JobApplication._base_manager.bulk_create(applications)
+            audits = [
+                ApplicationStatusAudit(
+                    application_id=application.pk,
+                    previous_status=previous,
+                    new_status=new,
+                    changed_at=changed_at,
+                )
+                for application, changes in zip(applications, histories)
+                for previous, new, changed_at in changes
+            ]
+            ApplicationStatusAudit.objects.bulk_create(audits, batch_size=5000)
+        return len(applications), len(audits)
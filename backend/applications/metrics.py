@@ -0,0 +1,111 @@
+"""
+In-process request metrics, rendered in the Prometheus text format.
+
+The counters live in the memory of the process that served the request
+and are not shared. Under a server with several worker processes, each
+``/metrics`` response covers only the worker that answered it, and a
+scrape through a load balancer sees a different worker each time. Counters
+also restart from zero whenever a worker does. Totals are only complete
+with a single worker, or when every worker is scraped on its own address
+and the results summed.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self.series = defaultdict(lambda: [0] * (len(buckets) + 1) + [0.0])
+
+    def observe(self, labels, value):
+        series = self.series[labels]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self, label_names):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self.series.items()):
+            base = _labels(label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                yield f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}'
+            yield f"{self.name}_sum{{{base}}} {series[-1]:.6f}"
+            yield f"{self.name}_count{{{base}}} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = defaultdict(int)
+
+    def inc(self, labels):
+        self.series[labels] += 1
+
+    def render(self, label_names):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.series.items()):
+            yield f"{self.name}{{{_labels(label_names, labels)}}} {value}"
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(names, values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class RequestMetrics:
+    """Latency, query count and DB time per (view, method), plus request totals."""
+
+    LABELS = ("view", "method")
+    STATUS_LABELS = ("view", "method", "status")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = Counter("http_requests_total", "Sampled requests by view and status.")
+        self.duration = Histogram(
+            "http_request_duration_seconds", "Time spent in the view stack.", DURATION_BUCKETS
+        )
+        self.queries = Histogram(
+            "http_request_db_queries", "SQL queries issued per request.", QUERY_BUCKETS
+        )
+        self.db_time = Histogram(
+            "http_request_db_duration_seconds", "Time spent in SQL per request.", DURATION_BUCKETS
+        )
+
+    def observe(self, view, method, status, duration, queries, db_time):
+        labels = (view, method)
+        with self.lock:
+            self.requests.inc((view, method, status))
+            self.duration.observe(labels, duration)
+            self.queries.observe(labels, queries)
+            self.db_time.observe(labels, db_time)
+
+    def render(self):
+        with self.lock:
+            lines = [
+                *self.requests.render(self.STATUS_LABELS),
+                *self.duration.render(self.LABELS),
+                *self.queries.render(self.LABELS),
+                *self.db_time.render(self.LABELS),
+            ]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,161 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.utils.decorators import sync_and_async_middleware
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from .metrics import request_metrics
+
+logger = logging.getLogger("applications.perf")
+
+
+@sync_and_async_middleware
+def asgi_urlconf_middleware(get_response):
+    """Route requests arriving through the ASGI handler to ``ASGI_URLCONF``."""
+    urlconf = getattr(settings, "ASGI_URLCONF", None)
+
+    def route(request):
+        if urlconf and isinstance(request, ASGIRequest):
+            request.urlconf = urlconf
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            route(request)
+            return await get_response(request)
+    else:
+        def middleware(request):
+            route(request)
+            return get_response(request)
+    return middleware
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts and times queries, logging slow ones."""
+
+    def __init__(self, slow_ms):
+        self.slow_ms = slow_ms
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if elapsed * 1000 >= self.slow_ms:
+                logger.warning(
+                    "Slow query (%.1f ms) on %s: %s",
+                    elapsed * 1000, context["connection"].alias, sql,
+                )
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match._func_path
+
+
+@sync_and_async_middleware
+def performance_middleware(get_response):
+    """
+    Time sampled requests and their SQL.
+
+    A sampled request gets a ``Server-Timing`` header, is recorded in
+    ``request_metrics`` (served at /metrics) and is logged if slow, as is
+    any slow query in it. Unsampled requests cost one random() call.
+    Streaming responses are measured until their body is exhausted or
+    closed; their headers are sent before that, so they get no
+    ``Server-Timing``.
+    """
+    sample_rate = getattr(settings, "PERF_SAMPLE_RATE", 1.0)
+    slow_request_ms = getattr(settings, "PERF_SLOW_REQUEST_MS", 500)
+    slow_query_ms = getattr(settings, "PERF_SLOW_QUERY_MS", 100)
+
+    def start():
+        timer = QueryTimer(slow_query_ms)
+        stack = ExitStack()
+        for alias in settings.DATABASES:
+            stack.enter_context(connections[alias].execute_wrapper(timer))
+        return timer, stack, time.perf_counter()
+
+    def record(request, response, timer, started):
+        elapsed = time.perf_counter() - started
+        view = view_label(request)
+        request_metrics.observe(
+            view, request.method, response.status_code, elapsed, timer.count, timer.duration
+        )
+        if elapsed * 1000 >= slow_request_ms:
+            logger.warning(
+                "Slow request (%.1f ms, %d queries, %.1f ms SQL): %s %s -> %s [%s]",
+                elapsed * 1000, timer.count, timer.duration * 1000,
+                request.method, request.get_full_path(), response.status_code, view,
+            )
+        return elapsed
+
+    def finish(request, response, timer, started):
+        elapsed = record(request, response, timer, started)
+        response["Server-Timing"] = (
+            f"app;dur={elapsed * 1000:.1f}, "
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"'
+        )
+        return response
+
+    def stream(request, response, timer, stack, started):
+        # Keep the query wrappers installed while the body runs its queries;
+        # Django closes the wrapped iterator along with the response.
+        content = response.streaming_content
+        if response.is_async:
+            async def measured():
+                try:
+                    async for chunk in content:
+                        yield chunk
+                finally:
+                    await sync_to_async(stack.close)()
+                    record(request, response, timer, started)
+        else:
+            def measured():
+                try:
+                    yield from content
+                finally:
+                    stack.close()
+                    record(request, response, timer, started)
+        response.streaming_content = measured()
+        return response
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if sample_rate < 1 and random.random() >= sample_rate:
+                return await get_response(request)
+            # Connections are per thread: install the wrapper on the thread
+            # that runs this request's sync_to_async ORM calls.
+            timer, stack, started = await sync_to_async(start)()
+            try:
+                response = await get_response(request)
+            except BaseException:
+                await sync_to_async(stack.close)()
+                raise
+            if response.streaming:
+                return stream(request, response, timer, stack, started)
+            await sync_to_async(stack.close)()
+            return finish(request, response, timer, started)
+    else:
+        def middleware(request):
+            if sample_rate < 1 and random.random() >= sample_rate:
+                return get_response(request)
+            timer, stack, started = start()
+            with stack:
+                response = get_response(request)
+                if response.streaming:
+                    return stream(request, response, timer, stack.pop_all(), started)
+            return finish(request, response, timer, started)
+    return middleware
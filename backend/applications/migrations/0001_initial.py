@@ -18,33 +18,6 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.CreateModel(
-            name='JobApplication',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('company_name', models.CharField(max_length=255)),
-                ('position', models.CharField(max_length=255)),
-                ('location', models.CharField(blank=True, max_length=255)),
-                ('applied_date', models.DateField(blank=True, null=True)),
-                ('last_contacted_at', models.DateTimeField(blank=True, null=True)),
-                ('current_status', models.CharField(choices=[('applied', 'Applied'), ('phone_screen', 'Phone Screen'), ('on_site', 'On Site Interview'), ('remote', 'Remote Interview'), ('offer', 'Offer'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
-                ('contact_name', models.CharField(blank=True, max_length=255, null=True)),
-                ('contact_email', models.EmailField(blank=True, max_length=254, null=True)),
-                ('created_at', models.DateTimeField(auto_now_add=True)),
-                ('updated_at', models.DateTimeField(auto_now=True)),
-                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_applications', to=settings.AUTH_USER_MODEL)),
-            ],
-        ),
-        migrations.CreateModel(
-            name='ApplicationStatusAudit',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('previous_status', models.CharField(max_length=20)),
-                ('new_status', models.CharField(max_length=20)),
-                ('changed_at', models.DateTimeField(auto_now_add=True)),
-                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audits', to='applications.jobapplication')),
-            ],
-        ),
         migrations.CreateModel(
             name='User',
             fields=[
@@ -72,4 +45,31 @@ class Migration(migrations.Migration):
                 ('objects', django.contrib.auth.models.UserManager()),
             ],
         ),
+        migrations.CreateModel(
+            name='JobApplication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company_name', models.CharField(max_length=255)),
+                ('position', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('applied_date', models.DateField(blank=True, null=True)),
+                ('last_contacted_at', models.DateTimeField(blank=True, null=True)),
+                ('current_status', models.CharField(choices=[('applied', 'Applied'), ('phone_screen', 'Phone Screen'), ('on_site', 'On Site Interview'), ('remote', 'Remote Interview'), ('offer', 'Offer'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('contact_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('contact_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_applications', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusAudit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('previous_status', models.CharField(max_length=20)),
+                ('new_status', models.CharField(max_length=20)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audits', to='applications.jobapplication')),
+            ],
+        ),
     ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='current_status',
+            field=models.CharField(choices=[('applied', 'Applied'), ('phone_screen', 'Phone Screen'), ('interview', 'Interview'), ('offer', 'Offer'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='applicationstatusaudit',
+            index=models.Index(fields=['application', 'changed_at'], name='audit_app_changed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', '-applied_date'], name='jobapp_user_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', 'current_status', 'applied_date'], name='jobapp_user_status_date_idx'),
+        ),
+    ]
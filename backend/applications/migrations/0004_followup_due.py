@@ -0,0 +1,45 @@
+# Generated by Django 5.2.10 on 2026-10-18 17:22
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_followup_due(apps, schema_editor):
+    # Mirrors JobApplication.compute_followup_due at the time of writing
+    JobApplication = apps.get_model("applications", "JobApplication")
+    pending = []
+    for app in JobApplication.objects.filter(
+        current_status="applied", applied_date__isnull=False
+    ).iterator(chunk_size=2000):
+        if app.last_contacted_at:
+            last = timezone.localtime(app.last_contacted_at).date()
+        else:
+            last = app.applied_date
+        app.followup_due = last + timedelta(days=3)
+        pending.append(app)
+        if len(pending) >= 2000:
+            JobApplication.objects.bulk_update(pending, ["followup_due"])
+            pending = []
+    JobApplication.objects.bulk_update(pending, ["followup_due"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_dashboard_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='followup_due',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', 'followup_due'], name='jobapp_user_followup_idx'),
+        ),
+        migrations.RunPython(populate_followup_due, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+from django.db import migrations
+
+# A frozen copy of applications.search as of this migration, so that later
+# changes to that module don't change what this migration does.
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS applications_jobapplication_fts USING fts5(
+        company_name, position, location, contact_name,
+        content='applications_jobapplication', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS applications_jobapplication_fts_ai
+    AFTER INSERT ON applications_jobapplication BEGIN
+        INSERT INTO applications_jobapplication_fts(rowid, company_name, position, location, contact_name)
+        VALUES (new.id, new.company_name, new.position, new.location, new.contact_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS applications_jobapplication_fts_ad
+    AFTER DELETE ON applications_jobapplication BEGIN
+        INSERT INTO applications_jobapplication_fts(
+            applications_jobapplication_fts, rowid, company_name, position, location, contact_name
+        )
+        VALUES ('delete', old.id, old.company_name, old.position, old.location, old.contact_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS applications_jobapplication_fts_au
+    AFTER UPDATE OF company_name, position, location, contact_name ON applications_jobapplication BEGIN
+        INSERT INTO applications_jobapplication_fts(
+            applications_jobapplication_fts, rowid, company_name, position, location, contact_name
+        )
+        VALUES ('delete', old.id, old.company_name, old.position, old.location, old.contact_name);
+        INSERT INTO applications_jobapplication_fts(rowid, company_name, position, location, contact_name)
+        VALUES (new.id, new.company_name, new.position, new.location, new.contact_name);
+    END
+    """,
+    "INSERT INTO applications_jobapplication_fts(applications_jobapplication_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS applications_jobapplication_fts_ai",
+    "DROP TRIGGER IF EXISTS applications_jobapplication_fts_ad",
+    "DROP TRIGGER IF EXISTS applications_jobapplication_fts_au",
+    "DROP TABLE IF EXISTS applications_jobapplication_fts",
+]
+
+POSTGRES_INSTALL = [
+    """
+    CREATE INDEX IF NOT EXISTS jobapp_search_idx ON applications_jobapplication USING GIN ((
+        to_tsvector('simple',
+            coalesce(applications_jobapplication.company_name, '') || ' ' ||
+            coalesce(applications_jobapplication.position, '') || ' ' ||
+            coalesce(applications_jobapplication.location, '') || ' ' ||
+            coalesce(applications_jobapplication.contact_name, ''))
+    ))
+    """,
+]
+
+POSTGRES_UNINSTALL = ["DROP INDEX IF EXISTS jobapp_search_idx"]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def install(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_INSTALL)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_INSTALL)
+
+
+def uninstall(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_UNINSTALL)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_UNINSTALL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_followup_due'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.10 on 2026-10-18 17:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_status_changed_at(apps, schema_editor):
+    JobApplication = apps.get_model("applications", "JobApplication")
+    ApplicationStatusAudit = apps.get_model("applications", "ApplicationStatusAudit")
+    latest = (
+        ApplicationStatusAudit.objects.filter(application=OuterRef("pk"))
+        .order_by("-changed_at")
+        .values("changed_at")[:1]
+    )
+    JobApplication.objects.update(
+        status_changed_at=Coalesce(Subquery(latest), F("created_at"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='DailyTransitionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('previous_status', models.CharField(blank=True, max_length=20)),
+                ('new_status', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('stage_days', models.JSONField(default=dict)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transition_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'previous_status', 'new_status'), name='rollup_unique_transition')],
+            },
+        ),
+        migrations.RunPython(populate_status_changed_at, migrations.RunPython.noop),
+    ]
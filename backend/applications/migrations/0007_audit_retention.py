@@ -0,0 +1,113 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:18
+
+from datetime import date, timezone as dt_timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# A frozen copy of applications.partitions as of this migration, so that
+# later changes to that module don't change what this migration does.
+# PostgreSQL only (11+, tested on 16); the audit table is rebuilt as
+# (un)partitioned by month. Its primary key becomes (id, changed_at), so
+# the database no longer enforces that id alone is unique.
+
+TABLE = "applications_applicationstatusaudit"
+APPLICATION_TABLE = "applications_jobapplication"
+INDEX = "audit_app_changed_idx"
+DEFAULT_PARTITION = f"{TABLE}_default"
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    index = month.month - 1 + count
+    return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned(cursor):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+    row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def _rebuild(cursor, partitioned):
+    new = f"{TABLE}_new"
+    if partitioned:
+        cursor.execute(
+            f"CREATE TABLE {new} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+            f"PARTITION BY RANGE (changed_at)"
+        )
+        cursor.execute(f"ALTER TABLE {new} ADD CONSTRAINT {new}_pkey PRIMARY KEY (id, changed_at)")
+        cursor.execute(f"SELECT min(changed_at) FROM {TABLE}")
+        oldest = cursor.fetchone()[0]
+        month = (oldest or timezone.now()).astimezone(dt_timezone.utc).date().replace(day=1)
+        last = _add_months(timezone.now().date().replace(day=1), MONTHS_AHEAD)
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {new} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') "
+                f"TO ('{_add_months(month, 1):%Y-%m-%d} 00:00:00+00')"
+            )
+            month = _add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {new} DEFAULT")
+    else:
+        cursor.execute(f"CREATE TABLE {new} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY)")
+        cursor.execute(f"ALTER TABLE {new} ADD CONSTRAINT {new}_pkey PRIMARY KEY (id)")
+
+    cursor.execute(f"INSERT INTO {new} SELECT * FROM {TABLE}")
+    cursor.execute(f"DROP TABLE {TABLE}")
+    cursor.execute(f"ALTER TABLE {new} RENAME TO {TABLE}")
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {new}_pkey TO {TABLE}_pkey")
+    cursor.execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_application_id_fk "
+        f"FOREIGN KEY (application_id) REFERENCES {APPLICATION_TABLE} (id) "
+        f"DEFERRABLE INITIALLY DEFERRED"
+    )
+    cursor.execute(f"CREATE INDEX {INDEX} ON {TABLE} (application_id, changed_at)")
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), coalesce(max(id), 0) + 1, false) "
+        f"FROM {TABLE}"
+    )
+
+
+def partition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        if not _is_partitioned(cursor):
+            _rebuild(cursor, partitioned=True)
+
+
+def unpartition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        if _is_partitioned(cursor):
+            _rebuild(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationAuditSummary',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='audit_summary', serialize=False, to='applications.jobapplication')),
+                ('transitions', models.JSONField(default=dict)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('first_status', models.CharField(max_length=20)),
+                ('last_status', models.CharField(max_length=20)),
+                ('first_changed_at', models.DateTimeField()),
+                ('last_changed_at', models.DateTimeField()),
+                ('compacted_through', models.DateTimeField()),
+            ],
+        ),
+        # PostgreSQL only: monthly range partitions on changed_at
+        migrations.RunPython(partition, unpartition),
+    ]
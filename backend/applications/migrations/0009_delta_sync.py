@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_background_tasks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedApplication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', 'updated_at'], name='jobapp_user_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='deletedapplication',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='deletedapplication',
+            index=models.Index(fields=['user', 'deleted_at'], name='deleted_app_user_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0009_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailytransitionrollup',
+            index=models.Index(fields=['day'], name='rollup_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['-applied_date', '-id'], name='jobapp_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['current_status', '-applied_date'], name='jobapp_status_applied_idx'),
+        ),
+    ]
@@ -1,10 +1,25 @@
-from django.db import models
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import models, router, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.utils import timezone
+
+from .caching import invalidate_user_cache
+
+# Changing any of these revokes the user's tokens (see auth.py)
+AUTH_FIELDS = ("role", "is_active", "password")
+
 
 class User(AbstractUser):
     ROLE_CHOICES = (("user", "User"), ("admin", "Admin"))
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default="user")
+    # Tokens carry the version they were issued under and stop working once
+    # it is bumped
+    auth_version = models.PositiveIntegerField(default=0, editable=False)
 
     groups = models.ManyToManyField(
         "auth.Group",
@@ -17,6 +32,62 @@ class User(AbstractUser):
         blank=True,
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._auth_state = user._current_auth_state()
+        return user
+
+    def _current_auth_state(self):
+        return tuple(self.__dict__.get(name) for name in AUTH_FIELDS)
+
+    def _forget_auth_state(self, using):
+        # Drop this process's cached state as soon as the change is visible
+        from .auth import user_states
+
+        transaction.on_commit(lambda pk=self.pk: user_states.discard(pk), using=using)
+
+    def save(self, *args, **kwargs):
+        state = self._current_auth_state()
+        revoked = getattr(self, "_auth_state", state) != state
+        if revoked:
+            self.auth_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "auth_version"}
+        super().save(*args, **kwargs)
+        if revoked:
+            self._forget_auth_state(kwargs.get("using") or self._state.db)
+        self._auth_state = state
+
+    def revoke_tokens(self):
+        """Make every token issued to this user so far stop working."""
+        type(self).objects.filter(pk=self.pk).update(auth_version=models.F("auth_version") + 1)
+        self.refresh_from_db(fields=["auth_version"])
+        self._forget_auth_state(self._state.db)
+
+    def delete(self, *args, **kwargs):
+        # Left to the cascade, every application would be loaded to find
+        # its audits, which are then deleted in id batches. Set-based
+        # deletes of the history and applications first keep this to a
+        # handful of statements however much the user has.
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            applications = JobApplication._base_manager.using(using).filter(user_id=self.pk)
+            counts = {}
+            for model in (ApplicationStatusAudit, ApplicationAuditSummary):
+                _, deleted = model.objects.using(using).filter(
+                    application__in=applications.values("pk")
+                ).delete()
+                counts.update(deleted)
+            # Nothing references the applications any more, and the user's
+            # dashboard summary goes with the user below.
+            counts[JobApplication._meta.label] = applications._raw_delete(using)
+            self._forget_auth_state(using)
+            _, deleted = super().delete(*args, **kwargs)
+            counts.update(deleted)
+        return sum(counts.values()), counts
+
 STATUS_CHOICES = (
     ("applied", "Applied"),
     ("phone_screen", "Phone Screen"),
@@ -26,6 +97,179 @@ STATUS_CHOICES = (
     ("rejected", "Rejected"),
 )
 
+# Fields whose persisted values drive status audits and dashboard counters
+TRACKED_FIELDS = ("user_id", "current_status", "applied_date")
+
+
+# Fields that determine JobApplication.followup_due
+FOLLOWUP_FIELDS = ("current_status", "applied_date", "last_contacted_at")
+
+FOLLOWUP_AFTER = timedelta(days=3)
+
+
+def _is_tracked(field_name):
+    return field_name in TRACKED_FIELDS or f"{field_name}_id" in TRACKED_FIELDS
+
+
+class JobApplicationQuerySet(models.QuerySet):
+    """
+    QuerySet whose bulk write paths keep audits and dashboard counters in sync.
+
+    ``update()``, ``bulk_update()`` and ``delete()`` bypass
+    ``JobApplication.save()``/``delete()``, so the status transitions and
+    counter changes they cause are collected here and written in batches.
+    """
+
+    def _write_side_effects(self, changes, entered_at):
+        """
+        Record audits, rollups and summary deltas for (pk, before, after)
+        rows; ``entered_at`` maps pk to when the row entered its old status.
+        """
+        now = timezone.now()
+        transitions = [
+            (pk, before, after)
+            for pk, before, after in changes
+            if before is not None and before[1] != after[1]
+        ]
+        ApplicationStatusAudit.objects.using(self.db).bulk_create(
+            ApplicationStatusAudit(
+                application_id=pk,
+                previous_status=before[1],
+                new_status=after[1],
+            )
+            for pk, before, after in transitions
+        )
+        DailyTransitionRollup.record(
+            [
+                (after[0], before[1], after[1], entered_at.get(pk), now)
+                for pk, before, after in transitions
+            ],
+            using=self.db,
+        )
+        changed = [pk for pk, _, _ in transitions]
+        base = self.model._base_manager.using(self.db)
+        for start in range(0, len(changed), 500):
+            base.filter(pk__in=changed[start:start + 500]).update(status_changed_at=now)
+
+        deltas = []
+        for _, before, after in changes:
+            if before != after:
+                if before is not None:
+                    deltas.append((before, -1))
+                deltas.append((after, 1))
+        DashboardSummary.apply_changes(deltas, using=self.db)
+        invalidate_user_cache(
+            *(values[0] for _, before, after in changes for values in (before, after) if values),
+            using=self.db,
+        )
+
+    def _recompute_followups(self, pks, batch_size=500):
+        """Bring followup_due up to date for the given rows."""
+        base = self.model._base_manager.using(self.db)
+        stale = []
+        for start in range(0, len(pks), batch_size):
+            rows = base.filter(pk__in=pks[start:start + batch_size]).values_list(
+                "pk", *FOLLOWUP_FIELDS, "followup_due"
+            )
+            for pk, *inputs, due in rows:
+                new_due = self.model.compute_followup_due(*inputs)
+                if new_due != due:
+                    stale.append(self.model(pk=pk, followup_due=new_due))
+        base.bulk_update(stale, ["followup_due"], batch_size=batch_size)
+
+    def update(self, **kwargs):
+        # auto_now only applies on save(); delta sync relies on updated_at
+        kwargs.setdefault("updated_at", timezone.now())
+        tracked = {name: value for name, value in kwargs.items() if _is_tracked(name)}
+        recompute_followups = False
+        if "followup_due" not in kwargs and any(name in kwargs for name in FOLLOWUP_FIELDS):
+            new_status = kwargs.get("current_status")
+            if isinstance(new_status, str) and new_status != "applied":
+                # Only "applied" rows can need a follow-up: clear it in the same UPDATE
+                kwargs["followup_due"] = None
+            else:
+                recompute_followups = True
+
+        with transaction.atomic(using=self.db):
+            before, entered_at = {}, {}
+            rows = self.select_for_update().values_list(
+                "pk", *TRACKED_FIELDS, "status_changed_at"
+            )
+            for pk, *values, changed_at in rows:
+                before[pk] = tuple(values)
+                entered_at[pk] = changed_at
+            rows = super().update(**kwargs)
+            if recompute_followups:
+                self._recompute_followups(list(before))
+            if not tracked:
+                after = before
+            elif any(hasattr(value, "resolve_expression") for value in tracked.values()):
+                # Expression updates: read back what the database computed
+                after = {
+                    row[0]: row[1:]
+                    for row in self.model._base_manager.using(self.db)
+                    .filter(pk__in=list(before))
+                    .values_list("pk", *TRACKED_FIELDS)
+                }
+            else:
+                after = {
+                    pk: self.model._apply_tracked(values, tracked)
+                    for pk, values in before.items()
+                }
+            self._write_side_effects(
+                [(pk, values, after[pk]) for pk, values in before.items()], entered_at
+            )
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        now = timezone.now()
+        for obj in objs:
+            obj.followup_due = obj._compute_own_followup_due()
+            obj.status_changed_at = obj.status_changed_at or now
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            created = [obj._tracked_values() for obj in objs]
+            DailyTransitionRollup.record(
+                [(obj.user_id, "", obj.current_status, None, obj.created_at) for obj in objs],
+                using=self.db,
+            )
+            DashboardSummary.apply_changes(
+                [(values, 1) for values in created], using=self.db
+            )
+            invalidate_user_cache(*(values[0] for values in created), using=self.db)
+        for obj, values in zip(objs, created):
+            obj._loaded = values
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        # Django implements bulk_update() as CASE-expression update() calls,
+        # so audits and counters are recorded by update() above; only the
+        # instances' change trackers need refreshing here.
+        objs = tuple(objs)
+        if any(name in fields for name in FOLLOWUP_FIELDS):
+            for obj in objs:
+                obj.followup_due = obj._compute_own_followup_due()
+            fields = [*fields, "followup_due"]
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        if any(_is_tracked(name) for name in fields):
+            for obj in objs:
+                obj._loaded = obj._persisted_values(fields)
+        return rows
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            rows = list(self.values_list("pk", *TRACKED_FIELDS))
+            removed = [tuple(values) for _, *values in rows]
+            result = super().delete()
+            DashboardSummary.apply_changes(
+                [(values, -1) for values in removed], using=self.db
+            )
+            DeletedApplication.record([(pk, user_id) for pk, user_id, *_ in rows], using=self.db)
+            invalidate_user_cache(*(values[0] for values in removed), using=self.db)
+        return result
+
+
 class JobApplication(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -41,25 +285,187 @@ class JobApplication(models.Model):
     contact_email = models.EmailField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+    # Date from which the application needs a follow-up; derived on every
+    # write (see compute_followup_due) so the follow-up queue is an index
+    # range scan.
+    followup_due = models.DateField(null=True, blank=True, editable=False)
+    # When current_status last changed, for time-in-stage analytics
+    status_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = JobApplicationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # The list endpoint always filters by user and sorts by date
+            models.Index(fields=["user", "-applied_date"], name="jobapp_user_applied_idx"),
+            models.Index(
+                fields=["user", "current_status", "applied_date"],
+                name="jobapp_user_status_date_idx",
+            ),
+            models.Index(fields=["user", "followup_due"], name="jobapp_user_followup_idx"),
+            # Delta sync reads a user's rows changed since a point in time
+            models.Index(fields=["user", "updated_at"], name="jobapp_user_updated_idx"),
+            # Cross-user listing (the admin scope and the Django admin) in
+            # the list's date order, and its status filter
+            models.Index(fields=["-applied_date", "-id"], name="jobapp_applied_idx"),
+            models.Index(
+                fields=["current_status", "-applied_date"], name="jobapp_status_applied_idx"
+            ),
+            # The reminder sweep's range scan over every user's due dates
+            models.Index(
+                fields=["followup_due", "user"],
+                name="jobapp_followup_due_idx",
+                condition=Q(followup_due__isnull=False),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.company_name} - {self.position}"
 
+    @classmethod
+    def compute_followup_due(cls, current_status, applied_date, last_contacted_at):
+        """
+        The single definition of "needs follow-up": an application still in
+        "applied" is due FOLLOWUP_AFTER after it was applied for or, if it
+        has been, last contacted.
+        """
+        applied_date = cls._meta.get_field("applied_date").to_python(applied_date)
+        if current_status != "applied" or not applied_date:
+            return None
+        last_contacted_at = cls._meta.get_field("last_contacted_at").to_python(last_contacted_at)
+        if last_contacted_at:
+            if timezone.is_aware(last_contacted_at):
+                last_contacted_at = timezone.localtime(last_contacted_at)
+            return last_contacted_at.date() + FOLLOWUP_AFTER
+        return applied_date + FOLLOWUP_AFTER
+
+    def _compute_own_followup_due(self):
+        return self.compute_followup_due(
+            self.current_status, self.applied_date, self.last_contacted_at
+        )
+
+    @staticmethod
+    def is_followup_due(followup_due, today=None):
+        today = today or timezone.localdate()
+        return followup_due is not None and followup_due <= today
+
+    def needs_followup(self, today=None):
+        return self.is_followup_due(self.followup_due, today)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the tracked values as loaded so save() can detect changes
+        # without re-reading the row.
+        if all(name in field_names for name in TRACKED_FIELDS):
+            instance._loaded = tuple(
+                values[field_names.index(name)] for name in TRACKED_FIELDS
+            )
+        return instance
+
+    @classmethod
+    def _apply_tracked(cls, values, updates):
+        """Return ``values`` with literal field ``updates`` applied."""
+        values = list(values)
+        for name, value in updates.items():
+            attname = name if name in TRACKED_FIELDS else f"{name}_id"
+            if attname == "user_id" and hasattr(value, "pk"):
+                value = value.pk
+            if attname == "applied_date":
+                value = cls._meta.get_field("applied_date").to_python(value)
+            values[TRACKED_FIELDS.index(attname)] = value
+        return tuple(values)
+
+    def _tracked_values(self):
+        return (
+            self.user_id,
+            self.current_status,
+            self._meta.get_field("applied_date").to_python(self.applied_date),
+        )
+
+    def _persisted_values(self, update_fields=None):
+        """The tracked values as stored after saving ``update_fields``."""
+        current = self._tracked_values()
+        loaded = getattr(self, "_loaded", None)
+        if update_fields is None or loaded is None:
+            return current
+        names = set(update_fields)
+        return tuple(
+            new if name in names or name.removesuffix("_id") in names else old
+            for name, new, old in zip(TRACKED_FIELDS, current, loaded)
+        )
+
+    def _load_tracked(self, using=None):
+        if self.pk and getattr(self, "_loaded", None) is None:
+            # Instance wasn't loaded through the ORM (or was loaded with
+            # deferred fields), so fall back to reading the stored values.
+            self._loaded = (
+                JobApplication._base_manager.using(using)
+                .filter(pk=self.pk)
+                .values_list(*TRACKED_FIELDS)
+                .first()
+            )
+        return getattr(self, "_loaded", None)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self._loaded = self._tracked_values()
+
     def save(self, *args, **kwargs):
-        if self.pk:  # If this is an update
-            try:
-                old_instance = JobApplication.objects.get(pk=self.pk)
-                if old_instance.current_status != self.current_status:
-                    ApplicationStatusAudit.objects.create(
-                        application=self,
-                        previous_status=old_instance.current_status,
-                        new_status=self.current_status
-                    )
-            except JobApplication.DoesNotExist:
-                pass
-        super().save(*args, **kwargs)
-    
-    
+        using = kwargs.get("using")
+        update_fields = kwargs.get("update_fields")
+        self.followup_due = self._compute_own_followup_due()
+        if update_fields is not None and any(f in update_fields for f in FOLLOWUP_FIELDS):
+            update_fields = kwargs["update_fields"] = [*update_fields, "followup_due"]
+        if update_fields is not None and not any(_is_tracked(f) for f in update_fields):
+            with transaction.atomic(using=using):
+                super().save(*args, **kwargs)
+                invalidate_user_cache(self.user_id, using=using)
+            return
+
+        before = self._load_tracked(using)
+        entered_at = self.status_changed_at
+        if before is None or before[1] != self._persisted_values(update_fields)[1]:
+            self.status_changed_at = timezone.now()
+            if update_fields is not None:
+                update_fields = kwargs["update_fields"] = [*update_fields, "status_changed_at"]
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            after = self._persisted_values(update_fields)
+            if before is None:
+                DailyTransitionRollup.record(
+                    [(self.user_id, "", after[1], None, self.created_at)], using=using
+                )
+            elif before[1] != after[1]:
+                ApplicationStatusAudit.objects.using(using).create(
+                    application=self,
+                    previous_status=before[1],
+                    new_status=after[1],
+                )
+                DailyTransitionRollup.record(
+                    [(self.user_id, before[1], after[1], entered_at, self.status_changed_at)],
+                    using=using,
+                )
+            if before != after:
+                changes = [(after, 1)] if before is None else [(before, -1), (after, 1)]
+                DashboardSummary.apply_changes(changes, using=using)
+            invalidate_user_cache(self.user_id, before[0] if before else None, using=using)
+        self._loaded = after
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get("using")
+        stored = self._load_tracked(using)
+        pk = self.pk
+        with transaction.atomic(using=using):
+            result = super().delete(*args, **kwargs)
+            if stored is not None:
+                DashboardSummary.apply_changes([(stored, -1)], using=using)
+            DeletedApplication.record([(pk, self.user_id)], using=using)
+            invalidate_user_cache(self.user_id, using=using)
+        self._loaded = None
+        return result
+
 
 class ApplicationStatusAudit(models.Model):
     application = models.ForeignKey(
@@ -70,3 +476,312 @@ class ApplicationStatusAudit(models.Model):
     previous_status = models.CharField(max_length=20)
     new_status = models.CharField(max_length=20)
     changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["application", "changed_at"], name="audit_app_changed_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_user_cache(self.application.user_id, using=kwargs.get("using"))
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_user_cache(self.application.user_id, using=kwargs.get("using"))
+        return result
+
+
+class ApplicationAuditSummary(models.Model):
+    """
+    An application's status history from before the audit retention window,
+    folded into counts once the audit rows themselves are compacted away
+    (see applications/retention.py).
+    """
+
+    application = models.OneToOneField(
+        JobApplication,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="audit_summary",
+    )
+    # {"previous_status>new_status": count}
+    transitions = models.JSONField(default=dict)
+    count = models.PositiveIntegerField(default=0)
+    # Status before the first and after the last compacted change
+    first_status = models.CharField(max_length=20)
+    last_status = models.CharField(max_length=20)
+    first_changed_at = models.DateTimeField()
+    last_changed_at = models.DateTimeField()
+    # Every audit of the application from before this moment is counted here
+    compacted_through = models.DateTimeField()
+
+    def add(self, previous_status, new_status, changed_at):
+        """Count one transition; calls must come oldest first."""
+        if not self.count:
+            self.first_status = previous_status
+            self.first_changed_at = changed_at
+        _bump(self.transitions, f"{previous_status}>{new_status}", 1)
+        self.count += 1
+        self.last_status = new_status
+        self.last_changed_at = changed_at
+
+
+def _bump(counts, key, delta):
+    counts[key] = counts.get(key, 0) + delta
+    if not counts[key]:
+        del counts[key]
+
+
+class DashboardSummary(models.Model):
+    """
+    Per-user dashboard counters, kept up to date on every application write.
+
+    Counts are stored as small histograms rather than final numbers so the
+    time-dependent figures (stale, this month) stay correct as days pass
+    without any write: the read derives them from the stored buckets.
+    """
+
+    STALE_AFTER = timedelta(days=3)
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="dashboard_summary",
+    )
+    # {status: count}
+    status_counts = models.JSONField(default=dict)
+    # {"YYYY-MM-DD": count} of applications still in "applied", by applied_date
+    applied_dates = models.JSONField(default=dict)
+    # {"YYYY-MM": count} of applications by applied_date month
+    month_counts = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def _add(self, status, applied_date, delta):
+        _bump(self.status_counts, status, delta)
+        if applied_date:
+            _bump(self.month_counts, applied_date.strftime("%Y-%m"), delta)
+            if status == "applied":
+                _bump(self.applied_dates, applied_date.isoformat(), delta)
+
+    @classmethod
+    def apply_changes(cls, changes, using=None):
+        """
+        Apply ``((user_id, status, applied_date), delta)`` pairs.
+
+        Must run inside the transaction that made the change. A user without
+        a summary row yet is rebuilt from the (already updated) table instead.
+        """
+        by_user = defaultdict(list)
+        for values, delta in changes:
+            by_user[values[0]].append((values, delta))
+
+        for user_id, rows in by_user.items():
+            summary = (
+                cls.objects.using(using).select_for_update().filter(pk=user_id).first()
+            )
+            if summary is None:
+                cls.rebuild(user_id, using=using)
+                continue
+            for (_, status, applied_date), delta in rows:
+                summary._add(status, applied_date, delta)
+            summary.save(using=using)
+
+    @classmethod
+    def compute(cls, user_id, using=None):
+        """Build an unsaved summary for ``user_id`` from the applications table."""
+        qs = JobApplication._base_manager.using(using).filter(user_id=user_id)
+        dated = qs.filter(applied_date__isnull=False)
+        return cls(
+            user_id=user_id,
+            status_counts=dict(
+                qs.order_by().values("current_status")
+                .annotate(count=Count("id"))
+                .values_list("current_status", "count")
+            ),
+            applied_dates={
+                day.isoformat(): count
+                for day, count in dated.filter(current_status="applied")
+                .order_by().values("applied_date")
+                .annotate(count=Count("id"))
+                .values_list("applied_date", "count")
+            },
+            month_counts={
+                month.strftime("%Y-%m"): count
+                for month, count in dated.annotate(month=TruncMonth("applied_date"))
+                .order_by().values("month")
+                .annotate(count=Count("id"))
+                .values_list("month", "count")
+            },
+        )
+
+    @classmethod
+    def rebuild(cls, user_id, using=None):
+        fresh = cls.compute(user_id, using=using)
+        summary, _ = cls.objects.using(using).update_or_create(
+            user_id=user_id,
+            defaults={
+                "status_counts": fresh.status_counts,
+                "applied_dates": fresh.applied_dates,
+                "month_counts": fresh.month_counts,
+            },
+        )
+        return summary
+
+    @classmethod
+    def for_user(cls, user):
+        # The rebuild must read the primary even when this read went to a replica
+        return cls.objects.filter(pk=user.pk).first() or cls.rebuild(
+            user.pk, using=router.db_for_write(cls)
+        )
+
+    def matches(self, other):
+        return (
+            self.status_counts == other.status_counts
+            and self.applied_dates == other.applied_dates
+            and self.month_counts == other.month_counts
+        )
+
+    def status_count_list(self):
+        return [
+            {"current_status": status, "count": count}
+            for status, count in sorted(self.status_counts.items())
+        ]
+
+    def stale_count(self, today=None):
+        today = today or timezone.localdate()
+        cutoff = (today - self.STALE_AFTER).isoformat()
+        return sum(count for day, count in self.applied_dates.items() if day <= cutoff)
+
+    def this_month_count(self, today=None):
+        today = today or timezone.localdate()
+        return self.month_counts.get(today.strftime("%Y-%m"), 0)
+
+
+class DailyTransitionRollup(models.Model):
+    """
+    Per-user, per-day count of status transitions, maintained as audits are
+    written. Creating an application counts as a transition from "".
+
+    Rollups record what happened: deleting an application later does not
+    remove its past transitions (``manage.py backfill_analytics`` rebuilds
+    them from the rows that still exist).
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="transition_rollups",
+    )
+    day = models.DateField()
+    previous_status = models.CharField(max_length=20, blank=True)
+    new_status = models.CharField(max_length=20)
+    count = models.PositiveIntegerField(default=0)
+    # {"<whole days spent in previous_status>": count}, for median time-in-stage
+    stage_days = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "day", "previous_status", "new_status"],
+                name="rollup_unique_transition",
+            ),
+        ]
+        indexes = [
+            # Cross-user reports read a date range across every user
+            models.Index(fields=["day"], name="rollup_day_idx"),
+        ]
+
+    @staticmethod
+    def group(events):
+        """Aggregate transition events into {(user_id, day, previous, new): [count, stage_days]}."""
+        grouped = defaultdict(lambda: [0, defaultdict(int)])
+        for user_id, previous, new, entered_at, changed_at in events:
+            key = (user_id, timezone.localdate(changed_at), previous, new)
+            grouped[key][0] += 1
+            if entered_at is not None:
+                grouped[key][1][str(max((changed_at - entered_at).days, 0))] += 1
+        return grouped
+
+    @classmethod
+    def record(cls, events, using=None):
+        """
+        Add ``(user_id, previous_status, new_status, entered_at, changed_at)``
+        transitions. ``entered_at`` is when the application entered
+        ``previous_status`` (None if unknown). Must run inside the writing
+        transaction.
+        """
+        for (user_id, day, previous, new), (count, stage_days) in cls.group(events).items():
+            rollup, _ = cls.objects.using(using).select_for_update().get_or_create(
+                user_id=user_id, day=day, previous_status=previous, new_status=new
+            )
+            rollup.count += count
+            for days, n in stage_days.items():
+                rollup.stage_days[days] = rollup.stage_days.get(days, 0) + n
+            rollup.save(using=using)
+
+
+class BackgroundTask(models.Model):
+    """
+    A queued call to a task function, run by ``manage.py run_worker``
+    (see applications/tasks.py).
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    )
+
+    # Dotted path of the task function, called with **payload
+    name = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    # When a queued task is due or, while running, when its worker's lease
+    # runs out and another worker may take it over
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # Enqueueing a second task with the same key is a no-op
+    dedupe_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="task_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class DeletedApplication(models.Model):
+    """Tombstone of a deleted application, for delta sync clients (see sync.py)."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    application_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="deleted_app_user_idx"),
+        ]
+
+    @classmethod
+    def record(cls, rows, using=None):
+        """Add tombstones for ``(application_id, user_id)`` pairs."""
+        cls.objects.using(using).bulk_create(
+            cls(application_id=pk, user_id=user_id) for pk, user_id in rows
+        )
@@ -1,6 +1,127 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import b64decode, b64encode
+from datetime import date
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 class JobPagination(PageNumberPagination):
     page_size = 25
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class JobKeysetPagination(BasePagination):
+    """
+    Keyset pagination over (applied_date, id), newest first with undated
+    applications last.
+
+    Each page is fetched with a WHERE on the last row seen instead of an
+    OFFSET, and no COUNT(*) is run, so deep pages cost the same as the first.
+    Selected with ``?pagination=cursor``; the ``next``/``previous`` links
+    carry an opaque ``cursor`` parameter.
+    """
+
+    page_size = JobPagination.page_size
+    page_size_query_param = JobPagination.page_size_query_param
+    max_page_size = JobPagination.max_page_size
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    ordering = (F("applied_date").desc(nulls_last=True), "-id")
+    reverse_ordering = (F("applied_date").asc(nulls_first=True), "id")
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def encode_cursor(self, obj, reverse):
+        # Pages are model instances or, on the lean list path, .values() rows
+        if isinstance(obj, dict):
+            applied_date, pk = obj["applied_date"], obj["id"]
+        else:
+            applied_date, pk = obj.applied_date, obj.pk
+        applied = applied_date.isoformat() if applied_date else None
+        payload = json.dumps([applied, pk, int(reverse)]).encode()
+        return b64encode(payload).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            applied, pk, reverse = json.loads(b64decode(encoded.encode()))
+            applied = date.fromisoformat(applied) if applied else None
+            return applied, int(pk), bool(reverse)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _after(self, applied, pk):
+        """Rows that sort after (applied, pk) in the forward ordering."""
+        if applied is None:
+            return Q(applied_date__isnull=True, id__lt=pk)
+        return (
+            Q(applied_date__lt=applied)
+            | Q(applied_date=applied, id__lt=pk)
+            | Q(applied_date__isnull=True)
+        )
+
+    def _before(self, applied, pk):
+        """Rows that sort before (applied, pk) in the forward ordering."""
+        if applied is None:
+            return Q(applied_date__isnull=False) | Q(applied_date__isnull=True, id__gt=pk)
+        return Q(applied_date__gt=applied) | Q(applied_date=applied, id__gt=pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        reverse = bool(cursor and cursor[2])
+        if cursor is None:
+            queryset = queryset.order_by(*self.ordering)
+        elif reverse:
+            queryset = queryset.filter(self._before(*cursor[:2])).order_by(*self.reverse_ordering)
+        else:
+            queryset = queryset.filter(self._after(*cursor[:2])).order_by(*self.ordering)
+
+        # One extra row tells us whether there is a further page
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None and (has_more if reverse else True)
+        return rows
+
+    def _link(self, obj, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(obj, reverse))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
@@ -0,0 +1,183 @@
+"""
+Monthly range partitioning of the status audit table on PostgreSQL.
+
+``partition_audit_table`` rebuilds ``applications_applicationstatusaudit``
+as a table partitioned by ``changed_at``, one partition per (UTC) month plus
+a default partition for anything outside them. ``ensure_partitions``
+creates the coming months ahead of time, and ``drop_partitions_before``
+removes months that have fallen out of the retention window with a DROP
+instead of a row-by-row DELETE, so the table only holds the recent months
+the API reads. Every function is a no-op on other databases.
+
+The partition key has to be part of the primary key, so the table's is
+(id, changed_at). The database therefore no longer enforces that ``id``
+alone is unique, though Django still treats it as the primary key. Ids
+stay unique because every row is inserted through the parent table, which
+draws them from its one identity sequence; nothing should insert into a
+partition directly or supply its own ids.
+
+Needs PostgreSQL 11 or later, for primary keys, foreign keys and default
+partitions on partitioned tables; Django 5.2 requires 14 anyway. Tested on
+PostgreSQL 16 (applications/tests/test_partitions.py, which runs when the
+suite runs with DB_ENGINE=postgresql).
+"""
+import re
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+
+TABLE = "applications_applicationstatusaudit"
+APPLICATION_TABLE = "applications_jobapplication"
+INDEX = "audit_app_changed_idx"
+DEFAULT_PARTITION = f"{TABLE}_default"
+MONTHS_AHEAD = 3
+
+_PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def _add_months(month, count):
+    index = month.month - 1 + count
+    return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned(connection):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def monthly_partitions(connection):
+    """First days of the months that have a partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [TABLE],
+        )
+        names = [name for name, in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def _bounds(month):
+    return f"{month:%Y-%m-%d} 00:00:00+00", f"{_add_months(month, 1):%Y-%m-%d} 00:00:00+00"
+
+
+def _create_partition(cursor, month, parent=TABLE):
+    lower, upper = _bounds(month)
+    cursor.execute(
+        f"CREATE TABLE {partition_name(month)} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+
+
+def ensure_partitions(connection, months_ahead=MONTHS_AHEAD, today=None):
+    """
+    Create the partitions for this month and the next ``months_ahead``.
+
+    Rows that already landed in the default partition for one of those
+    months are moved into the new partition. Returns the months created.
+    """
+    if not is_partitioned(connection):
+        return []
+    month = (today or timezone.now().date()).replace(day=1)
+    existing = set(monthly_partitions(connection))
+    created = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for _ in range(months_ahead + 1):
+            if month not in existing:
+                # A new partition can't claim rows still in the default one,
+                # so it is filled from there before being attached.
+                name, (lower, upper) = partition_name(month), _bounds(month)
+                cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)")
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    f"WHERE changed_at >= %s AND changed_at < %s RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved",
+                    [lower, upper],
+                )
+                cursor.execute(
+                    f"ALTER TABLE {TABLE} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+                )
+                created.append(month)
+            month = _add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(connection, cutoff):
+    """Drop the monthly partitions that end at or before ``cutoff``."""
+    if not is_partitioned(connection):
+        return []
+    dropped = []
+    with connection.cursor() as cursor:
+        for month in monthly_partitions(connection):
+            end = datetime.combine(_add_months(month, 1), time.min, tzinfo=dt_timezone.utc)
+            if end > cutoff:
+                break
+            cursor.execute(f"DROP TABLE {partition_name(month)}")
+            dropped.append(month)
+    return dropped
+
+
+def _rebuild(connection, partitioned):
+    """Copy the audit table into a new (un)partitioned one and swap it in."""
+    new = f"{TABLE}_new"
+    with connection.cursor() as cursor:
+        if partitioned:
+            cursor.execute(
+                f"CREATE TABLE {new} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+                f"PARTITION BY RANGE (changed_at)"
+            )
+            cursor.execute(f"ALTER TABLE {new} ADD CONSTRAINT {new}_pkey PRIMARY KEY (id, changed_at)")
+            cursor.execute(f"SELECT min(changed_at) FROM {TABLE}")
+            oldest = cursor.fetchone()[0]
+            month = (oldest or timezone.now()).astimezone(dt_timezone.utc).date().replace(day=1)
+            last = _add_months(timezone.now().date().replace(day=1), MONTHS_AHEAD)
+            while month <= last:
+                _create_partition(cursor, month, parent=new)
+                month = _add_months(month, 1)
+            cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {new} DEFAULT")
+        else:
+            cursor.execute(
+                f"CREATE TABLE {new} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY)"
+            )
+            cursor.execute(f"ALTER TABLE {new} ADD CONSTRAINT {new}_pkey PRIMARY KEY (id)")
+
+        cursor.execute(f"INSERT INTO {new} SELECT * FROM {TABLE}")
+        # Dropping a partitioned table drops its partitions with it
+        cursor.execute(f"DROP TABLE {TABLE}")
+        cursor.execute(f"ALTER TABLE {new} RENAME TO {TABLE}")
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {new}_pkey TO {TABLE}_pkey")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_application_id_fk "
+            f"FOREIGN KEY (application_id) REFERENCES {APPLICATION_TABLE} (id) "
+            f"DEFERRABLE INITIALLY DEFERRED"
+        )
+        cursor.execute(f"CREATE INDEX {INDEX} ON {TABLE} (application_id, changed_at)")
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), coalesce(max(id), 0) + 1, false) "
+            f"FROM {TABLE}"
+        )
+
+
+def partition_audit_table(connection):
+    if connection.vendor == "postgresql" and not is_partitioned(connection):
+        _rebuild(connection, partitioned=True)
+
+
+def unpartition_audit_table(connection):
+    if is_partitioned(connection):
+        _rebuild(connection, partitioned=False)
@@ -2,4 +2,10 @@ from rest_framework.permissions import BasePermission
 
 class IsOwnerOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return request.user.role == "admin" or obj.user == request.user
+        # Ids rather than users: obj.user would load the owner's row
+        return request.user.role == "admin" or obj.user_id == request.user.pk
+
+
+class IsAdminRole(BasePermission):
+    def has_permission(self, request, view):
+        return getattr(request.user, "role", None) == "admin"
@@ -0,0 +1,69 @@
+"""
+Follow-up reminders, sent from the background task queue.
+
+``sweep_followups`` runs on a schedule (see TASK_SCHEDULE). It reads the
+users with applications due for a follow-up from an index on
+``followup_due``, so it costs the number of due applications rather than
+the size of the table. It then queues one ``send_followup_reminder`` per
+user and day. The reminder re-reads the user's due applications when it
+runs, so nothing is sent for applications followed up on in the meantime.
+"""
+from datetime import date
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.utils import timezone
+
+from .models import JobApplication, User
+from .tasks import enqueue_many
+
+REMINDER_LIMIT = 20
+
+
+def due_applications(today):
+    return JobApplication.objects.filter(followup_due__lte=today)
+
+
+def sweep_followups(batch_size=500):
+    """Queue today's reminder for every user with an application due for follow-up."""
+    today = timezone.localdate()
+    user_ids = (
+        due_applications(today)
+        .order_by("user_id")
+        .values_list("user_id", flat=True)
+        .distinct()
+        .iterator(chunk_size=batch_size)
+    )
+    queued = 0
+    while batch := list(islice(user_ids, batch_size)):
+        queued += enqueue_many(
+            send_followup_reminder,
+            [{"user_id": user_id, "day": today.isoformat()} for user_id in batch],
+            # One reminder per user and day, however often the sweep runs
+            dedupe_keys=[f"followup-reminder:{user_id}:{today}" for user_id in batch],
+        )
+    return queued
+
+
+def send_followup_reminder(user_id, day):
+    user = User.objects.filter(pk=user_id, is_active=True).exclude(email="").first()
+    if user is None:
+        return
+    due = due_applications(date.fromisoformat(day)).filter(user_id=user_id)
+    total = due.count()
+    if not total:
+        return
+
+    lines = [
+        f"- {application.company_name}: {application.position} (due {application.followup_due})"
+        for application in due.order_by("followup_due", "id")[:REMINDER_LIMIT]
+    ]
+    if total > REMINDER_LIMIT:
+        lines.append(f"...and {total - REMINDER_LIMIT} more.")
+    send_mail(
+        subject=f"{total} job application{'s' if total != 1 else ''} to follow up on",
+        message="These applications haven't heard back in a while:\n\n" + "\n".join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+    )
@@ -0,0 +1,46 @@
+"""
+JSON rendering through orjson, when it is installed.
+
+``FastJSONRenderer`` writes the same bytes as DRF's ``JSONRenderer`` for
+payloads without floats (orjson formats some floats differently, e.g.
+``1e-06``), in a fraction of the time on large list pages. Values orjson
+doesn't handle natively, dates and datetimes included, go through DRF's
+encoder so they come out exactly as before. Without orjson, or when an
+indent or non-default JSON settings are in effect, it renders like
+``JSONRenderer``.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    def _orjson_compatible(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.encoder_class is JSONEncoder
+            and api_settings.UNICODE_JSON
+            and api_settings.COMPACT_JSON
+            and api_settings.STRICT_JSON
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not self._orjson_compatible(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        ret = orjson.dumps(
+            data,
+            default=JSONEncoder().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Same as JSONRenderer: U+2028/2029 are valid JSON but not valid
+        # JavaScript, so they are always escaped.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -0,0 +1,146 @@
+"""
+Retention for the status audit history.
+
+Audits older than ``AUDIT_RETENTION_DAYS`` are compacted: each
+application's old transitions are folded into its ``ApplicationAuditSummary``
+(transition counts, the first and last status and when they changed) and
+the rows are deleted, after being appended to an NDJSON archive if one is
+given. The analytics are unaffected; they read ``DailyTransitionRollup``,
+which already holds the aggregated history. Compacted applications get a
+new ``updated_at`` in the transaction that removes their audits, so delta
+sync (see sync.py) sends them again with the shorter history.
+
+On PostgreSQL with a partitioned audit table (see partitions.py), months
+wholly before the cutoff are dropped as partitions instead of deleted row
+by row.
+"""
+import json
+from datetime import datetime, time, timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from . import partitions
+from .caching import invalidate_user_cache
+from .models import ApplicationAuditSummary, ApplicationStatusAudit, JobApplication
+
+DEFAULT_BATCH_SIZE = 500
+
+ARCHIVE_FIELDS = ("id", "application_id", "previous_status", "new_status", "changed_at")
+
+
+def retention_cutoff(days=None, today=None):
+    """Start of the oldest local day whose audits are kept."""
+    days = settings.AUDIT_RETENTION_DAYS if days is None else days
+    day = (today or timezone.localdate()) - timedelta(days=days)
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class CompactionResult:
+    def __init__(self, applications=0):
+        self.applications = applications
+        self.audits = 0
+        self.dropped_partitions = []
+
+    def as_dict(self):
+        return {
+            "applications": self.applications,
+            "audits": self.audits,
+            "dropped_partitions": [f"{month:%Y-%m}" for month in self.dropped_partitions],
+        }
+
+
+def _touch(application_ids, using):
+    # A plain UPDATE: updated_at is what delta sync reads, and nothing else changed
+    JobApplication._base_manager.using(using).filter(pk__in=application_ids).update(
+        updated_at=timezone.now()
+    )
+
+
+def _compact_batch(application_ids, cutoff, archive, using, delete):
+    """Fold one batch of applications' old audits into their summaries."""
+    summaries = {
+        summary.application_id: summary
+        for summary in ApplicationAuditSummary.objects.using(using)
+        .select_for_update()
+        .filter(application_id__in=application_ids)
+    }
+    old = ApplicationStatusAudit.objects.using(using).filter(
+        application_id__in=application_ids, changed_at__lt=cutoff
+    )
+    rows = old.order_by("application_id", "changed_at", "id").values_list(*ARCHIVE_FIELDS)
+
+    created, compacted = [], 0
+    for application_id, history in groupby(rows, key=lambda row: row[1]):
+        summary = summaries.get(application_id)
+        if summary is None:
+            summary = ApplicationAuditSummary(application_id=application_id)
+            created.append(summary)
+        for row in history:
+            # Left behind by an interrupted run that had already counted it
+            if summary.compacted_through and row[4] < summary.compacted_through:
+                continue
+            if archive is not None:
+                archive.write(
+                    json.dumps(dict(zip(ARCHIVE_FIELDS, row)), cls=DjangoJSONEncoder) + "\n"
+                )
+            summary.add(*row[2:])
+            compacted += 1
+        summary.compacted_through = max(summary.compacted_through or cutoff, cutoff)
+
+    ApplicationAuditSummary.objects.using(using).bulk_create(created)
+    ApplicationAuditSummary.objects.using(using).bulk_update(
+        summaries.values(),
+        ["transitions", "count", "first_status", "last_status", "first_changed_at",
+         "last_changed_at", "compacted_through"],
+    )
+    if delete:
+        old.delete()
+        _touch(application_ids, using)
+    # Cached detail responses embed the audit history
+    invalidate_user_cache(
+        *JobApplication._base_manager.using(using)
+        .filter(pk__in=application_ids)
+        .values_list("user_id", flat=True)
+        .distinct(),
+        using=using,
+    )
+    return compacted
+
+
+def compact_audits(cutoff, archive=None, batch_size=DEFAULT_BATCH_SIZE, using=DEFAULT_DB_ALIAS):
+    """
+    Compact every audit from before ``cutoff`` (see ``retention_cutoff``;
+    analytics backfills rebuild whole days after it, so it should be a
+    local midnight).
+
+    Applications are compacted ``batch_size`` at a time, each batch in its
+    own transaction, and ``archive`` (a text file) gets every compacted
+    audit as a JSON line first. Re-running after an interruption doesn't
+    count anything twice.
+    """
+    connection = connections[using]
+    partitioned = partitions.is_partitioned(connection)
+    old = ApplicationStatusAudit.objects.using(using).filter(changed_at__lt=cutoff)
+    application_ids = list(
+        old.order_by("application_id").values_list("application_id", flat=True).distinct()
+    )
+
+    result = CompactionResult(applications=len(application_ids))
+    for start in range(0, len(application_ids), batch_size):
+        with transaction.atomic(using=using):
+            result.audits += _compact_batch(
+                application_ids[start:start + batch_size], cutoff, archive, using,
+                # Whole months go below as partitions, the rest afterwards
+                delete=not partitioned,
+            )
+
+    if partitioned:
+        with transaction.atomic(using=using):
+            result.dropped_partitions = partitions.drop_partitions_before(connection, cutoff)
+            old.delete()
+            _touch(application_ids, using)
+    return result
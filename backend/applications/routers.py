@@ -0,0 +1,69 @@
+"""
+Optional read replica for the read-heavy endpoints.
+
+When a ``replica`` database is configured, the application list, dashboard
+and export read from it; everything else, and every write, uses ``default``.
+Replicas lag, so a user who has just written is pinned to the primary for
+``REPLICA_PIN_SECONDS`` (tracked in the shared cache, like the response
+cache's versions); otherwise their next list could come back without the
+change and be cached under the new version.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from . import caching
+
+REPLICA = "replica"
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f"db:primary:{user_id}"
+
+
+def pin_to_primary(user_id):
+    if replica_configured():
+        caching.get_cache().set(_pin_key(user_id), True, timeout=getattr(settings, "REPLICA_PIN_SECONDS", 5))
+
+
+def read_alias(user_id=None):
+    """The database to read replica-eligible data for ``user_id`` from."""
+    if not replica_configured():
+        return DEFAULT_DB_ALIAS
+    if user_id is not None and caching.get_cache().get(_pin_key(user_id)):
+        return DEFAULT_DB_ALIAS
+    return REPLICA
+
+
+@contextmanager
+def replica_reads(user_id=None):
+    """Route reads made inside the block to the replica, if there is one."""
+    token = _use_replica.set(read_alias(user_id) == REPLICA)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return REPLICA if _use_replica.get() else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return db != REPLICA
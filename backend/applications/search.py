@@ -0,0 +1,159 @@
+"""
+Full-text search over job applications.
+
+SQLite (development) uses an external-content FTS5 table kept in sync with
+``applications_jobapplication`` by triggers. PostgreSQL uses a GIN
+expression index over the same columns, which the database maintains on
+write. Both support prefix matching ("goo" finds "Google") and rank results
+by relevance; ``search_rank`` is annotated so that higher is better on
+every backend.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_FIELDS = ("company_name", "position", "location", "contact_name")
+
+TABLE = "applications_jobapplication"
+FTS_TABLE = "applications_jobapplication_fts"
+PG_INDEX = "jobapp_search_idx"
+
+# Must match the indexed expression exactly for PostgreSQL to use the index
+PG_VECTOR = "to_tsvector('simple', {})".format(
+    " || ' ' || ".join(f"coalesce({TABLE}.{field}, '')" for field in SEARCH_FIELDS)
+)
+
+_columns = ", ".join(SEARCH_FIELDS)
+_new_values = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+_old_values = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns},
+        content='{TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns})
+        VALUES ('delete', old.id, {_old_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns})
+        VALUES ('delete', old.id, {_old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_INSTALL = [f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {TABLE} USING GIN (({PG_VECTOR}))"]
+POSTGRES_UNINSTALL = [f"DROP INDEX IF EXISTS {PG_INDEX}"]
+
+
+def _run(connection, statements):
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def install_search_index(connection):
+    """
+    Create (idempotently) and fill the search index for ``connection``.
+
+    On SQLite, Django rebuilds a table for most ALTERs, which drops its
+    triggers; run this again after such migrations (or use
+    ``manage.py rebuild_search_index``).
+    """
+    if connection.vendor == "sqlite":
+        _run(connection, SQLITE_INSTALL)
+    elif connection.vendor == "postgresql":
+        _run(connection, POSTGRES_INSTALL)
+
+
+def uninstall_search_index(connection):
+    if connection.vendor == "sqlite":
+        _run(connection, SQLITE_UNINSTALL)
+    elif connection.vendor == "postgresql":
+        _run(connection, POSTGRES_UNINSTALL)
+
+
+def _terms(query):
+    return re.findall(r"\w+", query)
+
+
+def search_applications(queryset, query, ranked=True):
+    """
+    Filter ``queryset`` to matches for ``query`` and, if ``ranked``,
+    annotate ``search_rank``. Pass ``ranked=False`` for querysets that will
+    be updated or deleted rather than read.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        # Every term must match, each as a prefix
+        match = " ".join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        )
+        if not ranked:
+            return queryset
+        # bm25() needs its own MATCH scan. Probing the FTS table once per
+        # application re-runs the prefix query every time (quadratic for
+        # common terms), so the scan is materialized once and each row looks
+        # its rank up in that.
+        return queryset.annotate(
+            # bm25() is lower-is-better; negate it so higher ranks first everywhere
+            search_rank=RawSQL(
+                f"WITH hits AS MATERIALIZED ("
+                f"SELECT rowid, -bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+                f") SELECT rank FROM hits WHERE hits.rowid = {TABLE}.id",
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        queryset = queryset.filter(
+            RawSQL(f"{PG_VECTOR} @@ to_tsquery('simple', %s)", (tsquery,), output_field=BooleanField())
+        )
+        if not ranked:
+            return queryset
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"ts_rank_cd({PG_VECTOR}, to_tsquery('simple', %s))",
+                (tsquery,),
+                output_field=FloatField(),
+            )
+        )
+
+    # Other backends: unindexed substring match, unranked
+    condition = Q()
+    for term in terms:
+        condition &= Q(*(Q(**{f"{field}__icontains": term}) for field in SEARCH_FIELDS), _connector=Q.OR)
+    queryset = queryset.filter(condition)
+    if not ranked:
+        return queryset
+    return queryset.annotate(search_rank=RawSQL("0", (), output_field=FloatField()))
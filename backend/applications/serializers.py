@@ -1,6 +1,12 @@
+from collections import defaultdict
+from datetime import date
+from operator import itemgetter
+
+from django.utils import timezone
 from rest_framework import serializers
-from .models import JobApplication, ApplicationStatusAudit
-from datetime import date, timedelta
+from rest_framework.settings import ISO_8601, api_settings
+
+from .models import JobApplication, ApplicationStatusAudit, STATUS_CHOICES
 
 class ApplicationStatusAuditSerializer(serializers.ModelSerializer):
     
@@ -28,17 +34,175 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         model = JobApplication
         fields = "__all__"
         read_only_fields = ("user",)
+        # Nested fields that list responses only render on ?include=
+        optional_fields = ("audits",)
+
+    def __init__(self, *args, **kwargs):
+        # Sparse fieldsets: `fields` limits the output to the given names,
+        # `include` opts in to the (expensive) optional nested fields.
+        fields = kwargs.pop("fields", None)
+        include = kwargs.pop("include", None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        elif include is not None:
+            for name in set(self.Meta.optional_fields) - set(include):
+                self.fields.pop(name, None)
 
     def get_needs_followup(self, obj):
-        if obj.current_status != "applied":
-            return False
-        if not obj.applied_date:
-            return False
-        last_action_date = (
-            obj.last_contacted_at.date()
-            if obj.last_contacted_at
-            else obj.applied_date
+        return obj.needs_followup()
+
+
+# Fields whose representation of a database value is the value itself
+_PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+
+def _is_iso(field, default):
+    output_format = getattr(field, "format", default)
+    return output_format is not None and output_format.lower() == ISO_8601
+
+
+def _datetime_converter(field):
+    if not _is_iso(field, api_settings.DATETIME_FORMAT) or hasattr(field, "timezone"):
+        return field.to_representation
+    tz = field.default_timezone()
+
+    def convert(value):
+        if tz is None or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+def _converter(field):
+    """Map a ``.values()`` value to ``field.to_representation(value)``; None if unchanged."""
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        return date.isoformat if _is_iso(field, api_settings.DATE_FORMAT) else field.to_representation
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, _PASSTHROUGH_FIELDS):
+        return None
+    return field.to_representation
+
+
+def _getter(field):
+    if len(field.source_attrs) != 1:
+        raise TypeError(f"{field.field_name!r} can't be rendered from .values() rows")
+    source = field.source_attrs[0]
+    convert = _converter(field)
+    if convert is None:
+        return source, itemgetter(source)
+
+    def get(row):
+        value = row[source]
+        return None if value is None else convert(value)
+
+    return source, get
+
+
+def _plan(fields):
+    """(name, getter) pairs for ``fields`` and the columns they read."""
+    getters, sources = [], {}
+    for name, field in fields.items():
+        source, get = _getter(field)
+        sources[source] = None
+        getters.append((name, get))
+    return getters, tuple(sources)
+
+
+class LeanApplicationSerializer:
+    """
+    Read-only fast path for list pages and exports.
+
+    Renders ``.values()`` rows to exactly what ``JobApplicationSerializer``
+    would produce for the same ``fields``/``include``, without building
+    model instances or running DRF's per-field machinery on every row.
+    ``columns`` is what to pass to ``.values()``; it always includes the
+    keyset pagination keys. The audit history, when included, is loaded
+    with one query per page.
+    """
+
+    # Columns the SerializerMethodFields compute from
+    method_columns = {"needs_followup": ("followup_due",)}
+
+    def __init__(self, fields=None, include=None):
+        template = JobApplicationSerializer(fields=fields, include=include)
+        self.today = timezone.localdate()
+        self.getters = []
+        self.audit_getters = None
+        columns = {"id": None, "applied_date": None}
+        for name, field in template.fields.items():
+            if name == "audits":
+                self.audit_getters, sources = _plan(field.child.fields)
+                self.audit_columns = tuple(dict.fromkeys((*sources, "application_id")))
+                self.getters.append((name, itemgetter("audits")))
+            elif isinstance(field, serializers.SerializerMethodField):
+                columns.update(dict.fromkeys(self.method_columns[name]))
+                self.getters.append((name, getattr(self, f"get_{name}")))
+            else:
+                source, get = _getter(field)
+                columns[source] = None
+                self.getters.append((name, get))
+        self.columns = tuple(columns)
+
+    def get_needs_followup(self, row):
+        return JobApplication.is_followup_due(row["followup_due"], self.today)
+
+    def attach_audits(self, rows, using=None):
+        audits = defaultdict(list)
+        queryset = ApplicationStatusAudit.objects.filter(
+            application_id__in=[row["id"] for row in rows]
         )
-        return last_action_date <= date.today() - timedelta(days=3)
+        if using:
+            queryset = queryset.using(using)
+        getters = self.audit_getters
+        for audit in queryset.order_by("changed_at", "id").values(*self.audit_columns):
+            audits[audit["application_id"]].append({name: get(audit) for name, get in getters})
+        for row in rows:
+            row["audits"] = audits[row["id"]]
+
+    def serialize(self, rows, using=None):
+        rows = list(rows)
+        if self.audit_getters is not None and rows:
+            self.attach_audits(rows, using)
+        getters = self.getters
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+
+class BulkSelectionSerializer(serializers.Serializer):
+    """Selects applications either by id or by the list endpoint's filters."""
+
+    FILTER_KEYS = ("q", "status", "time", "month", "year")
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000
+    )
+    filter = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate_filter(self, value):
+        unknown = set(value) - set(self.FILTER_KEYS)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unsupported filter keys: {', '.join(sorted(unknown))}"
+            )
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'ids' or 'filter'.")
+        return attrs
+
 
-    
\ No newline at end of file
+class BulkStatusSerializer(BulkSelectionSerializer):
+    current_status = serializers.ChoiceField(choices=STATUS_CHOICES)
@@ -0,0 +1,111 @@
+"""
+Delta sync for clients that keep a local copy of the application list.
+
+``GET /api/applications/changes/?since=<token>`` returns the user's
+applications created or updated since the token (each in full, audit history
+included, as ``?include=audits`` renders it) and the ids of those deleted
+since, plus a ``next`` token to pass on the following call. Without
+``since`` everything is returned, as for a first sync. Changes come oldest
+first, ``page_size`` at a time; ``has_more`` says to call again right away.
+
+Changes are found by ``updated_at``, which every write path sets. A write
+committed just after a sync can carry an ``updated_at`` slightly before
+the token, so each sync re-reads the last ``SYNC_OVERLAP_SECONDS`` too.
+Clients apply records and deletions idempotently, so seeing a change
+twice is harmless. Tombstones are kept for ``SYNC_TOMBSTONE_DAYS``; older
+tokens are refused with 410 and the client starts over.
+
+A record's ``audits`` can get shorter: audit compaction (retention.py)
+removes old entries and bumps ``updated_at``, so the record comes back in
+full. Clients replace their copy of a record rather than merging audits.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DeletedApplication, JobApplication
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+class ExpiredToken(ValueError):
+    pass
+
+
+def encode_token(since, started=None, after=None):
+    """
+    ``since`` is where the current sync starts reading. Between the pages of
+    one sync, ``started`` is when its first page was read and ``after`` the
+    (updated_at, id) of the last row sent.
+    """
+    payload = [since.isoformat() if since else None]
+    if after is not None:
+        payload += [started.isoformat(), after[0].isoformat(), after[1]]
+    return urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_token(token):
+    """Return (since, started, after); the last two are None on a sync's first page."""
+    try:
+        since, *rest = json.loads(urlsafe_b64decode(token.encode()))
+        since = datetime.fromisoformat(since) if since else None
+        started = after = None
+        if rest:
+            started = datetime.fromisoformat(rest[0])
+            after = (datetime.fromisoformat(rest[1]), int(rest[2]))
+    except (TypeError, ValueError, IndexError):
+        raise InvalidToken("Invalid sync token")
+    if any(value is not None and timezone.is_naive(value) for value in (since, started)):
+        raise InvalidToken("Invalid sync token")
+    if since and since < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+        raise ExpiredToken("Sync token expired; fetch the full list again")
+    return since, started, after
+
+
+def changes(user, columns, token=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return (rows, deleted ids, next token, has_more) for ``user`` since
+    ``token``, with ``rows`` being ``.values(*columns)`` dicts.
+    """
+    since, started, after = decode_token(token) if token else (None, None, None)
+    started = started or timezone.now()
+    lower = since - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS) if since else None
+
+    queryset = JobApplication.objects.filter(user_id=user.pk)
+    if after is not None:
+        queryset = queryset.filter(
+            Q(updated_at__gt=after[0]) | Q(updated_at=after[0], id__gt=after[1])
+        )
+    elif lower is not None:
+        queryset = queryset.filter(updated_at__gte=lower)
+
+    rows = list(
+        queryset.order_by("updated_at", "id").values(*columns, "updated_at")[:page_size + 1]
+    )
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        return rows, [], encode_token(since, started, (last["updated_at"], last["id"])), True
+
+    # Deletions go out on a sync's last page, so those made while it was
+    # paging are included; the next sync starts from when this one did.
+    deleted = DeletedApplication.objects.filter(
+        user_id=user.pk, deleted_at__gte=lower or started
+    ).order_by("deleted_at", "id").values_list("application_id", flat=True)
+    return rows, list(deleted), encode_token(started), False
+
+
+def prune_tombstones():
+    """Drop tombstones no valid token can ask for any more (a scheduled task)."""
+    DeletedApplication.objects.filter(
+        deleted_at__lt=timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+    ).delete()
@@ -0,0 +1,185 @@
+"""
+A small background task queue.
+
+Tasks are plain functions, enqueued by reference and called with keyword
+arguments from a JSON payload. The default backend stores them in the
+``BackgroundTask`` table, so nothing beyond the database is needed;
+``manage.py run_worker`` claims due tasks, runs them and retries failures
+with exponential backoff. ``TASK_BACKEND`` selects another backend, e.g.
+``ImmediateBackend`` to run tasks in-process as they are enqueued.
+
+Claiming sets a task's ``run_at`` to the end of the worker's lease, so a
+task whose worker died is picked up again once the lease runs out.
+A task whose lease runs out on its last attempt is marked failed instead.
+``TASK_SCHEDULE`` lists functions to enqueue periodically; every worker
+schedules them as each period starts, and a per-period dedupe key keeps it
+to one run.
+"""
+import logging
+import math
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 3600
+
+
+def task_name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next try after ``attempts`` failures."""
+    return min(settings.TASK_RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+class DatabaseBackend:
+    def enqueue(self, tasks):
+        # Tasks whose dedupe_key is already taken are dropped
+        BackgroundTask.objects.bulk_create(tasks, ignore_conflicts=True)
+
+
+class ImmediateBackend:
+    """Runs each task once the enqueueing transaction commits, without a worker."""
+
+    def enqueue(self, tasks):
+        for task in tasks:
+            transaction.on_commit(lambda task=task: import_string(task.name)(**task.payload))
+
+
+def get_backend():
+    return import_string(settings.TASK_BACKEND)()
+
+
+def enqueue_many(func, payloads, dedupe_keys=None, run_at=None, max_attempts=None):
+    """Queue one call of ``func`` per payload."""
+    tasks = [
+        BackgroundTask(
+            name=task_name(func),
+            payload=payload,
+            run_at=run_at or timezone.now(),
+            max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+            dedupe_key=dedupe_key,
+        )
+        for payload, dedupe_key in zip(payloads, dedupe_keys or [None] * len(payloads))
+    ]
+    get_backend().enqueue(tasks)
+    return len(tasks)
+
+
+def enqueue(func, dedupe_key=None, run_at=None, max_attempts=None, **payload):
+    return enqueue_many(
+        func, [payload], dedupe_keys=[dedupe_key], run_at=run_at, max_attempts=max_attempts
+    )
+
+
+def claim(limit, lease=None):
+    """
+    Mark up to ``limit`` due tasks as running under a lease and return them.
+
+    A task whose lease ran out on its last attempt is marked failed rather
+    than claimed again, so a task that kills its worker isn't retried forever.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=lease or settings.TASK_LEASE_SECONDS)
+    with transaction.atomic():
+        due = list(
+            BackgroundTask.objects.select_for_update(skip_locked=True)
+            .filter(status__in=(BackgroundTask.QUEUED, BackgroundTask.RUNNING), run_at__lte=now)
+            .order_by("run_at")
+            .values_list("pk", "status", "attempts", "max_attempts")[:limit]
+        )
+        expired = [
+            pk for pk, status, attempts, max_attempts in due
+            if status == BackgroundTask.RUNNING and attempts >= max_attempts
+        ]
+        if expired:
+            logger.error("Tasks %s failed for good: lease expired on the last attempt", expired)
+            BackgroundTask.objects.filter(pk__in=expired).update(
+                status=BackgroundTask.FAILED, finished_at=now,
+                last_error="Lease expired on the last attempt",
+            )
+        pks = [pk for pk, *_ in due if pk not in expired]
+        BackgroundTask.objects.filter(pk__in=pks).update(
+            status=BackgroundTask.RUNNING, run_at=now + lease, attempts=F("attempts") + 1
+        )
+    return list(BackgroundTask.objects.filter(pk__in=pks).order_by("run_at", "pk"))
+
+
+def execute(task):
+    """Run a claimed task and record the outcome; returns True on success."""
+    try:
+        with transaction.atomic():
+            import_string(task.name)(**task.payload)
+    except Exception:
+        task.last_error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            logger.exception("Task %s (%s) failed for good", task.pk, task.name)
+            task.status, task.finished_at = BackgroundTask.FAILED, timezone.now()
+        else:
+            logger.warning("Task %s (%s) failed, retrying", task.pk, task.name, exc_info=True)
+            task.status = BackgroundTask.QUEUED
+            task.run_at = timezone.now() + timedelta(seconds=retry_delay(task.attempts))
+        task.save(update_fields=["status", "run_at", "last_error", "finished_at"])
+        return False
+
+    task.status, task.finished_at = BackgroundTask.DONE, timezone.now()
+    task.save(update_fields=["status", "finished_at"])
+    return True
+
+
+def run_due(limit=10):
+    """Claim and run up to ``limit`` due tasks; returns how many ran."""
+    tasks = claim(limit)
+    for task in tasks:
+        execute(task)
+    return len(tasks)
+
+
+def schedule_periodic(now=None):
+    """
+    Enqueue this period's run of every TASK_SCHEDULE entry not yet queued.
+    Returns the timestamp at which the next period of any entry starts.
+    """
+    now = (now or timezone.now()).timestamp()
+    next_start = math.inf
+    for path, interval in settings.TASK_SCHEDULE.items():
+        period = int(now // interval)
+        enqueue(import_string(path), dedupe_key=f"{path}@{period}")
+        next_start = min(next_start, (period + 1) * interval)
+    return next_start
+
+
+def prune_tasks(days=7):
+    """Delete finished tasks older than ``days``; failed ones are kept for inspection."""
+    BackgroundTask.objects.filter(
+        status=BackgroundTask.DONE, finished_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+
+
+def work(limit=10, idle_sleep=5, once=False):
+    """
+    The worker loop behind ``manage.py run_worker``. With ``once``, returns
+    the number of tasks run as soon as none are due.
+    """
+    total = 0
+    next_schedule = -math.inf
+    while True:
+        if timezone.now().timestamp() >= next_schedule:
+            next_schedule = schedule_periodic()
+        ran = run_due(limit)
+        total += ran
+        if not ran:
+            if once:
+                return total
+            time.sleep(idle_sleep)
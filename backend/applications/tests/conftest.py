@@ -0,0 +1,59 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from applications.auth import user_states
+from applications.models import JobApplication, User
+from applications.views import reset_dev_user
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached responses are keyed by user id, which the test database reuses
+    cache.clear()
+    user_states.clear()
+    reset_dev_user()
+    yield
+    cache.clear()
+    user_states.clear()
+    reset_dev_user()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="alice", email="alice@example.com", password="pw")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def make_application(db):
+    """Create one application for a user; keyword arguments override the defaults."""
+    def make(user, **kwargs):
+        defaults = {"company_name": "Acme", "position": "Engineer", "current_status": "applied"}
+        defaults.update(kwargs)
+        return JobApplication.objects.create(user=user, **defaults)
+    return make
+
+
+@pytest.fixture
+def make_applications(db):
+    """
+    Create ``count`` applications for a user, each saved through the first
+    ``transitions`` of phone_screen, interview, offer and rejected.
+    """
+    def make(user, count, transitions=0):
+        for i in range(count):
+            app = JobApplication.objects.create(
+                user=user, company_name=f"Company {i}", position="Engineer",
+                current_status="applied",
+            )
+            for status in ["phone_screen", "interview", "offer", "rejected"][:transitions]:
+                app.current_status = status
+                app.save()
+    return make
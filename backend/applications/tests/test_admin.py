@@ -0,0 +1,47 @@
+import pytest
+from django.test import Client
+
+from applications import admin as app_admin
+from applications.models import ApplicationStatusAudit, JobApplication, User
+
+
+@pytest.fixture
+def staff(db):
+    client = Client()
+    client.force_login(User.objects.create_superuser(username="root", password="pw"))
+    return client
+
+
+@pytest.mark.parametrize("model", [JobApplication, ApplicationStatusAudit])
+def test_changelist_query_count_is_independent_of_rows(
+    staff, model, make_applications, django_assert_max_num_queries
+):
+    users = [User.objects.create_user(username=f"user{i}") for i in range(10)]
+    for user in users[:2]:
+        make_applications(user, 2, transitions=1)
+    url = f"/admin/applications/{model._meta.model_name}/"
+    with django_assert_max_num_queries(10) as few:
+        assert staff.get(url).status_code == 200
+
+    for user in users:
+        make_applications(user, 3, transitions=1)
+    with django_assert_max_num_queries(len(few.captured_queries)):
+        assert staff.get(url).status_code == 200
+
+
+def test_changelist_search_uses_the_search_index(staff, user, make_application):
+    for company in ("Google", "Acme"):
+        make_application(user, company_name=company)
+
+    res = staff.get("/admin/applications/jobapplication/?q=goo")
+
+    assert [app.company_name for app in res.context["cl"].result_list] == ["Google"]
+
+
+def test_unfiltered_count_is_estimated_on_large_tables(user, make_application, monkeypatch):
+    make_application(user)
+    monkeypatch.setattr(app_admin, "estimated_count", lambda model, using: 5_000_000)
+    queryset = JobApplication.objects.order_by("-id")
+
+    assert app_admin.EstimatedCountPaginator(queryset, 100).count == 5_000_000
+    assert app_admin.EstimatedCountPaginator(queryset.filter(user=user), 100).count == 1
@@ -0,0 +1,548 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import F, Prefetch
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from applications.models import (
+    ApplicationStatusAudit, DailyTransitionRollup, DashboardSummary, JobApplication, User,
+)
+from applications.serializers import JobApplicationSerializer
+
+
+def test_list_omits_audits_by_default(client, user, make_applications):
+    make_applications(user, 1, transitions=1)
+
+    res = client.get("/api/applications/")
+
+    assert res.status_code == 200
+    assert "audits" not in res.data["results"][0]
+    assert "needs_followup" in res.data["results"][0]
+
+
+def test_list_includes_audits_on_request(client, user, make_applications):
+    make_applications(user, 1, transitions=2)
+
+    res = client.get("/api/applications/?include=audits")
+
+    audits = res.data["results"][0]["audits"]
+    assert [a["new_status"] for a in audits] == ["phone_screen", "interview"]
+
+
+def test_list_sparse_fieldset(client, user, make_applications):
+    make_applications(user, 2)
+
+    res = client.get("/api/applications/?fields=id,company_name")
+
+    assert all(set(row) == {"id", "company_name"} for row in res.data["results"])
+
+
+@pytest.mark.parametrize("query,include", [
+    ("", []),
+    ("?include=audits", ["audits"]),
+    ("?fields=id,needs_followup,audits,user", []),
+    ("?pagination=cursor&page_size=3", []),
+])
+def test_lean_list_matches_serializer_output(client, user, query, include, make_applications):
+    make_applications(user, 4, transitions=2)
+    JobApplication.objects.create(
+        user=user,
+        company_name="Zoë \u2028 Café 😀",
+        position='"Quoted" <Lead>',
+        contact_name=None,
+        contact_email="",
+        current_status="applied",
+        applied_date=timezone.localdate() - timedelta(days=30),
+        last_contacted_at=timezone.now() - timedelta(days=20),
+    )
+
+    res = client.get(f"/api/applications/{query}")
+
+    fields = [name for name in query.partition("fields=")[2].split(",") if name]
+    page_size = 3 if "cursor" in query else None
+    queryset = JobApplication.objects.filter(user=user).order_by(
+        F("applied_date").desc(nulls_last=True), "-id"
+    )[:page_size]
+    expected = JobApplicationSerializer(
+        queryset.prefetch_related(Prefetch(
+            "audits", queryset=ApplicationStatusAudit.objects.order_by("changed_at", "id")
+        )),
+        many=True, fields=fields, include=include,
+    ).data
+    # Byte-for-byte what the serializer and DRF's renderer would produce
+    assert res.content == JSONRenderer().render({**json.loads(res.content), "results": expected})
+
+
+def test_retrieve_includes_audits(client, user, make_applications):
+    make_applications(user, 1, transitions=1)
+    app = JobApplication.objects.get()
+
+    res = client.get(f"/api/applications/{app.pk}/")
+
+    assert len(res.data["audits"]) == 1
+
+
+@pytest.mark.parametrize("count,transitions", [(3, 1), (40, 4)])
+def test_list_query_count_is_independent_of_page_size(
+    client, user, django_assert_num_queries, count, transitions, make_applications
+):
+    make_applications(user, count, transitions=transitions)
+
+    # COUNT(*), page of applications, one batched audit prefetch
+    with django_assert_num_queries(3):
+        res = client.get("/api/applications/?include=audits&page_size=100")
+
+    assert len(res.data["results"]) == count
+
+
+def test_month_filter_uses_half_open_range(client, user):
+    for applied in ["2025-11-30", "2025-12-01", "2025-12-31", "2026-01-01"]:
+        JobApplication.objects.create(
+            user=user, company_name=applied, position="Engineer",
+            current_status="applied", applied_date=applied,
+        )
+
+    res = client.get("/api/applications/?month=12&year=2025")
+
+    assert sorted(r["company_name"] for r in res.data["results"]) == ["2025-12-01", "2025-12-31"]
+
+
+def test_month_filter_rejects_invalid_values(client, user):
+    res = client.get("/api/applications/?month=13&year=2025")
+
+    assert res.status_code == 400
+
+
+def walk_cursor_pages(client, url):
+    pages = []
+    while url:
+        res = client.get(url)
+        assert "count" not in res.data
+        pages.append([r["id"] for r in res.data["results"]])
+        url = res.data["next"]
+    return pages
+
+
+def test_cursor_pagination_walks_every_row_once(client, user):
+    dates = ["2026-01-05", None, "2026-01-05", "2026-02-01", None, "2025-12-31", "2026-01-05"]
+    for i, applied in enumerate(dates):
+        JobApplication.objects.create(
+            user=user, company_name=str(i), position="Engineer",
+            current_status="applied", applied_date=applied,
+        )
+    expected = list(
+        JobApplication.objects.order_by(F("applied_date").desc(nulls_last=True), "-id")
+        .values_list("id", flat=True)
+    )
+
+    pages = walk_cursor_pages(client, "/api/applications/?pagination=cursor&page_size=2")
+
+    assert [pk for page in pages for pk in page] == expected
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+
+
+def test_cursor_pagination_previous_link(client, user, make_applications):
+    make_applications(user, 5)
+
+    first = client.get("/api/applications/?pagination=cursor&page_size=2")
+    second = client.get(first.data["next"])
+    back = client.get(second.data["previous"])
+
+    assert first.data["previous"] is None
+    assert back.data["results"] == first.data["results"]
+    assert back.data["previous"] is None
+
+
+def test_cursor_pagination_skips_count(client, user, django_assert_num_queries, make_applications):
+    make_applications(user, 5)
+    first = client.get("/api/applications/?pagination=cursor&page_size=2")
+
+    with django_assert_num_queries(1):
+        client.get(first.data["next"])
+
+
+def test_invalid_cursor_returns_404(client, user):
+    res = client.get("/api/applications/?cursor=not-a-cursor")
+
+    assert res.status_code == 404
+
+
+def test_dashboard_is_a_single_lookup(client, user, django_assert_num_queries, make_applications):
+    make_applications(user, 3, transitions=1)
+
+    with django_assert_num_queries(1):
+        res = client.get("/api/dashboard/")
+
+    assert res.data["status_counts"] == [{"current_status": "phone_screen", "count": 3}]
+
+
+def test_list_is_served_from_cache_until_a_write(
+    client, user, django_assert_num_queries, django_capture_on_commit_callbacks, make_applications
+):
+    make_applications(user, 2)
+    client.get("/api/applications/")
+
+    with django_assert_num_queries(0):
+        cached = client.get("/api/applications/")
+    assert cached.data["count"] == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post("/api/applications/", {
+            "company_name": "New", "position": "Engineer", "current_status": "applied",
+        })
+
+    assert client.get("/api/applications/").data["count"] == 3
+
+
+def test_cache_is_keyed_by_query(client, user, make_applications):
+    make_applications(user, 3)
+    client.get("/api/applications/?page_size=1")
+
+    assert len(client.get("/api/applications/?page_size=2").data["results"]) == 2
+
+
+def test_etag_revalidation(client, user, django_capture_on_commit_callbacks, make_applications):
+    make_applications(user, 1)
+    first = client.get("/api/dashboard/")
+
+    not_modified = client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert not_modified.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_applications(user, 1)
+    changed = client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert changed.status_code == 200
+    assert changed["ETag"] != first["ETag"]
+
+
+def test_bulk_import_csv_reports_row_errors(client, user):
+    upload = SimpleUploadedFile("apps.csv", (
+        "company_name,position,current_status,applied_date,contact_email\n"
+        "Acme,Engineer,applied,2026-01-02,\n"
+        "Globex,,applied,,\n"
+        "Initech,Analyst,interview,,not-an-email\n"
+        "Umbrella,Chemist,offer,,hr@umbrella.test\n"
+    ).encode())
+
+    res = client.post("/api/applications/bulk/", {"file": upload}, format="multipart")
+
+    assert res.data["created"] == 2
+    assert [e["row"] for e in res.data["errors"]] == [3, 4]
+    assert "position" in res.data["errors"][0]["errors"]
+    assert set(JobApplication.objects.values_list("company_name", flat=True)) == {"Acme", "Umbrella"}
+    assert DashboardSummary.objects.get(pk=user.pk).status_counts == {"applied": 1, "offer": 1}
+
+
+def test_bulk_import_jsonl(client, user):
+    upload = SimpleUploadedFile("apps.jsonl", (
+        b'{"company_name": "Acme", "position": "Engineer", "current_status": "applied"}\n'
+        b'not json\n'
+    ))
+
+    res = client.post("/api/applications/bulk/", {"file": upload}, format="multipart")
+
+    assert res.data["created"] == 1
+    assert res.data["errors"][0]["row"] == 2
+
+
+def test_export_streams_ndjson_with_audits(client, user, make_applications):
+    make_applications(user, 2, transitions=2)
+
+    res = client.get("/api/applications/export/?export_format=ndjson")
+
+    assert res.streaming
+    records = [json.loads(line) for line in b"".join(res.streaming_content).splitlines()]
+    assert len(records) == 2
+    assert [a["new_status"] for a in records[0]["audits"]] == ["phone_screen", "interview"]
+
+
+def test_export_csv_and_scope(client, user, make_applications):
+    make_applications(user, 3)
+    other = User.objects.create_user(username="bob", password="pw")
+    make_applications(other, 1)
+
+    res = client.get("/api/applications/export/")
+    rows = list(csv.DictReader(io.StringIO(b"".join(res.streaming_content).decode())))
+    assert len(rows) == 3
+    assert rows[0]["audits"] == "[]"
+
+    assert client.get("/api/applications/export/?scope=all").status_code == 403
+    user.role = "admin"
+    user.save()
+    res = client.get("/api/applications/export/?scope=all&export_format=ndjson")
+    assert len(b"".join(res.streaming_content).splitlines()) == 4
+
+
+def sync(client, token=None, **params):
+    if token:
+        params["since"] = token
+    res = client.get("/api/applications/changes/", params)
+    assert res.status_code == 200, res.content
+    return res.data
+
+
+def test_changes_returns_only_what_changed_since_the_token(client, user, settings, make_applications):
+    settings.SYNC_OVERLAP_SECONDS = 0
+    make_applications(user, 3)
+    first = sync(client)
+    assert len(first["applications"]) == 3
+    assert (first["deleted"], first["has_more"]) == ([], False)
+
+    kept, changed, removed = JobApplication.objects.order_by("id")
+    changed.current_status = "interview"
+    changed.save()
+    removed_pk = removed.pk
+    removed.delete()
+    JobApplication.objects.filter(pk=kept.pk).update(location="Remote")
+    created = JobApplication.objects.create(
+        user=user, company_name="New", position="Engineer", current_status="applied"
+    )
+
+    second = sync(client, first["next"])
+
+    assert [row["id"] for row in second["applications"]] == [changed.pk, kept.pk, created.pk]
+    assert [a["new_status"] for a in second["applications"][0]["audits"]] == ["interview"]
+    assert second["deleted"] == [removed_pk]
+    assert sync(client, second["next"])["applications"] == []
+
+
+def test_changes_pages_and_reports_deletions_made_meanwhile(client, user, make_applications):
+    make_applications(user, 5)
+
+    page = sync(client, page_size=2)
+    seen = [row["id"] for row in page["applications"]]
+    JobApplication.objects.get(pk=seen[0]).delete()
+    while page["has_more"]:
+        assert page["deleted"] == []
+        page = sync(client, page["next"], page_size=2)
+        seen += [row["id"] for row in page["applications"]]
+
+    assert sorted(seen) == sorted(seen[:1] + list(JobApplication.objects.values_list("id", flat=True)))
+    assert page["deleted"] == seen[:1]
+
+
+def test_changes_rejects_bad_and_expired_tokens(client, user, settings):
+    from applications.sync import encode_token
+
+    assert client.get("/api/applications/changes/?since=garbage").status_code == 400
+    expired = encode_token(timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS + 1))
+    assert client.get(f"/api/applications/changes/?since={expired}").status_code == 410
+
+
+def test_bulk_update_status_by_ids(client, user, django_assert_max_num_queries, make_applications):
+    make_applications(user, 3)
+    mine = list(JobApplication.objects.order_by("id").values_list("pk", flat=True))
+    JobApplication.objects.filter(pk=mine[2]).update(current_status="rejected")
+    other = User.objects.create_user(username="bob", password="pw")
+    make_applications(other, 1)
+    theirs = JobApplication.objects.get(user=other).pk
+
+    with django_assert_max_num_queries(16):
+        res = client.post(
+            "/api/applications/bulk_update_status/",
+            {"ids": mine + [theirs], "current_status": "rejected"},
+            format="json",
+        )
+
+    assert res.data["updated"] == 2
+    outcomes = {r["id"]: r["result"] for r in res.data["results"]}
+    assert outcomes == {mine[0]: "updated", mine[1]: "updated", mine[2]: "unchanged", theirs: "not_found"}
+    assert JobApplication.objects.get(pk=theirs).current_status == "applied"
+    assert ApplicationStatusAudit.objects.filter(new_status="rejected").count() == 3
+
+
+def test_bulk_update_status_by_filter(client, user, make_applications):
+    make_applications(user, 2)
+    make_applications(user, 1, transitions=1)
+
+    res = client.post(
+        "/api/applications/bulk_update_status/",
+        {"filter": {"status": "applied"}, "current_status": "rejected"},
+        format="json",
+    )
+
+    assert res.data["updated"] == 2
+    assert DashboardSummary.objects.get(pk=user.pk).status_counts == {
+        "rejected": 2, "phone_screen": 1,
+    }
+
+
+def test_bulk_selection_requires_ids_or_filter(client, user):
+    res = client.post("/api/applications/bulk_destroy/", {}, format="json")
+
+    assert res.status_code == 400
+
+
+def test_bulk_destroy(client, user, make_applications):
+    make_applications(user, 3)
+    ids = list(JobApplication.objects.values_list("pk", flat=True))[:2]
+
+    res = client.post("/api/applications/bulk_destroy/", {"ids": ids + [999]}, format="json")
+
+    assert res.data["deleted"] == 2
+    assert {"id": 999, "result": "not_found"} in res.data["results"]
+    assert JobApplication.objects.count() == 1
+    assert DashboardSummary.objects.get(pk=user.pk).status_counts == {"applied": 1}
+
+
+def test_needs_followup_filter_matches_flag(client, user):
+    old = timezone.localdate() - timedelta(days=10)
+    for name, contacted in [("stale", None), ("contacted", timezone.now())]:
+        JobApplication.objects.create(
+            user=user, company_name=name, position="Engineer", current_status="applied",
+            applied_date=old, last_contacted_at=contacted,
+        )
+
+    res = client.get("/api/applications/?status=needs_followup")
+    everything = client.get("/api/applications/")
+
+    assert [r["company_name"] for r in res.data["results"]] == ["stale"]
+    assert {r["company_name"] for r in everything.data["results"] if r["needs_followup"]} == {"stale"}
+
+
+def test_search_prefix_and_ranking(client, user):
+    for company, position in [
+        ("Google", "Engineer"), ("Globex", "Google Ads Specialist"), ("Initech", "Analyst"),
+    ]:
+        JobApplication.objects.create(
+            user=user, company_name=company, position=position, current_status="applied",
+        )
+    other = User.objects.create_user(username="bob", password="pw")
+    JobApplication.objects.create(
+        user=other, company_name="Google", position="Engineer", current_status="applied",
+    )
+
+    res = client.get("/api/applications/?q=goo")
+    assert sorted(r["company_name"] for r in res.data["results"]) == ["Globex", "Google"]
+
+    res = client.get("/api/applications/?q=google engineer")
+    assert [r["company_name"] for r in res.data["results"]] == ["Google"]
+
+
+def test_search_ignores_cursor_paging_to_keep_relevance_order(client, user, make_application):
+    make_application(
+        user, company_name="Python Software", position="Python Developer",
+        applied_date=date(2020, 1, 1),
+    )
+    make_application(
+        user, company_name="Acme", position="Python tester on the platform team",
+        applied_date=date(2024, 1, 1),
+    )
+
+    ranked = client.get("/api/applications/?q=python").data
+    assert [r["company_name"] for r in ranked["results"]] == ["Python Software", "Acme"]
+
+    res = client.get("/api/applications/?q=python&pagination=cursor")
+    assert [r["company_name"] for r in res.data["results"]] == ["Python Software", "Acme"]
+    assert res.data["count"] == 2
+
+
+def test_bulk_actions_accept_search_filter(client, user, make_applications):
+    make_applications(user, 3)
+    JobApplication.objects.filter(company_name="Company 1").update(company_name="Umbrella")
+
+    res = client.post(
+        "/api/applications/bulk_update_status/",
+        {"filter": {"q": "umbrella"}, "current_status": "rejected"},
+        format="json",
+    )
+    assert res.data["updated"] == 1
+
+    res = client.post("/api/applications/bulk_destroy/", {"filter": {"q": "umbrella"}}, format="json")
+    assert res.data["deleted"] == 1
+    assert sorted(JobApplication.objects.values_list("company_name", flat=True)) == [
+        "Company 0", "Company 2",
+    ]
+
+
+def test_search_index_follows_updates_and_deletes(client, user, make_applications):
+    make_applications(user, 2)
+    first, second = JobApplication.objects.order_by("id")
+    first.company_name = "Umbrella"
+    first.save()
+    JobApplication.objects.filter(pk=second.pk).update(company_name="Umbrella Corp")
+    second.delete()
+
+    res = client.get("/api/applications/?q=umbrella")
+
+    assert [r["id"] for r in res.data["results"]] == [first.pk]
+
+
+def test_analytics_reports(client, user, make_applications):
+    make_applications(user, 3, transitions=1)
+    JobApplication.objects.filter(company_name="Company 0").update(current_status="interview")
+
+    weekly = client.get("/api/analytics/weekly/").data["results"]
+    assert sum(week["applications"] for week in weekly) == 3
+
+    conversions = {
+        (row["from_status"], row["to_status"]): row
+        for row in client.get("/api/analytics/conversions/").data["results"]
+    }
+    assert conversions[("applied", "phone_screen")]["rate"] == 1.0
+    assert conversions[("phone_screen", "interview")]["rate"] == round(1 / 3, 4)
+
+    stages = client.get("/api/analytics/time-in-stage/").data["results"]
+    assert {row["status"]: row["samples"] for row in stages} == {"applied": 3, "phone_screen": 1}
+    assert client.get("/api/analytics/nope/").status_code == 404
+
+
+def test_admin_scope_lists_every_users_applications(client, user, make_applications):
+    other = User.objects.create_user(username="bob", password="pw")
+    make_applications(user, 2)
+    make_applications(other, 3)
+
+    assert client.get("/api/applications/?scope=all").status_code == 403
+    user.role = "admin"
+    user.save()
+
+    res = client.get("/api/applications/?scope=all")
+    assert res.status_code == 200
+    assert "count" not in res.data  # keyset paging, no COUNT(*)
+    assert len(res.data["results"]) == 5
+    res = client.get(f"/api/applications/?scope=all&user={other.pk}")
+    assert {row["id"] for row in res.data["results"]} == set(
+        other.job_applications.values_list("id", flat=True)
+    )
+    assert client.get("/api/applications/?scope=all&user=bob").status_code == 400
+    # Not served from the admin's cache when another user writes
+    make_applications(other, 1)
+    assert len(client.get("/api/applications/?scope=all").data["results"]) == 6
+    # Without the scope, admins still list their own
+    assert len(client.get("/api/applications/").data["results"]) == 2
+
+
+def test_admin_scope_analytics_span_users(client, user, make_applications):
+    other = User.objects.create_user(username="bob", password="pw")
+    make_applications(user, 2, transitions=1)
+    make_applications(other, 3)
+
+    assert client.get("/api/analytics/weekly/?scope=all").status_code == 403
+    user.role = "admin"
+    user.save()
+
+    weekly = client.get("/api/analytics/weekly/?scope=all").data["results"]
+    assert sum(week["applications"] for week in weekly) == 5
+    conversions = client.get("/api/analytics/conversions/?scope=all").data["results"]
+    assert [(row["from_status"], row["count"]) for row in conversions] == [("applied", 2)]
+    weekly = client.get("/api/analytics/weekly/").data["results"]
+    assert sum(week["applications"] for week in weekly) == 2
+
+
+def test_backfill_matches_incremental_rollups(user, make_applications):
+    make_applications(user, 4, transitions=3)
+    incremental = sorted(
+        DailyTransitionRollup.objects.values_list("previous_status", "new_status", "count", "stage_days")
+    )
+
+    call_command("backfill_analytics", stdout=io.StringIO())
+
+    assert sorted(
+        DailyTransitionRollup.objects.values_list("previous_status", "new_status", "count", "stage_days")
+    ) == incremental
@@ -0,0 +1,143 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from applications import async_views
+from applications.auth import AppRefreshToken
+from applications.models import JobApplication, User
+
+
+class BearerAsyncClient(AsyncClient):
+    # AsyncClient(headers=...) doesn't reach the ASGI scope, so send per request
+    def __init__(self, token):
+        super().__init__()
+        self.token = token
+
+    def generic(self, *args, headers=None, **kwargs):
+        headers = {"Authorization": f"Bearer {self.token}", **(headers or {})}
+        return super().generic(*args, headers=headers, **kwargs)
+
+
+@pytest.fixture
+def aclient(user):
+    return BearerAsyncClient(AppRefreshToken.for_user(user).access_token)
+
+
+def request(client, method, path, **kwargs):
+    return async_to_sync(getattr(client, method))(path, **kwargs)
+
+
+@pytest.mark.parametrize("query", [
+    "?page=2&page_size=2&include=audits",
+    "?fields=id,company_name",
+    "?pagination=cursor&page_size=2",
+    "?page=last&page_size=2",
+    "?page=&page_size=2",
+])
+def test_async_list_matches_sync_list(aclient, user, query, make_applications):
+    make_applications(user, 5)
+    sync_client = APIClient()
+    sync_client.force_authenticate(user=user)
+    expected = sync_client.get(f"/api/applications/{query}").json()
+    cache.clear()
+
+    res = request(aclient, "get", f"/api/applications/{query}")
+
+    assert res.status_code == 200
+    assert res.json() == expected
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer not-a-token"}])
+def test_async_list_requires_authentication(db, headers):
+    expected = APIClient().get("/api/applications/", headers=headers)
+
+    res = request(AsyncClient(), "get", "/api/applications/", headers=headers)
+
+    assert (res.status_code, res.json()) == (401, expected.json())
+    assert res["WWW-Authenticate"] == expected["WWW-Authenticate"] == 'Bearer realm="api"'
+
+
+@pytest.mark.parametrize("accept", ["text/html", "application/json; indent=2", "application/xml"])
+def test_async_list_negotiates_like_sync_list(aclient, user, accept, make_applications):
+    make_applications(user, 1)
+    sync_client = APIClient()
+    sync_client.force_authenticate(user=user)
+    expected = sync_client.get("/api/applications/", headers={"Accept": accept})
+
+    res = request(aclient, "get", "/api/applications/", headers={"Accept": accept})
+
+    assert res.status_code == expected.status_code
+    assert res["Content-Type"] == expected["Content-Type"]
+    if "indent" in accept:
+        assert res.content == expected.content
+
+
+def test_async_list_rejects_out_of_range_page(aclient, user, make_applications):
+    make_applications(user, 2)
+
+    res = request(aclient, "get", "/api/applications/?page=3")
+
+    assert res.status_code == 404
+
+
+def test_async_retrieve_is_scoped_to_user(aclient, user, make_applications):
+    make_applications(user, 1)
+    other = User.objects.create_user(username="bob", password="pw")
+    make_applications(other, 1)
+    own, foreign = JobApplication.objects.order_by("user_id")
+
+    assert request(aclient, "get", f"/api/applications/{own.pk}/").json()["audits"] == []
+    assert request(aclient, "get", f"/api/applications/{foreign.pk}/").status_code == 404
+
+
+def test_async_writes_are_delegated_to_sync_views(aclient, user):
+    res = request(
+        aclient, "post", "/api/applications/",
+        data={"company_name": "Acme", "position": "Engineer", "current_status": "applied"},
+        content_type="application/json",
+    )
+    assert res.status_code == 201
+
+    pk = res.json()["id"]
+    res = request(
+        aclient, "patch", f"/api/applications/{pk}/",
+        data={"current_status": "interview"}, content_type="application/json",
+    )
+    assert res.status_code == 200
+    assert JobApplication.objects.get().current_status == "interview"
+
+
+def test_async_dashboard_is_cached(aclient, user, make_applications):
+    make_applications(user, 2)
+
+    first = request(aclient, "get", "/api/dashboard/")
+    assert first.status_code == 200
+    assert {"current_status": "applied", "count": 2} in first.json()["status_counts"]
+
+    res = request(aclient, "get", "/api/dashboard/", headers={"If-None-Match": first["ETag"]})
+    assert res.status_code == 304
+
+
+def test_async_google_login(db, monkeypatch):
+    async def verify(token, audience):
+        if token != "good":
+            raise ValueError("Token expired")
+        return {"email": "carol@example.com", "given_name": "Carol"}
+    monkeypatch.setattr(async_views, "averify_id_token", verify)
+
+    res = request(
+        AsyncClient(), "post", "/api/social/google/",
+        data={"access_token": "good"}, content_type="application/json",
+    )
+    assert res.status_code == 200
+    assert set(res.json()) == {"access", "refresh"}
+    assert User.objects.get(email="carol@example.com").first_name == "Carol"
+
+    res = request(
+        AsyncClient(), "post", "/api/social/google/",
+        data={"access_token": "bad"}, content_type="application/json",
+    )
+    assert res.status_code == 400
+    assert res.json()["details"] == "Token expired"
@@ -0,0 +1,116 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.auth import AppRefreshToken, user_states
+from applications.models import JobApplication, User
+
+
+def bearer(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def user_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if '"applications_user"' in q["sql"]]
+
+
+def test_token_requests_skip_the_user_query_once_cached(user, django_capture_on_commit_callbacks):
+    client = bearer(AppRefreshToken.for_user(user).access_token)
+    app = JobApplication.objects.create(
+        user=user, company_name="Acme", position="Engineer", current_status="applied"
+    )
+    assert client.get("/api/applications/").status_code == 200
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(f"/api/applications/{app.pk}/").status_code == 200
+        with django_capture_on_commit_callbacks(execute=True):
+            res = client.post("/api/applications/", {
+                "company_name": "Initech", "position": "Engineer", "current_status": "applied",
+            })
+        assert res.status_code == 201
+
+    assert user_queries(ctx) == []
+    assert JobApplication.objects.get(pk=res.data["id"]).user_id == user.pk
+
+
+def test_role_comes_from_the_token(user):
+    user.role = "admin"
+    user.save()
+    client = bearer(AppRefreshToken.for_user(user).access_token)
+
+    assert client.get("/api/cache/stats/").status_code == 200
+
+
+@pytest.mark.parametrize("change", [
+    lambda user: setattr(user, "role", "admin"),
+    lambda user: setattr(user, "is_active", False),
+    lambda user: user.set_password("new password"),
+])
+def test_auth_changes_revoke_tokens(user, change, django_capture_on_commit_callbacks):
+    client = bearer(AppRefreshToken.for_user(user).access_token)
+    assert client.get("/api/applications/").status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        change(user)
+        user.save()
+
+    assert client.get("/api/applications/").status_code == 401
+    if user.is_active:
+        assert bearer(AppRefreshToken.for_user(user).access_token).get(
+            "/api/applications/"
+        ).status_code == 200
+
+
+def test_unrelated_saves_keep_tokens(user):
+    client = bearer(AppRefreshToken.for_user(user).access_token)
+    user = User.objects.get(pk=user.pk)
+    user.first_name = "Alice"
+    user.save()
+
+    assert client.get("/api/applications/").status_code == 200
+
+
+def test_revoke_tokens_is_seen_elsewhere_once_the_cache_expires(
+    user, settings, django_capture_on_commit_callbacks
+):
+    client = bearer(AppRefreshToken.for_user(user).access_token)
+    assert client.get("/api/applications/").status_code == 200
+    # Another process revoking leaves this process's cached state in place
+    User.objects.filter(pk=user.pk).update(auth_version=5)
+    assert client.get("/api/applications/").status_code == 200
+
+    user_states.clear()
+    assert client.get("/api/applications/").status_code == 401
+
+    # With no caching, every request reads the current version
+    settings.AUTH_USER_CACHE_SECONDS = 0
+    user_states.clear()
+    user.refresh_from_db()
+    client = bearer(AppRefreshToken.for_user(user).access_token)
+    assert client.get("/api/applications/").status_code == 200
+    with django_capture_on_commit_callbacks():
+        user.revoke_tokens()
+    assert client.get("/api/applications/").status_code == 401
+
+
+def test_deleted_user_is_rejected(user, django_capture_on_commit_callbacks):
+    client = bearer(AppRefreshToken.for_user(user).access_token)
+    assert client.get("/api/applications/").status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+
+    assert client.get("/api/applications/").status_code == 401
+
+
+def test_tokens_without_claims_load_the_user(user):
+    client = bearer(RefreshToken.for_user(user).access_token)
+
+    assert client.get("/api/applications/").status_code == 200
+    user.is_active = False
+    user.save()
+    assert client.get("/api/applications/").status_code == 401
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from applications.models import ApplicationStatusAudit, DailyTransitionRollup, JobApplication, User
+
+
+@pytest.fixture
+def seeded(db):
+    call_command(
+        "seed_benchmark_data", users=3, applications=60, audits=120, batch_size=25
+    )
+
+
+def test_seed_generates_consistent_data(seeded):
+    assert User.objects.filter(username__startswith="bench_user_").count() == 3
+    assert JobApplication.objects.count() == 60
+    assert ApplicationStatusAudit.objects.exists()
+    assert DailyTransitionRollup.objects.exists()
+    # Summaries match the table they were rebuilt from
+    call_command("rebuild_dashboard_summaries", check=True)
+
+    with pytest.raises(CommandError):
+        call_command("seed_benchmark_data", users=1, applications=1, audits=0)
+
+
+def test_benchmark_writes_results_and_flags_regressions(seeded, tmp_path):
+    output = tmp_path / "results.json"
+    call_command(
+        "benchmark_api", iterations=2, scenario=["list", "dashboard"], output=str(output)
+    )
+
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == {"list", "dashboard"}
+    result = report["results"]["list"]
+    assert result["status"] == 200
+    assert result["queries"] >= 1
+    assert result["p50_ms"] <= result["p95_ms"] <= result["max_ms"]
+
+    for entry in report["results"].values():
+        entry["p50_ms"] /= 100
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report))
+    with pytest.raises(CommandError, match="regression"):
+        call_command(
+            "benchmark_api", iterations=1, scenario=["list"],
+            output=str(tmp_path / "next.json"), compare=str(baseline),
+        )
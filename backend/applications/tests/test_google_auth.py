@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from asgiref.sync import async_to_sync
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+from rest_framework.test import APIClient
+
+from applications import google_auth
+from applications.models import User
+
+AUDIENCE = "test-client-id"
+
+
+def make_key(key_id):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, key_id)])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1)).not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    pem_key = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    signer = crypt.RSASigner.from_string(pem_key, key_id=key_id)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class StubCertServer:
+    """Serves a certs document the way googleapis.com does, counting requests."""
+
+    def __init__(self):
+        self.certs = {}
+        self.cache_control = "public, max-age=3600"
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                body = json.dumps(stub.certs).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", stub.cache_control)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/oauth2/v1/certs"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def add_key(self, key_id):
+        signer, cert = make_key(key_id)
+        self.certs[key_id] = cert
+        return signer
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub(settings):
+    server = StubCertServer()
+    settings.GOOGLE_CERTS_URL = server.url
+    settings.GOOGLE_CLIENT_ID = AUDIENCE
+    google_auth.reset()
+    yield server
+    google_auth.reset()
+    server.close()
+
+
+def id_token(signer, email="carol@example.com", **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com", "aud": AUDIENCE, "iat": now, "exp": now + 3600,
+        "email": email, "given_name": "Carol", **claims,
+    }
+    return jwt.encode(signer, payload).decode()
+
+
+def login(token):
+    return APIClient().post("/api/social/google/", {"access_token": token}, format="json")
+
+
+def test_login_burst_fetches_certs_once(stub, db):
+    signer = stub.add_key("key-1")
+    tokens = [id_token(signer, email=f"user{i}@example.com") for i in range(5)]
+
+    for token in tokens + tokens:
+        assert login(token).status_code == 200
+
+    assert stub.requests == 1
+    assert User.objects.filter(email__endswith="@example.com").count() == 5
+
+
+def test_verified_token_cache_skips_verification(stub, monkeypatch):
+    token = id_token(stub.add_key("key-1"))
+    google_auth.verify_id_token(token, AUDIENCE)
+
+    monkeypatch.setattr(google_auth, "decode_id_token", pytest.fail)
+    assert google_auth.verify_id_token(token, AUDIENCE)["email"] == "carol@example.com"
+
+
+def test_certs_refetched_when_max_age_runs_out(stub):
+    stub.cache_control = "public, max-age=0"
+    signer = stub.add_key("key-1")
+
+    google_auth.verify_id_token(id_token(signer, email="a@example.com"), AUDIENCE)
+    google_auth.verify_id_token(id_token(signer, email="b@example.com"), AUDIENCE)
+
+    assert stub.requests == 2
+
+
+def test_unknown_key_id_refreshes_certs(stub, monkeypatch):
+    stub.add_key("key-1")
+    google_auth.get_certs()
+    token = id_token(stub.add_key("key-2"))
+
+    # Right after a fetch an unknown key id is just an invalid token
+    with pytest.raises(ValueError):
+        google_auth.verify_id_token(token, AUDIENCE)
+    assert stub.requests == 1
+
+    monkeypatch.setattr(google_auth, "MIN_REFRESH_INTERVAL", 0)
+    idinfo = google_auth.verify_id_token(token, AUDIENCE)
+
+    assert idinfo["email"] == "carol@example.com"
+    assert stub.requests == 2
+
+
+def test_invalid_token_is_rejected(stub, db):
+    stub.add_key("key-1")
+    forged = id_token(make_key("key-1")[0])
+
+    res = login(forged)
+
+    assert res.status_code == 400
+    assert not User.objects.exists()
+
+
+def test_unreachable_cert_server(stub, db):
+    token = id_token(stub.add_key("key-1"))
+    stub.close()
+
+    assert login(token).status_code == 503
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"Cache-Control": "public, max-age=21600, must-revalidate"}, 21600),
+    ({"Cache-Control": "public, max-age=600", "Age": "100"}, 500),
+    ({"Cache-Control": "no-cache"}, 0),
+    ({}, 0),
+])
+def test_max_age(headers, expected):
+    assert google_auth.max_age(headers) == expected
+
+
+def test_async_verification_shares_cert_cache(stub):
+    signer = stub.add_key("key-1")
+    google_auth.verify_id_token(id_token(signer, email="a@example.com"), AUDIENCE)
+
+    idinfo = async_to_sync(google_auth.averify_id_token)(
+        id_token(signer, email="b@example.com"), AUDIENCE
+    )
+
+    assert idinfo["email"] == "b@example.com"
+    assert stub.requests == 1
+
+
+def test_concurrent_async_verifications_fetch_certs_once(stub):
+    signer = stub.add_key("key-1")
+    tokens = [id_token(signer, email=f"user{i}@example.com") for i in range(5)]
+
+    async def verify_all():
+        return await asyncio.gather(*(google_auth.averify_id_token(token, AUDIENCE) for token in tokens))
+
+    results = async_to_sync(verify_all)()
+
+    assert [idinfo["email"] for idinfo in results] == [f"user{i}@example.com" for i in range(5)]
+    assert stub.requests == 1
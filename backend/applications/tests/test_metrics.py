@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.metrics import request_metrics
+from applications.models import JobApplication
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    request_metrics.reset()
+    yield
+    request_metrics.reset()
+
+
+def test_server_timing_reports_queries(client, user):
+    JobApplication.objects.create(user=user, company_name="Acme", position="Engineer")
+
+    with CaptureQueriesContext(connection) as captured:
+        res = client.get("/api/applications/")
+
+    assert res.status_code == 200
+    assert res["Server-Timing"].startswith("app;dur=")
+    assert f'desc="{len(captured)} queries"' in res["Server-Timing"]
+
+
+def test_streamed_responses_are_measured_until_the_body_closes(client, user, make_applications):
+    make_applications(user, 3, transitions=1)
+
+    with CaptureQueriesContext(connection) as captured:
+        res = client.get("/api/applications/export/")
+        b"".join(res.streaming_content)
+
+    assert captured and "Server-Timing" not in res
+    body = request_metrics.render()
+    assert 'http_requests_total{view="applications-export",method="GET",status="200"} 1' in body
+    queries = f'http_request_db_queries_sum{{view="applications-export",method="GET"}}'
+    assert f"{queries} {len(captured):.6f}" in body
+
+
+def test_metrics_endpoint_exposes_histograms(client):
+    client.get("/api/applications/")
+    client.get("/api/applications/")
+
+    res = APIClient().get("/metrics")
+
+    assert res.status_code == 200
+    body = res.content.decode()
+    assert 'http_requests_total{view="applications-list",method="GET",status="200"} 2' in body
+    assert 'http_request_duration_seconds_count{view="applications-list",method="GET"} 2' in body
+    assert 'http_request_db_queries_bucket{view="applications-list",method="GET",le="+Inf"} 2' in body
+
+
+def test_metrics_token(client, settings):
+    settings.METRICS_TOKEN = "secret"
+
+    assert APIClient().get("/metrics").status_code == 401
+    assert APIClient().get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+
+def test_unsampled_requests_are_not_recorded(client, settings):
+    settings.PERF_SAMPLE_RATE = 0
+
+    res = client.get("/api/applications/")
+
+    assert "Server-Timing" not in res
+    assert "applications-list" not in request_metrics.render()
+
+
+def test_slow_requests_and_queries_are_logged(client, settings, caplog):
+    settings.PERF_SLOW_REQUEST_MS = 0
+    settings.PERF_SLOW_QUERY_MS = 0
+
+    with caplog.at_level(logging.WARNING, logger="applications.perf"):
+        client.get("/api/applications/?status=applied")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(m.startswith("Slow request") and "applications-list" in m for m in messages)
+    assert any(m.startswith("Slow query") and "applications_jobapplication" in m for m in messages)
+
+
+def test_async_requests_are_instrumented(user):
+    token = RefreshToken.for_user(user).access_token
+    res = async_to_sync(AsyncClient().get)(
+        "/api/applications/", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert res.status_code == 200
+    assert 'desc="0 queries"' not in res["Server-Timing"]
+    assert 'http_requests_total{view="applications-list",method="GET",status="200"} 1' in (
+        request_metrics.render()
+    )
@@ -0,0 +1,148 @@
+from datetime import date, datetime, timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from applications.models import ApplicationStatusAudit, DashboardSummary, JobApplication
+
+
+def test_save_records_status_change_without_refetch(user, make_application):
+    app = JobApplication.objects.get(pk=make_application(user).pk)
+    app.current_status = "interview"
+
+    with CaptureQueriesContext(connection) as ctx:
+        app.save()
+
+    refetches = [
+        q for q in ctx.captured_queries
+        if q["sql"].startswith("SELECT") and 'FROM "applications_jobapplication"' in q["sql"]
+    ]
+    assert refetches == []
+    audit = ApplicationStatusAudit.objects.get(application=app)
+    assert (audit.previous_status, audit.new_status) == ("applied", "interview")
+
+
+def test_save_without_status_change_writes_no_audit(user, make_application):
+    app = make_application(user)
+    app.location = "Remote"
+    app.save()
+    app.save()
+
+    assert not ApplicationStatusAudit.objects.exists()
+
+
+def test_consecutive_saves_audit_each_transition_once(user, make_application):
+    app = make_application(user)
+    app.current_status = "interview"
+    app.save()
+    app.save()
+    app.current_status = "offer"
+    app.save()
+
+    transitions = list(
+        ApplicationStatusAudit.objects.order_by("id").values_list("previous_status", "new_status")
+    )
+    assert transitions == [("applied", "interview"), ("interview", "offer")]
+
+
+def test_queryset_update_audits_changed_rows_in_one_insert(user, make_application):
+    make_application(user)
+    make_application(user)
+    make_application(user, current_status="rejected")
+
+    with CaptureQueriesContext(connection) as ctx:
+        rows = JobApplication.objects.filter(user=user).update(current_status="rejected")
+
+    inserts = [
+        q for q in ctx.captured_queries
+        if q["sql"].startswith('INSERT INTO "applications_applicationstatusaudit"')
+    ]
+    assert rows == 3
+    assert len(inserts) == 1
+    assert ApplicationStatusAudit.objects.filter(
+        previous_status="applied", new_status="rejected"
+    ).count() == 2
+
+
+def test_bulk_update_audits_changed_objects(user, make_application):
+    make_application(user)
+    make_application(user)
+    apps = list(JobApplication.objects.all())
+    apps[0].current_status = "offer"
+
+    JobApplication.objects.bulk_update(apps, ["current_status"])
+
+    audit = ApplicationStatusAudit.objects.get()
+    assert audit.application_id == apps[0].pk
+    assert (audit.previous_status, audit.new_status) == ("applied", "offer")
+
+
+def assert_summary_in_sync(user):
+    stored = DashboardSummary.objects.get(pk=user.pk)
+    assert stored.matches(DashboardSummary.compute(user.pk))
+    return stored
+
+
+def test_summary_tracks_create_update_and_delete(user, make_application):
+    app = make_application(user, applied_date=date(2026, 1, 10))
+    make_application(user, current_status="interview", applied_date=date(2026, 2, 1))
+    app.current_status = "rejected"
+    app.applied_date = date(2026, 2, 3)
+    app.save()
+    JobApplication.objects.filter(current_status="interview").update(current_status="offer")
+    make_application(user).delete()
+
+    summary = assert_summary_in_sync(user)
+    assert summary.status_counts == {"rejected": 1, "offer": 1}
+    assert summary.month_counts == {"2026-02": 2}
+
+
+def test_summary_queryset_delete(user, make_application):
+    make_application(user)
+    make_application(user, current_status="offer")
+
+    JobApplication.objects.filter(current_status="applied").delete()
+
+    assert assert_summary_in_sync(user).status_counts == {"offer": 1}
+
+
+def test_summary_stale_and_this_month_follow_the_calendar(user, make_application):
+    make_application(user, applied_date=date(2026, 3, 30))
+    summary = DashboardSummary.objects.get(pk=user.pk)
+
+    assert summary.stale_count(today=date(2026, 4, 1)) == 0
+    assert summary.stale_count(today=date(2026, 4, 2)) == 1
+    assert summary.this_month_count(today=date(2026, 3, 31)) == 1
+    assert summary.this_month_count(today=date(2026, 4, 1)) == 0
+
+
+def test_rebuild_command_repairs_drift(user, make_application):
+    make_application(user)
+    DashboardSummary.objects.filter(pk=user.pk).update(status_counts={"applied": 7})
+
+    with pytest.raises(CommandError, match="1 summaries out of date"):
+        call_command("rebuild_dashboard_summaries", "--check", stdout=StringIO(), stderr=StringIO())
+    call_command("rebuild_dashboard_summaries", stdout=StringIO())
+
+    assert assert_summary_in_sync(user).status_counts == {"applied": 1}
+
+
+def test_followup_due_follows_status_and_contact(user, make_application):
+    app = make_application(user, applied_date=date(2026, 1, 1))
+    assert app.followup_due == date(2026, 1, 4)
+
+    app.last_contacted_at = datetime(2026, 1, 10, 12, tzinfo=dt_timezone.utc)
+    app.save(update_fields=["last_contacted_at"])
+    app.refresh_from_db()
+    assert app.followup_due == date(2026, 1, 13)
+
+    JobApplication.objects.filter(pk=app.pk).update(current_status="rejected")
+    app.refresh_from_db()
+    assert app.followup_due is None
+
+    JobApplication.objects.filter(pk=app.pk).update(current_status="applied")
+    app.refresh_from_db()
+    assert app.followup_due == date(2026, 1, 13)
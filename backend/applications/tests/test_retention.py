@@ -0,0 +1,135 @@
+import gzip
+import io
+import json
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from applications.analytics import backfill
+from applications.models import (
+    ApplicationAuditSummary, ApplicationStatusAudit, DailyTransitionRollup, JobApplication,
+)
+from applications.retention import compact_audits, retention_cutoff
+
+
+def make_history(user, statuses, age_days):
+    """An application that went through ``statuses``, the first change ``age_days`` ago."""
+    app = JobApplication.objects.create(
+        user=user, company_name="Acme", position="Engineer", current_status="applied"
+    )
+    for status in statuses:
+        app.current_status = status
+        app.save()
+    # One day between consecutive changes, oldest first
+    for offset, audit in enumerate(app.audits.order_by("id")):
+        ApplicationStatusAudit.objects.filter(pk=audit.pk).update(
+            changed_at=timezone.now() - timedelta(days=age_days - offset)
+        )
+    JobApplication._base_manager.filter(pk=app.pk).update(
+        created_at=F("created_at") - timedelta(days=age_days + 1)
+    )
+    return app
+
+
+def rollups():
+    return sorted(DailyTransitionRollup.objects.values_list(
+        "day", "previous_status", "new_status", "count", "stage_days"
+    ))
+
+
+def test_compaction_folds_old_audits_into_summary(user):
+    app = make_history(user, ["phone_screen", "interview", "rejected", "applied"], age_days=800)
+    # The last change is recent and is kept
+    ApplicationStatusAudit.objects.filter(new_status="applied").update(changed_at=timezone.now())
+    archive = io.StringIO()
+
+    result = compact_audits(retention_cutoff(days=365), archive=archive)
+
+    assert (result.applications, result.audits) == (1, 3)
+    assert list(app.audits.values_list("new_status", flat=True)) == ["applied"]
+    summary = ApplicationAuditSummary.objects.get(application=app)
+    assert summary.count == 3
+    assert (summary.first_status, summary.last_status) == ("applied", "rejected")
+    assert summary.transitions == {
+        "applied>phone_screen": 1, "phone_screen>interview": 1, "interview>rejected": 1,
+    }
+    lines = [json.loads(line) for line in archive.getvalue().splitlines()]
+    assert [line["new_status"] for line in lines] == ["phone_screen", "interview", "rejected"]
+    assert {line["application_id"] for line in lines} == {app.pk}
+
+
+def test_compaction_can_be_rerun(user):
+    make_history(user, ["phone_screen", "interview"], age_days=800)
+    cutoff = retention_cutoff(days=365)
+    compact_audits(cutoff)
+
+    result = compact_audits(cutoff)
+
+    assert (result.applications, result.audits) == (0, 0)
+    assert ApplicationAuditSummary.objects.get().count == 2
+
+
+def test_backfill_keeps_rollups_of_compacted_days(user):
+    make_history(user, ["phone_screen", "interview", "offer"], age_days=800)
+    make_history(user, ["phone_screen", "rejected"], age_days=10)
+    backfill(user.pk)
+    before = rollups()
+
+    compact_audits(retention_cutoff(days=365))
+    backfill(user.pk)
+
+    assert rollups() == before
+
+
+def test_user_delete_is_set_based(user):
+    for age in (800, 10, 5):
+        make_history(user, ["phone_screen", "interview"], age_days=age)
+    compact_audits(retention_cutoff(days=365))
+
+    with CaptureQueriesContext(connection) as ctx:
+        user.delete()
+
+    assert not JobApplication.objects.exists()
+    assert not ApplicationStatusAudit.objects.exists()
+    assert not ApplicationAuditSummary.objects.exists()
+    # Nothing is loaded row by row: the cascade's own lookup finds no
+    # applications left
+    lookups = [
+        q["sql"] for q in ctx.captured_queries
+        if q["sql"].startswith('SELECT "applications_jobapplication"')
+    ]
+    assert len(lookups) == 1
+    assert len(ctx.captured_queries) < 15
+
+
+def test_compact_audits_command_archives_to_gzip(user, tmp_path):
+    make_history(user, ["phone_screen"], age_days=800)
+    path = tmp_path / "audits.ndjson.gz"
+    out = io.StringIO()
+
+    call_command("compact_audits", "--days=365", f"--archive={path}", stdout=out)
+
+    assert "Compacted 1 audits of 1 applications" in out.getvalue()
+    with gzip.open(path, "rt") as archive:
+        assert json.loads(archive.readline())["new_status"] == "phone_screen"
+    assert not ApplicationStatusAudit.objects.exists()
+
+
+def test_compaction_resends_applications_to_delta_sync(client, user, settings):
+    settings.SYNC_OVERLAP_SECONDS = 0
+    app = make_history(user, ["phone_screen", "interview"], age_days=800)
+    JobApplication._base_manager.filter(pk=app.pk).update(
+        updated_at=timezone.now() - timedelta(days=1)
+    )
+    first = client.get("/api/applications/changes/").data
+    assert len(first["applications"][0]["audits"]) == 2
+
+    compact_audits(retention_cutoff(days=365))
+
+    second = client.get("/api/applications/changes/", {"since": first["next"]}).data
+    assert [row["id"] for row in second["applications"]] == [app.pk]
+    assert second["applications"][0]["audits"] == []
@@ -0,0 +1,33 @@
+from applications.models import JobApplication, User
+from applications.routers import REPLICA, ReadReplicaRouter, read_alias, replica_reads
+
+
+def test_reads_stay_on_default_without_replica(db):
+    user = User.objects.create_user(username="alice", password="pw")
+
+    with replica_reads(user.pk):
+        assert read_alias(user.pk) == "default"
+
+
+def test_writer_is_pinned_to_primary(db, settings, django_capture_on_commit_callbacks):
+    settings.DATABASES = {**settings.DATABASES, REPLICA: settings.DATABASES["default"]}
+    user = User.objects.create_user(username="alice", password="pw")
+    other = User.objects.create_user(username="bob", password="pw")
+    assert read_alias(user.pk) == REPLICA
+
+    with django_capture_on_commit_callbacks(execute=True):
+        JobApplication.objects.create(user=user, company_name="Acme", position="Engineer")
+
+    assert read_alias(user.pk) == "default"
+    assert read_alias(other.pk) == REPLICA
+
+
+def test_router_sends_scoped_reads_to_replica(db, settings):
+    settings.DATABASES = {**settings.DATABASES, REPLICA: settings.DATABASES["default"]}
+    replica_router = ReadReplicaRouter()
+
+    assert replica_router.db_for_read(JobApplication) is None
+    with replica_reads():
+        assert replica_router.db_for_read(JobApplication) == REPLICA
+        assert replica_router.db_for_write(JobApplication) == "default"
+    assert not replica_router.allow_migrate(REPLICA, "applications")
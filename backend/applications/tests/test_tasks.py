@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from applications import tasks
+from applications.models import BackgroundTask, JobApplication, User
+from applications.reminders import send_followup_reminder, sweep_followups
+
+calls = []
+
+
+def record(value):
+    calls.append(value)
+
+
+def flaky(value):
+    calls.append(value)
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def make_due(user, count, days_ago=10):
+    for i in range(count):
+        JobApplication.objects.create(
+            user=user, company_name=f"Company {i}", position="Engineer", current_status="applied",
+            applied_date=timezone.localdate() - timedelta(days=days_ago),
+        )
+
+
+def test_enqueued_task_runs_once(db):
+    tasks.enqueue(record, value=1)
+
+    assert tasks.run_due() == 1
+    assert tasks.run_due() == 0
+    assert calls == [1]
+    assert BackgroundTask.objects.get().status == BackgroundTask.DONE
+
+
+def test_failures_are_retried_with_backoff_then_given_up(db, settings):
+    settings.TASK_RETRY_DELAY = 60
+    tasks.enqueue(flaky, value=1, max_attempts=2)
+
+    tasks.run_due()
+    task = BackgroundTask.objects.get()
+    assert task.status == BackgroundTask.QUEUED
+    assert task.run_at > timezone.now() + timedelta(seconds=50)
+    assert "boom" in task.last_error
+
+    BackgroundTask.objects.update(run_at=timezone.now())
+    tasks.run_due()
+    task.refresh_from_db()
+    assert (task.status, task.attempts) == (BackgroundTask.FAILED, 2)
+    assert calls == [1, 1]
+
+
+def test_expired_lease_is_taken_over(db):
+    tasks.enqueue(record, value=1)
+    claimed = tasks.claim(10, lease=300)
+
+    assert tasks.claim(10) == []
+    BackgroundTask.objects.filter(pk=claimed[0].pk).update(run_at=timezone.now())
+    assert [task.pk for task in tasks.claim(10)] == [claimed[0].pk]
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_task(db):
+    tasks.enqueue(record, value=1, max_attempts=2)
+    for _ in range(2):
+        [task] = tasks.claim(10)
+        BackgroundTask.objects.filter(pk=task.pk).update(run_at=timezone.now())
+
+    assert tasks.claim(10) == []
+    task.refresh_from_db()
+    assert (task.status, task.attempts) == (BackgroundTask.FAILED, 2)
+    assert task.finished_at is not None
+    assert "Lease expired" in task.last_error
+
+
+def test_periodic_tasks_are_queued_once_per_period(db, settings):
+    settings.TASK_SCHEDULE = {"applications.reminders.sweep_followups": 3600}
+    now = timezone.now()
+
+    tasks.schedule_periodic(now)
+    tasks.schedule_periodic(now)
+
+    assert BackgroundTask.objects.count() == 1
+
+
+def test_sweep_queues_one_reminder_per_due_user(user, django_assert_max_num_queries):
+    other = User.objects.create_user(username="bob", email="bob@example.com")
+    make_due(user, 3)
+    make_due(other, 2, days_ago=1)  # not due yet
+
+    with django_assert_max_num_queries(2):
+        assert sweep_followups() == 1
+    sweep_followups()
+
+    reminders = BackgroundTask.objects.filter(name__endswith="send_followup_reminder")
+    assert [task.payload["user_id"] for task in reminders] == [user.pk]
+
+
+def test_worker_sends_the_reminder(user):
+    make_due(user, 2)
+    sweep_followups()
+
+    while tasks.run_due():
+        pass
+
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["alice@example.com"]
+    assert mail.outbox[0].subject == "2 job applications to follow up on"
+
+
+def test_reminder_skips_applications_followed_up_since(user):
+    make_due(user, 1)
+    app = JobApplication.objects.get()
+    app.last_contacted_at = timezone.now()
+    app.save()
+
+    send_followup_reminder(user.pk, timezone.localdate().isoformat())
+
+    assert mail.outbox == []
+
+
+def test_worker_schedules_periodic_tasks_once_per_period(db, settings, monkeypatch):
+    settings.TASK_SCHEDULE = {"applications.reminders.sweep_followups": 3600}
+    scheduled = []
+    schedule_periodic = tasks.schedule_periodic
+
+    def counting_schedule():
+        scheduled.append(1)
+        return schedule_periodic()
+
+    monkeypatch.setattr(tasks, "schedule_periodic", counting_schedule)
+    tasks.enqueue(record, value=1)
+    tasks.enqueue(record, value=2)
+
+    assert tasks.work(limit=1, once=True) == 3
+
+    assert len(scheduled) == 1
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+
+from applications.caching import AsyncSingleFlight, SingleFlight, cache_stats, cached_response
+from applications.models import User
+from applications.throttling import _take
+
+
+@pytest.fixture
+def buckets(settings):
+    settings.THROTTLE_BUCKETS = {"dashboard": (3, 0.01), "login": (2, 0.01)}
+
+
+def test_bucket_bursts_then_refills():
+    state, wait = _take(None, 2, 0.5, now=100.0)
+    assert wait == 0
+    state, wait = _take(state, 2, 0.5, now=100.0)
+    assert wait == 0
+
+    assert _take(state, 2, 0.5, now=100.0) == (None, 2.0)
+    assert _take(state, 2, 0.5, now=101.0) == (None, 1.0)
+    assert _take(state, 2, 0.5, now=102.0) == ((0, 102.0), 0)
+
+
+def test_anonymous_dashboard_flood_is_refused_before_the_database(
+    db, buckets, django_assert_num_queries
+):
+    client = APIClient()
+    for _ in range(3):
+        assert client.get("/api/dashboard/").status_code == 200
+
+    with django_assert_num_queries(0):
+        res = client.get("/api/dashboard/")
+    assert res.status_code == 429
+    assert int(res["Retry-After"]) > 0
+    # Other clients have their own buckets
+    assert client.get("/api/dashboard/", REMOTE_ADDR="10.0.0.2").status_code == 200
+    client.force_authenticate(User.objects.create_user(username="alice"))
+    assert client.get("/api/dashboard/").status_code == 200
+
+
+def test_forged_forwarded_for_does_not_get_a_new_bucket(db, buckets):
+    client = APIClient()
+    for i in range(3):
+        res = client.get("/api/dashboard/", HTTP_X_FORWARDED_FOR=f"203.0.113.{i}")
+        assert res.status_code == 200
+
+    assert client.get("/api/dashboard/", HTTP_X_FORWARDED_FOR="203.0.113.9").status_code == 429
+    res = async_to_sync(AsyncClient().get)(
+        "/api/dashboard/", headers={"X-Forwarded-For": "203.0.113.9"}
+    )
+    assert res.status_code == 429
+
+
+def test_forwarded_for_is_read_behind_trusted_proxies(db, buckets, settings):
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+    client = APIClient()
+    for _ in range(3):
+        assert client.get("/api/dashboard/", HTTP_X_FORWARDED_FOR="203.0.113.1").status_code == 200
+
+    assert client.get("/api/dashboard/", HTTP_X_FORWARDED_FOR="203.0.113.1").status_code == 429
+    assert client.get("/api/dashboard/", HTTP_X_FORWARDED_FOR="203.0.113.2").status_code == 200
+
+
+def test_anonymous_dashboard_looks_up_the_dev_user_once(db, django_assert_num_queries):
+    client = APIClient()
+    assert client.get("/api/dashboard/").status_code == 200
+
+    with django_assert_num_queries(0):
+        assert client.get("/api/dashboard/").status_code == 200
+
+
+def test_google_login_is_throttled(db, buckets):
+    client = APIClient()
+    for _ in range(2):
+        assert client.post("/api/social/google/", {}, format="json").status_code == 400
+
+    assert client.post("/api/social/google/", {}, format="json").status_code == 429
+
+
+def test_async_views_are_throttled(db, buckets):
+    client = AsyncClient()
+    for _ in range(3):
+        assert async_to_sync(client.get)("/api/dashboard/").status_code == 200
+
+    res = async_to_sync(client.get)("/api/dashboard/")
+    assert res.status_code == 429
+    assert int(res["Retry-After"]) > 0
+
+
+def in_threads(func, count):
+    threads = [threading.Thread(target=func) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_single_flight_shares_one_call():
+    flights, calls, results = SingleFlight(), [], []
+    started, release = threading.Event(), threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    def call():
+        results.append(flights.do("key", compute))
+
+    threads = in_threads(call, 1)
+    started.wait(5)
+    threads += in_threads(call, 4)
+    time.sleep(0.1)  # let the others queue up behind the first call
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("result", False)] + [("result", True)] * 4
+    assert flights.calls == {}
+
+
+def test_single_flight_shares_exceptions():
+    flights, started, release = SingleFlight(), threading.Event(), threading.Event()
+    errors = []
+
+    def compute():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    def call():
+        try:
+            flights.do("key", compute)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = in_threads(call, 1)
+    started.wait(5)
+    threads += in_threads(call, 2)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["boom"] * 3
+
+
+def test_async_single_flight_shares_one_call():
+    flights, calls = AsyncSingleFlight(), []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def burst():
+        return await asyncio.gather(*(flights.do("key", compute) for _ in range(5)))
+
+    results = asyncio.run(burst())
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {result for result, _ in results} == {"result"}
+
+
+def test_concurrent_cache_misses_compute_once():
+    factory = APIRequestFactory()
+    calls, responses = [], []
+    started, release = threading.Event(), threading.Event()
+    before = cache_stats()["coalesced"]
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return Response({"status_counts": []})
+
+    def get():
+        request = Request(factory.get("/api/dashboard/"))
+        responses.append(cached_response(request, 1, "dashboard", compute))
+
+    threads = in_threads(get, 1)
+    started.wait(5)
+    threads += in_threads(get, 3)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert [response.data for response in responses] == [{"status_counts": []}] * 4
+    assert len({response["ETag"] for response in responses}) == 1
+    assert cache_stats()["coalesced"] - before == 3
@@ -0,0 +1,126 @@
+"""
+Token-bucket rate limiting, with the buckets kept in the cache.
+
+Each scope in THROTTLE_BUCKETS is a ``(capacity, rate)`` pair. Every
+client gets its own bucket per scope, keyed by user id or, for anonymous
+requests, by client IP. The IP is ``REMOTE_ADDR`` unless DRF's
+``NUM_PROXIES`` says how many trusted proxies sit in front of the app;
+only then is X-Forwarded-For read, since clients can set it to anything. A
+bucket holds up to ``capacity`` tokens and refills at ``rate`` tokens per
+second. Each request takes one token, so a client can burst ``capacity``
+requests and then sustain ``rate`` per second. Once the bucket is empty
+the request is refused with a 429 and a Retry-After, before the view
+touches the database.
+
+A bucket is a single cache entry, read and written back without a lock.
+Requests that race on one bucket may therefore let a few extra through,
+at most one per concurrent worker. With a shared cache such as Redis the
+limits hold across processes.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import Throttled
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+def get_cache():
+    return caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+
+
+def _take(state, capacity, rate, now):
+    """
+    Take a token from a bucket in ``state`` (None for a full one). Returns
+    the state to store and the seconds to wait, which is 0 if a token was
+    taken.
+    """
+    tokens, stamp = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - stamp) * rate)
+    if tokens < 1:
+        return None, (1 - tokens) / rate
+    return (tokens - 1, now), 0
+
+
+def _timeout(capacity, rate):
+    # An untouched bucket is full again after this long, so it may expire
+    return math.ceil(capacity / rate) + 1
+
+
+def take(key, capacity, rate):
+    """Take a token from the bucket at ``key``; returns the seconds to wait (0 if allowed)."""
+    cache = get_cache()
+    state, wait = _take(cache.get(key), capacity, rate, time.time())
+    if state is not None:
+        cache.set(key, state, timeout=_timeout(capacity, rate))
+    return wait
+
+
+async def atake(key, capacity, rate):
+    cache = get_cache()
+    state, wait = _take(await cache.aget(key), capacity, rate, time.time())
+    if state is not None:
+        await cache.aset(key, state, timeout=_timeout(capacity, rate))
+    return wait
+
+
+def client_ident(request):
+    """The client IP for ``request``, from X-Forwarded-For only behind trusted proxies."""
+    if api_settings.NUM_PROXIES is None:
+        return request.META.get("REMOTE_ADDR")
+    # BaseThrottle.get_ident only reads META, which Django requests have too
+    return BaseThrottle().get_ident(request)
+
+
+def bucket_key(scope, user, ident):
+    if user is not None and user.is_authenticated:
+        return f"throttle:{scope}:user:{user.pk}"
+    return f"throttle:{scope}:ip:{ident}"
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle for the bucket named by ``scope``, or by the view's
+    ``throttle_scope``. Scopes missing from THROTTLE_BUCKETS are not limited.
+    """
+
+    scope = None
+
+    def bucket(self, request, view):
+        scope = self.scope or getattr(view, "throttle_scope", None)
+        limits = settings.THROTTLE_BUCKETS.get(scope)
+        if limits is None:
+            return None, None
+        return bucket_key(scope, request.user, client_ident(request)), limits
+
+    def allow_request(self, request, view):
+        key, limits = self.bucket(request, view)
+        self.delay = take(key, *limits) if key else 0
+        return not self.delay
+
+    def wait(self):
+        return self.delay
+
+
+class DashboardThrottle(TokenBucketThrottle):
+    scope = "dashboard"
+
+
+class LoginThrottle(TokenBucketThrottle):
+    scope = "login"
+
+
+async def athrottle(request, scope, user=None):
+    """
+    Throttle a plain Django async view: raises ``Throttled`` when the
+    client's bucket for ``scope`` is empty.
+    """
+    limits = settings.THROTTLE_BUCKETS.get(scope)
+    if limits is None:
+        return
+    key = bucket_key(scope, user, client_ident(request))
+    wait = await atake(key, *limits)
+    if wait:
+        raise Throttled(wait=wait)
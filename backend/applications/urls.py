@@ -1,6 +1,8 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import JobApplicationViewSet, dashboard_stats, GoogleLoginAPIView
+from .views import (
+    JobApplicationViewSet, dashboard_stats, GoogleLoginAPIView, cache_stats_view, analytics_view,
+)
 
 
 router = DefaultRouter()
@@ -9,6 +11,8 @@ router.register("applications", JobApplicationViewSet, basename="applications")
 urlpatterns = [
     path("", include(router.urls)),
     path("dashboard/", dashboard_stats),
+    path("cache/stats/", cache_stats_view, name="cache-stats"),
+    path("analytics/<slug:report>/", analytics_view, name="analytics"),
     path("social/google/", GoogleLoginAPIView.as_view(), name="google-login"),
 ]
 
@@ -1,25 +1,103 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-from django.db.models import Count
-from .models import JobApplication, User
-from .serializers import JobApplicationSerializer
-from .permissions import IsOwnerOrAdmin
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from django.db.models import F, Prefetch
+from .models import ApplicationStatusAudit, DashboardSummary, JobApplication, User
+from .serializers import (
+    JobApplicationSerializer, LeanApplicationSerializer, BulkSelectionSerializer,
+    BulkStatusSerializer,
+)
+from .permissions import IsOwnerOrAdmin, IsAdminRole
+from .caching import cached_response, cached_shared_response, cache_stats
+from .importers import detect_format, import_applications, iter_rows
+from .exporters import FORMATS as EXPORT_FORMATS, iter_export
+from .search import search_applications
+from .google_auth import CertificateFetchError, verify_id_token
+from .routers import read_alias, replica_reads
+from .auth import AppRefreshToken
+from .throttling import DashboardThrottle, LoginThrottle
+from .metrics import request_metrics
+from . import analytics, sync
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from datetime import timedelta, date
-from .pagination import JobPagination
+from datetime import date, timedelta
+from .pagination import JobPagination, JobKeysetPagination
+from .renderers import FastJSONRenderer
+from rest_framework.renderers import JSONRenderer
 from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django.db import transaction
 
 User = get_user_model()
 
+
+def month_bounds(year, month):
+    """Return the [start, end) dates covering the given calendar month."""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def filter_applications(queryset, params, ranked=True):
+    """
+    Apply the list endpoint's ?q=, ?status=, ?time= and ?month=/?year= filters.
+
+    ``ranked=False`` skips the search relevance annotation, for selections
+    that are ordered otherwise or updated/deleted in bulk.
+    """
+    query = params.get("q")
+    if query:
+        queryset = search_applications(queryset, query, ranked=ranked)
+
+    # Filter by Status Category
+    status_filter = params.get('status')
+    if status_filter == 'needs_followup':
+        # Same rule as the serializer's needs_followup flag (followup_due)
+        queryset = queryset.filter(followup_due__lte=timezone.localdate())
+    elif status_filter == 'interview':
+        queryset = queryset.filter(current_status__in=['phone_screen', 'on_site', 'remote'])
+    elif status_filter and status_filter != 'all':
+        queryset = queryset.filter(current_status=status_filter)
+
+    # Filter by Time (This Month)
+    time_filter = params.get('time')
+    month = params.get("month")
+    year = params.get("year")
+    # Half-open date ranges rather than __month/__year lookups, which
+    # wrap the column in a function and can't use the indexes.
+    if time_filter == 'this_month':
+        today = timezone.localdate()
+        start, end = month_bounds(today.year, today.month)
+        queryset = queryset.filter(applied_date__gte=start, applied_date__lt=end)
+    if month and year:
+        try:
+            start, end = month_bounds(int(year), int(month))
+        except ValueError:
+            raise ValidationError({"month": "Expected a numeric month (1-12) and year."})
+        queryset = queryset.filter(applied_date__gte=start, applied_date__lt=end)
+    return queryset
+
+
+def all_users_scope(request):
+    """
+    Whether the request asks for every user's data with ``?scope=all``,
+    which only admins may.
+    """
+    if request.query_params.get("scope") != "all":
+        return False
+    if getattr(request.user, "role", None) != "admin":
+        raise PermissionDenied("scope=all is only available to admins.")
+    return True
+
+
 class GoogleLoginAPIView(APIView):
     permission_classes = []  # allow anyone
+    throttle_classes = [LoginThrottle]
     
     def post(self, request):
         token = request.data.get("access_token")
@@ -27,10 +105,9 @@ class GoogleLoginAPIView(APIView):
             return Response({"error": "Missing access_token"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            # Verify Google ID token
-            idinfo = id_token.verify_oauth2_token(
+            # Verify Google ID token (certificates and results are cached)
+            idinfo = verify_id_token(
                 token,
-                google_requests.Request(),
                 settings.GOOGLE_CLIENT_ID,  # must match frontend client_id
             )
             email = idinfo["email"]
@@ -48,50 +125,239 @@ class GoogleLoginAPIView(APIView):
             )
 
             # Issue JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = AppRefreshToken.for_user(user)
             return Response({
                 "access": str(refresh.access_token),
                 "refresh": str(refresh),
             })
         except ValueError as e:
             return Response({"error": "Invalid token", "details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CertificateFetchError:
+            return Response({"error": "Could not reach Google"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
 class JobApplicationViewSet(viewsets.ModelViewSet):
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
     pagination_class = JobPagination
     
+    @property
+    def paginator(self):
+        # ?pagination=cursor switches to keyset paging (no COUNT, no OFFSET).
+        # It is the default for ?scope=all, where a COUNT(*) over every
+        # user's applications is what would time out. Searches (?q=) are
+        # ordered by relevance, which the date keyset can't page through,
+        # so they always use page numbers.
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            default = "cursor" if params.get("scope") == "all" else "page"
+            keyset = params.get("pagination", default) == "cursor" or "cursor" in params
+            if keyset and not params.get("q"):
+                self._paginator = JobKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def _query_list(self, param):
+        value = self.request.query_params.get(param, "")
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    def _wants_audits(self):
+        # List pages load audits through the lean serializer and writes
+        # re-serialize after invalidating prefetches, so only retrieve
+        # benefits from prefetching the audit history.
+        if self.action != "retrieve":
+            return False
+        fields = self._query_list("fields")
+        return not fields or "audits" in fields
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ("list", "retrieve"):
+            kwargs.setdefault("fields", self._query_list("fields"))
+        if self.action == "list":
+            kwargs.setdefault("include", self._query_list("include"))
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
-        
-        queryset = JobApplication.objects.filter(user=self.request.user)
-
-        # Filter by Status Category
-        status_filter = self.request.query_params.get('status')
-        if status_filter == 'needs_followup':
-            # Applied > 1 day ago and still in 'applied' status
-            three_days_ago = timezone.now().date() - timedelta(days=3)
-            queryset = queryset.filter(current_status='applied', applied_date__lte=three_days_ago)
-        elif status_filter == 'interview':
-            queryset = queryset.filter(current_status__in=['phone_screen', 'on_site', 'remote'])
-        elif status_filter and status_filter != 'all':
-            queryset = queryset.filter(current_status=status_filter)
-
-        # Filter by Time (This Month)
-        time_filter = self.request.query_params.get('time')
-        month = self.request.query_params.get("month")
-        year = self.request.query_params.get("year")
-        if time_filter == 'this_month':
-            today = timezone.now()
-            queryset = queryset.filter(applied_date__month=today.month, applied_date__year=today.year)
-        if month and year:
-            queryset = queryset.filter(
-                applied_date__month=month,
-                applied_date__year=year
-            )
-        return queryset.order_by('-applied_date')
+        if all_users_scope(self.request):
+            # Admins see every user's applications, or one user's with ?user=
+            queryset = JobApplication.objects.all()
+            user_id = self.request.query_params.get("user")
+            if user_id:
+                try:
+                    queryset = queryset.filter(user_id=int(user_id))
+                except ValueError:
+                    raise ValidationError({"user": "Expected a numeric user id."})
+        else:
+            queryset = JobApplication.objects.filter(user_id=self.request.user.pk)
+        if self._wants_audits():
+            # Oldest first, the order list pages and exports use
+            queryset = queryset.prefetch_related(Prefetch(
+                "audits", queryset=ApplicationStatusAudit.objects.order_by("changed_at", "id")
+            ))
+
+        queryset = filter_applications(queryset, self.request.query_params)
+        # Explicit NULL placement and an id tie-breaker keep page boundaries
+        # stable across databases.
+        ordering = [F('applied_date').desc(nulls_last=True), '-id']
+        if "search_rank" in queryset.query.annotations:
+            ordering.insert(0, F("search_rank").desc())
+        return queryset.order_by(*ordering)
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if getattr(self, "action", None) in ("list", "changes"):
+            # List pages and sync deltas are large and hold no floats, so
+            # orjson's output is byte-for-byte what JSONRenderer would write.
+            renderers = [
+                FastJSONRenderer() if type(renderer) is JSONRenderer else renderer
+                for renderer in renderers
+            ]
+        return renderers
+
+    def get_lean_serializer(self):
+        return LeanApplicationSerializer(
+            fields=self._query_list("fields"), include=self._query_list("include")
+        )
+
+    def list(self, request, *args, **kwargs):
+        def compute():
+            with replica_reads(request.user.pk):
+                # Plain rows, serialized by the lean fast path; the output
+                # matches get_serializer(page, many=True).data.
+                lean = self.get_lean_serializer()
+                rows = self.filter_queryset(self.get_queryset()).values(*lean.columns)
+                page = self.paginate_queryset(rows)
+                return self.get_paginated_response(lean.serialize(page, using=rows.db))
+
+        if all_users_scope(request):
+            # Other users' writes don't invalidate the per-user cache
+            return compute()
+        return cached_response(request, request.user.pk, "applications", compute)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """Delta sync: what changed since the ``since`` token (see sync.py)."""
+        try:
+            page_size = min(
+                int(request.query_params.get("page_size", sync.DEFAULT_PAGE_SIZE)),
+                sync.MAX_PAGE_SIZE,
+            )
+        except ValueError:
+            raise ValidationError({"page_size": "Must be an integer."})
+        if page_size < 1:
+            raise ValidationError({"page_size": "Must be positive."})
+
+        lean = LeanApplicationSerializer(include=["audits"])
+        with replica_reads(request.user.pk):
+            try:
+                rows, deleted, token, has_more = sync.changes(
+                    request.user, lean.columns, request.query_params.get("since"), page_size
+                )
+            except sync.ExpiredToken as e:
+                return Response({"detail": str(e)}, status=status.HTTP_410_GONE)
+            except sync.InvalidToken as e:
+                raise ValidationError({"since": str(e)})
+            applications = lean.serialize(rows)
+        return Response({
+            "applications": applications,
+            "deleted": deleted,
+            "next": token,
+            "has_more": has_more,
+        })
+
+    @action(detail=False, methods=["post"], url_path="bulk", parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Missing file"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fmt = detect_format(upload.name, request.data.get("format"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_applications(request.user, iter_rows(upload.file, fmt))
+        return Response(report.as_dict())
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        # Not ?format=, which DRF reserves for renderer selection
+        fmt = request.query_params.get("export_format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"export_format must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if all_users_scope(request):
+            queryset = filter_applications(
+                JobApplication.objects.order_by("user_id", "id"), request.query_params,
+                ranked=False,
+            )
+        else:
+            queryset = self.get_queryset()
+
+        # Rows are read while the response streams, after this view returns,
+        # so the replica is chosen on the queryset itself.
+        queryset = queryset.using(read_alias(request.user.pk))
+        response = StreamingHttpResponse(
+            iter_export(queryset, fmt), content_type=EXPORT_FORMATS[fmt]
+        )
+        response["Content-Disposition"] = f'attachment; filename="applications.{fmt}"'
+        return response
+
+    def _bulk_selection(self, serializer):
+        """Resolve a validated bulk selection to (queryset, requested ids)."""
+        data = serializer.validated_data
+        if "filter" in data:
+            queryset = filter_applications(
+                JobApplication.objects.filter(user_id=self.request.user.pk), data["filter"],
+                ranked=False,
+            )
+            return queryset, None
+
+        # Ownership is enforced by the query itself rather than per object
+        queryset = JobApplication.objects.filter(pk__in=data["ids"])
+        if self.request.user.role != "admin":
+            queryset = queryset.filter(user_id=self.request.user.pk)
+        return queryset, data["ids"]
+
+    @action(detail=False, methods=["post"])
+    def bulk_update_status(self, request):
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data["current_status"]
+        queryset, requested = self._bulk_selection(serializer)
+
+        with transaction.atomic():
+            current = dict(queryset.select_for_update().values_list("pk", "current_status"))
+            changed = [pk for pk, old in current.items() if old != new_status]
+            # One UPDATE; the queryset records all the audits in one insert
+            queryset.exclude(current_status=new_status).update(current_status=new_status)
+
+        results = [
+            {"id": pk, "result": "updated" if pk in changed else "unchanged"}
+            for pk in current
+        ]
+        results += [{"id": pk, "result": "not_found"} for pk in requested or () if pk not in current]
+        return Response({"updated": len(changed), "results": results})
+
+    @action(detail=False, methods=["post"])
+    def bulk_destroy(self, request):
+        serializer = BulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset, requested = self._bulk_selection(serializer)
+
+        with transaction.atomic():
+            found = list(queryset.select_for_update().values_list("pk", flat=True))
+            queryset.delete()
+
+        results = [{"id": pk, "result": "deleted"} for pk in found]
+        found = set(found)
+        results += [{"id": pk, "result": "not_found"} for pk in requested or () if pk not in found]
+        return Response({"deleted": len(found), "results": results})
 
     @action(detail=True, methods=["post"])
     def mark_followup_sent(self, request, pk=None):
@@ -100,23 +366,105 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         application.save()
         return Response({"status": "follow-up recorded"})
 
+# Anonymous dashboard requests are served as this user (for development);
+# it is looked up once per process rather than on every request.
+_dev_user = None
+
+
+def get_dev_user():
+    global _dev_user
+    if _dev_user is None:
+        _dev_user, _ = User.objects.get_or_create(username="dev_user")
+    return _dev_user
+
+
+async def aget_dev_user():
+    global _dev_user
+    if _dev_user is None:
+        _dev_user, _ = await User.objects.aget_or_create(username="dev_user")
+    return _dev_user
+
+
+def reset_dev_user():
+    """Forget the memoized dev user, e.g. once the database has been reset."""
+    global _dev_user
+    _dev_user = None
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@throttle_classes([DashboardThrottle])
 def dashboard_stats(request):
     user = request.user
     if not user.is_authenticated:
-        user, _ = User.objects.get_or_create(username="dev_user")
-        
-    qs = JobApplication.objects.filter(user=user)
+        user = get_dev_user()
+
+    def compute():
+        with replica_reads(user.pk):
+            summary = DashboardSummary.for_user(user)
+        return Response({
+            "status_counts": summary.status_count_list(),
+            "stale_applications": summary.stale_count(),
+            "this_month": summary.this_month_count(),
+        })
+
+    return cached_response(request, user.pk, "dashboard", compute)
+
 
-    status_counts = qs.values("current_status").annotate(count=Count("id"))
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def cache_stats_view(request):
+    return Response(cache_stats())
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for this process's counters only (see
+    ``applications.metrics``); set METRICS_TOKEN to require a bearer token.
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    return HttpResponse(
+        request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def _analytics_range(request):
+    today = timezone.localdate()
+    try:
+        until = date.fromisoformat(request.query_params.get("until", today.isoformat()))
+        since = date.fromisoformat(
+            request.query_params.get("since", (until - timedelta(days=365)).isoformat())
+        )
+    except ValueError:
+        raise ValidationError({"since": "Expected ISO dates (YYYY-MM-DD) for since/until."})
+    if since > until:
+        raise ValidationError({"since": "since must not be after until."})
+    return since, until
+
+
+@api_view(["GET"])
+def analytics_view(request, report):
+    reports = {
+        "weekly": analytics.weekly_applications,
+        "conversions": analytics.conversions,
+        "time-in-stage": analytics.time_in_stage,
+    }
+    if report not in reports:
+        return Response({"error": "Unknown report"}, status=status.HTTP_404_NOT_FOUND)
+    since, until = _analytics_range(request)
 
-    stale_count = qs.filter(
-        current_status="applied",
-        applied_date__lte=date.today() - timedelta(days=3)
-    ).count()
+    def compute(user):
+        return Response({
+            "since": since,
+            "until": until,
+            "results": reports[report](user, since, until),
+        })
 
-    return Response({
-        "status_counts": status_counts,
-        "stale_applications": stale_count, 
-    })
+    if all_users_scope(request):
+        # Summed over every user's rollups (user=None)
+        return cached_shared_response(request, "analytics", lambda: compute(None))
+    return cached_response(request, request.user.pk, "analytics", lambda: compute(request.user))
@@ -0,0 +1,12 @@
+"""URLconf used for requests served by the ASGI handler (see ``ASGI_URLCONF``)."""
+from django.contrib import admin
+from django.urls import path, include
+
+from applications.views import metrics_view
+
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
+    path("api/", include("applications.async_urls")),
+]
@@ -42,6 +42,7 @@ SITE_ID = 1
 # -------------------------------------------------------------------
 
 MIDDLEWARE = [
+    "applications.middleware.performance_middleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -50,8 +51,30 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "applications.middleware.asgi_urlconf_middleware",
 ]
 
+# Request instrumentation (performance_middleware): the share of requests
+# timed and recorded for /metrics, and thresholds for the slow request and
+# slow query logs. PERF_SAMPLE_RATE=0 leaves it effectively free.
+PERF_SAMPLE_RATE = float(os.getenv("PERF_SAMPLE_RATE", "1.0"))
+PERF_SLOW_REQUEST_MS = int(os.getenv("PERF_SLOW_REQUEST_MS", "500"))
+PERF_SLOW_QUERY_MS = int(os.getenv("PERF_SLOW_QUERY_MS", "100"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "applications.perf": {"handlers": ["console"], "level": "WARNING"},
+    },
+}
+
+# Requests served under ASGI (uvicorn/daphne) use async views for the
+# read-heavy endpoints; WSGI keeps ROOT_URLCONF.
+ASGI_URLCONF = "job_tracker.asgi_urls"
+
 # ---------------------------
 # Google OAuth (frontend ID)
 # ---------------------------
@@ -97,13 +120,166 @@ WSGI_APPLICATION = "job_tracker.wsgi.application"
 # DATABASE
 # -------------------------------------------------------------------
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# SQLite unless DB_ENGINE=postgresql. PostgreSQL settings come from the
+# environment (POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST,
+# POSTGRES_PORT); never commit credentials here.
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+
+def env_flag(name, default="0"):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+if DB_ENGINE == "postgresql":
+    def postgres_database(host, port):
+        database = {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("POSTGRES_DB", "job_tracker"),
+            "USER": os.getenv("POSTGRES_USER", ""),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+            "HOST": host,
+            "PORT": port,
+            # Reuse connections across requests; verify them before reuse
+            # so a restarted server or dropped connection isn't an error.
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+            },
+        }
+        if env_flag("DB_POOL"):
+            # psycopg's in-process pool replaces persistent connections
+            database["CONN_MAX_AGE"] = 0
+            database["OPTIONS"]["pool"] = {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+            }
+        if env_flag("DB_PGBOUNCER"):
+            # Transaction pooling can't keep a server-side cursor or a
+            # prepared statement on one backend between queries.
+            database["DISABLE_SERVER_SIDE_CURSORS"] = True
+            database["OPTIONS"]["prepare_threshold"] = None
+        return database
+
+    DATABASES = {
+        "default": postgres_database(
+            os.getenv("POSTGRES_HOST", "localhost"), os.getenv("POSTGRES_PORT", "5432")
+        ),
     }
+
+    # Optional streaming replica for the list, dashboard and export reads
+    # (see applications/routers.py). Same database name and credentials.
+    POSTGRES_REPLICA_HOST = os.getenv("POSTGRES_REPLICA_HOST")
+    if POSTGRES_REPLICA_HOST:
+        DATABASES["replica"] = postgres_database(
+            POSTGRES_REPLICA_HOST, os.getenv("POSTGRES_REPLICA_PORT", "5432")
+        )
+        DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+        DATABASE_ROUTERS = ["applications.routers.ReadReplicaRouter"]
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # WAL lets readers run alongside the writer; IMMEDIATE takes
+                # the write lock at BEGIN so concurrent transactions queue on
+                # the busy timeout instead of failing with "database is locked".
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA temp_store=MEMORY;"
+                    "PRAGMA cache_size=-20000;"
+                    "PRAGMA mmap_size=134217728"
+                ),
+                "transaction_mode": "IMMEDIATE",
+                "timeout": int(os.getenv("SQLITE_TIMEOUT", "20")),
+            },
+        }
+    }
+
+# How long (seconds) a user's reads stay on the primary after they write
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
+# -------------------------------------------------------------------
+# BACKGROUND TASKS
+# -------------------------------------------------------------------
+
+# Tasks are queued in the database and run by `manage.py run_worker` (see
+# applications/tasks.py). ImmediateBackend runs them in-process instead.
+TASK_BACKEND = os.getenv("TASK_BACKEND", "applications.tasks.DatabaseBackend")
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "5"))
+# Seconds before the first retry; doubles with every further failure
+TASK_RETRY_DELAY = int(os.getenv("TASK_RETRY_DELAY", "60"))
+# How long a worker may hold a task before another worker takes it over
+TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS", "300"))
+# Task function -> interval (seconds) it is queued at
+TASK_SCHEDULE = {
+    "applications.reminders.sweep_followups": int(os.getenv("FOLLOWUP_SWEEP_INTERVAL", "3600")),
+    "applications.tasks.prune_tasks": 86400,
+    "applications.sync.prune_tombstones": 86400,
 }
 
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "Job Tracker <noreply@localhost>")
+
+# Delta sync (/api/applications/changes/): how far back each sync re-reads
+# to catch writes that committed late, and how long deletions are kept for
+# clients to pick up (older sync tokens get a 410).
+SYNC_OVERLAP_SECONDS = int(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+
+# Status audits older than this many days are folded into per-application
+# summaries by `manage.py compact_audits` (see applications/retention.py)
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "730"))
+
+# -------------------------------------------------------------------
+# CACHE
+# -------------------------------------------------------------------
+
+# Local memory by default (per process). Set REDIS_URL to share the cache,
+# and its invalidation, between worker processes.
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "job-tracker",
+            "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "5000"))},
+        }
+    }
+
+# Cache alias and lifetime (seconds) for cached API responses
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", "300"))
+
+# -------------------------------------------------------------------
+# THROTTLING
+# -------------------------------------------------------------------
+
+# Token buckets per throttle scope as (capacity, refill per second): each
+# user, or IP when anonymous, may burst `capacity` requests, then `rate`/s
+THROTTLE_BUCKETS = {
+    "dashboard": (
+        int(os.getenv("THROTTLE_DASHBOARD_BURST", "20")),
+        float(os.getenv("THROTTLE_DASHBOARD_RATE", "2")),
+    ),
+    "login": (
+        int(os.getenv("THROTTLE_LOGIN_BURST", "10")),
+        float(os.getenv("THROTTLE_LOGIN_RATE", "0.2")),
+    ),
+}
+THROTTLE_CACHE_ALIAS = "default"
+
 # -------------------------------------------------------------------
 # PASSWORD VALIDATION
 # -------------------------------------------------------------------
@@ -123,8 +299,13 @@ REST_FRAMEWORK = {
     # "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Builds request.user from the token's claims (see applications/auth.py)
+        "applications.auth.StatelessJWTAuthentication",
     ),
+    # Trusted proxies in front of the app, which each append to
+    # X-Forwarded-For. Unset, throttles key anonymous clients on REMOTE_ADDR
+    # and ignore the header, which clients can forge.
+    "NUM_PROXIES": int(os.environ["NUM_PROXIES"]) if os.getenv("NUM_PROXIES") else None,
 }
 
 # -------------------------------------------------------------------
@@ -139,8 +320,14 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_USER_CLASS": "applications.auth.ClaimsUser",
 }
 
+# How long each process trusts a user's cached revocation state (auth_version
+# and is_active); a revoked token keeps working at most this long elsewhere.
+# 0 reads the user row on every request.
+AUTH_USER_CACHE_SECONDS = int(os.getenv("AUTH_USER_CACHE_SECONDS", 30))
+
 
 
 # -------------------------------------------------------------------
@@ -162,25 +349,3 @@ USE_TZ = True
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "applications.User"
-
-
-
-# # Change from default to PostgreSQL
-# # Replace the DATABASES section with this:
-# DATABASES = {
-#     "default": {
-#         "ENGINE": "django.db.backends.postgresql",
-#         "NAME": "job_tracker",
-#         "USER": "jobtracker_user",
-#         "PASSWORD": "strongpassword",
-#         "HOST": "localhost",
-#         "PORT": "5432",
-#     }
-# }
-# Create the DB and user in Postgres:
-# CREATE DATABASE job_tracker;
-# CREATE USER jobtracker_user WITH PASSWORD 'strongpassword';
-# ALTER ROLE jobtracker_user SET client_encoding TO 'utf8';
-# ALTER ROLE jobtracker_user SET default_transaction_isolation TO 'read committed';
-# ALTER ROLE jobtracker_user SET timezone TO 'UTC';
-# GRANT ALL PRIVILEGES ON DATABASE job_tracker TO jobtracker_user;
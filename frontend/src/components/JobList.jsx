@@ -50,7 +50,7 @@ export default function JobList({ refreshTrigger, onRefresh }) {
   };
 
   useEffect(() => {
-    let url = `/api/applications/?page_size=${pageSize}`;
+    let url = `/api/applications/?page_size=${pageSize}&include=audits`;
     if (statusFilter !== "all") url += `&status=${statusFilter}`;
     fetchJobs(url);
   }, [refreshTrigger, statusFilter, pageSize]);